@@ -1,17 +1,59 @@
+import re
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
-from .quiz_batch import run_quiz_batch
-from .generate_quiz_video import run_video_batch
 from .config import DATA_DIR, VIDEOS_DIR
 
+# 무거운 모듈(OpenAI, PIL/numpy 렌더러 등)은 각 엔드포인트에서 처음 쓸 때 import 한다.
+# health/목록 엔드포인트와 워커 기동이 빨라진다. (python -m src.import_budget 로 확인)
+
 
 app = FastAPI()
 
 
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """If-None-Match (우선) / If-Modified-Since 조건이 맞으면 True"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _cached_file_response(request: Request, file_path: Path, filename: str, media_type: str, on_sent=None):
+    """
+    다운로드 응답: 내용 hash 기반 strong ETag + Last-Modified.
+    - If-None-Match / If-Modified-Since 가 맞으면 304 (본문 없음)
+    - Range / If-Range (이어받기, 탐색) 와 HEAD 는 FileResponse 가 처리 (206, 416)
+    - on_sent: GET 으로 본문(200/206)을 다 보낸 뒤에만 호출 (304/416/HEAD 는 호출 안 함)
+    """
+    from .video_catalog import get_catalog
+
+    st = file_path.stat()
+    headers = {
+        "ETag": f'"{get_catalog().content_hash(str(file_path), st)}"',
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": "no-cache",  # 매번 재검증 (바뀌지 않았으면 304)
+        "Accept-Ranges": "bytes",
+    }
+    if _not_modified(request, headers["ETag"], st.st_mtime):
+        return Response(status_code=304, headers=headers)
+    background = BackgroundTask(on_sent) if on_sent and request.method == "GET" else None
+    return FileResponse(path=str(file_path), filename=filename, media_type=media_type,
+                        headers=headers, stat_result=st, background=background)
+
+
 # -----------------------------
 # Health Check
 # -----------------------------
@@ -20,6 +62,70 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics/openai")
+def openai_metrics():
+    """모델별 OpenAI 요청 수, 재시도/429 횟수, 대기열 대기 시간"""
+    from .openai_scheduler import get_scheduler
+
+    return {"models": get_scheduler().metrics()}
+
+
+@app.get("/metrics/prescreen")
+def prescreen_metrics():
+    """AI 검증 전 로컬 pre-screen 규칙별 drop/flag 수, 아낀 검증 요청 수"""
+    from .quiz_prescreen import get_prescreen_stats
+
+    return get_prescreen_stats()
+
+
+@app.get("/metrics/trends")
+def trends_metrics():
+    """트렌드 캐시 hit/miss, 최근 처리해서 건너뛴 토픽 수"""
+    from .trend_cache import get_trend_cache_stats, recent_topics
+
+    return {**get_trend_cache_stats(), "recent_topics": len(recent_topics())}
+
+
+@app.get("/metrics/topics")
+def topic_metrics():
+    """토픽 alias/fuzzy 매칭 비율, 저장된 퀴즈 재사용(hit) 비율"""
+    from .topic_resolver import get_resolver
+
+    return get_resolver().get_stats()
+
+
+@app.get("/metrics/reservoir")
+def reservoir_metrics():
+    """Evergreen 퀴즈 저장소 토픽별 재고/나이/소비량"""
+    from .quiz_reservoir import get_reservoir
+
+    return get_reservoir().stats()
+
+
+@app.get("/metrics/retention")
+def retention_metrics():
+    """영상 카탈로그 폴더별 파일 수/용량, 보관 정책으로 지운 파일 수/회수한 용량 (누적)"""
+    from .video_catalog import get_catalog
+
+    return get_catalog().stats()
+
+
+@app.get("/metrics/quota")
+def quota_metrics():
+    """오늘 YouTube quota 사용량/남은 업로드 수/예약된 공개 시각"""
+    from .upload_planner import get_ledger
+
+    return get_ledger().stats()
+
+
+@app.get("/metrics/render")
+def render_metrics():
+    """즉시 렌더 요청 수, 캐시 hit / single-flight 합류 수, 캐시 크기, 평균 렌더 시간"""
+    from .render_service import get_render_service
+
+    return get_render_service().get_stats()
+
+
 # -----------------------------
 # Batch Quiz Generation (Google Trends)
 # -----------------------------
@@ -31,6 +137,8 @@ def run_batch_from_trends():
     - create quizzes for each topic
     - flatten quiz items + save results to quizzes_output.json (or similar)
     """
+    from .quiz_batch import run_quiz_batch
+
     result = run_quiz_batch()
 
     # run_quiz_batch가 {"success": False, "error": "..."} 이런 식으로 줄 경우 대비
@@ -49,6 +157,7 @@ def run_batch_from_trends():
 # -----------------------------
 class VideoBatchRequest(BaseModel):
     quiz_file_name: str  # 예: "quiz_2024-12-04_batch1.json"
+    profiles: list[str] | None = None  # 예: ["shorts", "preview"] (없으면 shorts 하나)
 
 
 @app.post("/video-batch")
@@ -58,8 +167,10 @@ def create_video_batch(req: VideoBatchRequest):
     2) 각 퀴즈에 대해 make_video를 실행하여
     3) VIDEOS_DIR 아래에 mp4 여러 개 생성
     """
+    from .generate_quiz_video import run_video_batch
+
     try:
-        result = run_video_batch(req.quiz_file_name)
+        result = run_video_batch(req.quiz_file_name, profiles=req.profiles)
         return result
 
     except FileNotFoundError:
@@ -77,6 +188,97 @@ def create_video_batch(req: VideoBatchRequest):
         )
 
 
+# -----------------------------
+# On-demand Single Quiz Render
+# (퀴즈 하나 → mp4, 전용 렌더 풀 + 결과 캐시)
+# -----------------------------
+class RenderRequest(BaseModel):
+    quiz: dict  # {"category", "question", "options", "answer"}
+    theme: str = "purple"
+    renderer: str = "v1"  # "v1" (generate_quiz_video) / "v2" (generate_quiz_video_v2)
+    response: str = "bytes"  # "bytes" → mp4 본문, "url" → {"url": "/render/<key>.mp4"} (RENDER_CACHE_DIR 의 파일)
+
+
+@app.post("/render")
+def render_quiz(req: RenderRequest):
+    """
+    퀴즈 하나를 바로 렌더. 같은 요청이 동시에 오면 렌더는 한 번만 하고,
+    최근 결과는 캐시에서 바로 돌려준다 (X-Render-Cache: cache / joined / rendered).
+    캐시는 메모리 LRU 가 아니라 디스크 (RENDER_CACHE_DIR/<key>.mp4, RENDER_CACHE_MAX_BYTES 넘으면 오래 안 쓴 것부터 삭제):
+    uvicorn 워커가 여러 개여도 같은 폴더를 보므로 URL 이 어느 워커에서나 열린다.
+    결과 하나가 캐시 크기보다 크면 캐시에 두지 않으므로 response="url" 은 507 (response="bytes" 로 받을 것).
+    """
+    from .generate_quiz_video import AVAILABLE_THEMES
+    from .render_service import get_render_service, RENDERERS
+
+    if req.renderer not in RENDERERS:
+        raise HTTPException(status_code=400, detail=f"Unknown renderer '{req.renderer}'")
+    if req.renderer == "v1" and req.theme not in AVAILABLE_THEMES:
+        raise HTTPException(status_code=400, detail=f"Unknown theme '{req.theme}'")
+    if req.response not in ("bytes", "url"):
+        raise HTTPException(status_code=400, detail="response must be 'bytes' or 'url'")
+    missing = [k for k in ("question", "options", "answer") if not req.quiz.get(k)]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Quiz is missing {', '.join(missing)}")
+
+    try:
+        key, result, source = get_render_service().render(req.quiz, theme=req.theme, renderer=req.renderer)
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid quiz: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {"X-Render-Cache": source, "ETag": f'"{key}"'}
+    if isinstance(result, bytes):
+        # 캐시보다 큰 결과: 저장하지 않았으므로 URL 은 404 가 된다 → 바로 본문으로만
+        if req.response == "url":
+            raise HTTPException(status_code=507, detail="Render result is larger than RENDER_CACHE_MAX_BYTES; "
+                                                        "request response='bytes' instead")
+        return Response(content=result, media_type="video/mp4", headers=headers)
+    if req.response == "url":
+        return JSONResponse({"url": f"/render/{key}.mp4", "key": key, "cache": source}, headers=headers)
+    return FileResponse(result, media_type="video/mp4", headers=headers)
+
+
+@app.get("/render/{key}.mp4")
+def get_rendered(key: str):
+    """POST /render (response="url") 결과를 디스크 캐시에서 스트리밍. 캐시에서 밀려났으면 404 → 다시 POST"""
+    from .render_service import get_render_service
+
+    path = get_render_service().get_cached(key)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Render result expired; POST /render again")
+    return FileResponse(path, media_type="video/mp4", headers={"ETag": f'"{key}"'})
+
+
+# -----------------------------
+# Compilation Video
+# (한 토픽의 여러 문제 → 긴 모음 영상 하나)
+# -----------------------------
+class CompilationRequest(BaseModel):
+    quiz_file_name: str | None = None  # 있으면 이 파일에서 topic 문제들, 없으면 topic 으로 새로 생성
+    topic: str | None = None
+    theme: str | None = None
+
+
+@app.post("/compilation")
+def create_compilation(req: CompilationRequest):
+    """
+    문제마다 구간을 따로 렌더하고 stream copy 로 이어 붙인 모음 영상을 VIDEOS_DIR 에 만든다.
+    결과 파일은 /videos/{filename}/download 로 받는다.
+    """
+    from .compilation import run_compilation
+
+    try:
+        return run_compilation(req.quiz_file_name, topic=req.topic, theme=req.theme)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Quiz file '{req.quiz_file_name}' not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # -----------------------------
 # Quiz File List & Download
 # -----------------------------
@@ -94,9 +296,9 @@ def list_quizzes():
     return {"files": files}
 
 
-@app.get("/quizzes/{filename}/download")
-def download_quiz(filename: str):
-    """퀴즈 JSON 파일 다운로드"""
+@app.api_route("/quizzes/{filename}/download", methods=["GET", "HEAD"])
+def download_quiz(filename: str, request: Request):
+    """퀴즈 JSON 파일 다운로드 (ETag/304, Range 지원)"""
     # 입력 검증을 먼저 수행
     if ".." in filename or filename.startswith("/") or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
@@ -109,11 +311,54 @@ def download_quiz(filename: str):
     if not file_path.exists() or not file_path.is_file():
         raise HTTPException(status_code=404, detail=f"Quiz file '{filename}' not found")
 
-    return FileResponse(
-        path=str(file_path),
-        filename=filename,
-        media_type="application/json",
-    )
+    return _cached_file_response(request, file_path, filename, "application/json")
+
+
+@app.get("/quizzes/{filename}/{index}/thumbnail")
+def quiz_thumbnail(
+    filename: str,
+    index: int,
+    theme: str = "purple",
+    frame: str = "reveal",
+    fmt: str = "jpeg",
+    width: int | None = None,
+):
+    """
+    퀴즈 파일의 index 번째 문제(1부터, 비디오 파일명 '<stem>-<index>.mp4' 와 동일)의
+    썸네일 이미지. 영상 인코딩 없이 해당 프레임만 렌더한다.
+    - frame: "reveal" 또는 카운트다운 단계 "1".."5"
+    - fmt: jpeg / webp, width: 지정 시 9:16 비율로 축소
+    """
+    from .generate_quiz_video import load_quizzes_from_file, render_thumbnail, THUMBNAIL_FORMATS, W, H
+
+    if ".." in filename or filename.startswith("/") or "\\" in filename:
+        raise HTTPException(status_code=400, detail="Invalid filename")
+
+    if not filename.endswith(".json"):
+        raise HTTPException(status_code=400, detail="Invalid file type")
+
+    if fmt.lower() not in THUMBNAIL_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{fmt}'")
+
+    file_path = Path(DATA_DIR) / filename
+
+    if not file_path.exists() or not file_path.is_file():
+        raise HTTPException(status_code=404, detail=f"Quiz file '{filename}' not found")
+
+    quizzes = load_quizzes_from_file(str(file_path))
+    if not 1 <= index <= len(quizzes):
+        raise HTTPException(status_code=404, detail=f"Quiz index {index} out of range")
+
+    size = None
+    if width:
+        size = (width, int(width * H / W))
+
+    try:
+        data = render_thumbnail(quizzes[index - 1], theme, frame=frame, fmt=fmt, size=size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(content=data, media_type=THUMBNAIL_FORMATS[fmt.lower()][1])
 
 
 # -----------------------------
@@ -121,21 +366,72 @@ def download_quiz(filename: str):
 # -----------------------------
 @app.get("/videos")
 def list_videos():
-    """VIDEOS_DIR 내 비디오 파일 목록 반환"""
-    videos_path = Path(VIDEOS_DIR)
-    if not videos_path.exists():
-        return {"files": []}
+    """VIDEOS_DIR 내 비디오 파일 목록 반환 (카탈로그 기준, 디렉토리가 바뀌었을 때만 다시 읽음)"""
+    from .video_catalog import get_catalog
 
-    files = sorted(
-        [f.name for f in videos_path.iterdir() if f.is_file() and f.suffix == ".mp4"],
-        reverse=True,
+    catalog = get_catalog()
+    catalog.sync([VIDEOS_DIR])
+    return {"files": [v["name"] for v in catalog.files_in(VIDEOS_DIR)]}
+
+
+@app.get("/videos/bundle")
+def download_video_bundle(quiz_file: str | None = None, names: list[str] | None = Query(None)):
+    """
+    여러 영상을 ZIP 하나로 스트리밍 다운로드 (재압축 없음, 임시 파일 없음, 바로 전송 시작).
+    - quiz_file=quizzes_output_3.json : 그 파일로 만든 영상 전부 ('<stem>-<index>.mp4', 프로파일 포함)
+    - names=a.mp4&names=b.mp4         : 지정한 영상들
+    """
+    from .video_catalog import get_catalog
+    from .zip_stream import stream_zip
+
+    if not quiz_file and not names:
+        raise HTTPException(status_code=400, detail="Pass quiz_file or names")
+
+    catalog = get_catalog()
+    if quiz_file:
+        if ".." in quiz_file or "/" in quiz_file or "\\" in quiz_file or not quiz_file.endswith(".json"):
+            raise HTTPException(status_code=400, detail="Invalid quiz file name")
+        stem = Path(quiz_file).stem
+        pattern = re.compile(rf"^{re.escape(stem)}-(\d+)(\.[\w-]+)?\.mp4$")
+        catalog.sync([VIDEOS_DIR])
+        names_by_index = [(int(m.group(1)), v["name"]) for v in catalog.files_in(VIDEOS_DIR)
+                          if (m := pattern.match(v["name"]))]
+        selected = [name for _, name in sorted(names_by_index)]
+        if not selected:
+            raise HTTPException(status_code=404, detail=f"No videos found for '{quiz_file}'")
+    else:
+        selected = []
+        for name in names:
+            if ".." in name or name.startswith("/") or "\\" in name or not name.endswith(".mp4"):
+                raise HTTPException(status_code=400, detail=f"Invalid filename '{name}'")
+            if not (Path(VIDEOS_DIR) / name).is_file():
+                raise HTTPException(status_code=404, detail=f"Video file '{name}' not found")
+            selected.append(name)
+
+    files = [(name, str(Path(VIDEOS_DIR) / name)) for name in dict.fromkeys(selected)]
+
+    def mark_downloaded():
+        # LRU 보관 정책용: ZIP 을 끝까지 보낸 뒤에만 기록
+        for _, path in files:
+            catalog.mark_downloaded(path)
+
+    try:
+        chunks = stream_zip(files)  # 파일을 모두 먼저 연다 (목록 이후 지워졌으면 여기서 404)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Video file '{Path(e.filename).name}' not found")
+
+    bundle_name = f"{Path(quiz_file).stem if quiz_file else 'videos'}.zip"
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{bundle_name}"'},
+        background=BackgroundTask(mark_downloaded),
     )
-    return {"files": files}
 
 
-@app.get("/videos/{filename}/download")
-def download_video(filename: str):
-    """비디오 MP4 파일 다운로드"""
+@app.api_route("/videos/{filename}/download", methods=["GET", "HEAD"])
+def download_video(filename: str, request: Request):
+    """비디오 MP4 파일 다운로드 (ETag/304, Range 이어받기/탐색, HEAD 지원)"""
     # 입력 검증을 먼저 수행
     if ".." in filename or filename.startswith("/") or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
@@ -148,8 +444,8 @@ def download_video(filename: str):
     if not file_path.exists() or not file_path.is_file():
         raise HTTPException(status_code=404, detail=f"Video file '{filename}' not found")
 
-    return FileResponse(
-        path=str(file_path),
-        filename=filename,
-        media_type="video/mp4",
-    )
+    from .video_catalog import get_catalog
+
+    # LRU 보관 정책용 다운로드 기록은 본문을 실제로 보냈을 때만 (재검증 304 는 다운로드가 아님)
+    return _cached_file_response(request, file_path, filename, "video/mp4",
+                                 on_sent=lambda: get_catalog().mark_downloaded(str(file_path)))
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from .config import ASSET_BUNDLE_DIR
+
+# ======================
+# 사전 가공(pre-baked) 에셋 번들
+# ======================
+# 테마 PNG 들을 최종 렌더 크기/알파로 미리 가공해서 raw RGBA .npy 로 저장한다.
+# 워커는 np.load(mmap_mode="r") 로 읽기만 하므로 PNG 디코딩/리사이즈 비용이 없고,
+# 같은 파일을 여러 프로세스가 OS 페이지 캐시로 공유한다.
+# 원본 파일(크기/mtime)이나 가공 파라미터가 바뀌면 load_bundle 이 자동으로 다시 만든다.
+BUNDLE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+ASSETS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets"))
+DEFAULT_BUNDLE_DIR = os.path.join(ASSETS_DIR, ".bundle")
+
+
+def get_bundle_dir():
+    return ASSET_BUNDLE_DIR or DEFAULT_BUNDLE_DIR
+
+
+def bundle_signature(specs):
+    """
+    specs: {key: (source_path, prepare_fn, args)}
+    원본 파일 상태 + 가공 함수/인자 + 번들 버전으로 만든 해시
+    """
+    h = hashlib.sha1(f"v{BUNDLE_VERSION}".encode())
+    for key in sorted(specs):
+        path, prepare, args = specs[key]
+        try:
+            st = os.stat(path)
+            state = f"{st.st_size}:{st.st_mtime_ns}"
+        except OSError:
+            state = "missing"
+        h.update(f"{key}|{path}|{state}|{prepare.__name__}|{args!r}\n".encode())
+    return h.hexdigest()[:16]
+
+
+def _prepare_layer(path, prepare, args):
+    """원본을 열어 최종 RGBA 레이어로 가공. 원본이 없거나 깨졌으면 None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with Image.open(path) as src:
+            img = prepare(src, *args)
+        return np.asarray(img.convert("RGBA"), dtype=np.uint8)
+    except Exception as e:
+        print(f"⚠️  Failed to pre-bake asset {path}: {e}")
+        return None
+
+
+def build_bundle(specs, out_dir=None):
+    """
+    모든 레이어를 가공해서 out_dir 에 '<key>-<signature>.npy' 로 저장하고 manifest 를 갱신한다.
+    manifest 는 마지막에 os.replace 로 교체하므로 다른 프로세스가 읽는 중이어도 안전하다.
+    """
+    out_dir = out_dir or get_bundle_dir()
+    os.makedirs(out_dir, exist_ok=True)
+    signature = bundle_signature(specs)
+
+    layers = {}
+    for key, (path, prepare, args) in specs.items():
+        arr = _prepare_layer(path, prepare, args)
+        if arr is None:
+            layers[key] = None
+            continue
+        file_name = f"{key.replace('/', '__')}-{signature}.npy"
+        fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, arr)
+        os.chmod(tmp_path, 0o644)  # 다른 워커 프로세스도 읽을 수 있게
+        os.replace(tmp_path, os.path.join(out_dir, file_name))
+        layers[key] = file_name
+
+    manifest = {"version": BUNDLE_VERSION, "signature": signature, "layers": layers}
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+
+    _prune_stale_files(out_dir, set(f for f in layers.values() if f))
+    print(f"📦 Asset bundle built: {out_dir} ({sum(1 for f in layers.values() if f)} layers)")
+    return manifest
+
+
+def _prune_stale_files(out_dir, keep):
+    # 이미 mmap 으로 열려 있는 예전 파일은 unlink 해도 기존 매핑이 유지된다
+    for name in os.listdir(out_dir):
+        if name.endswith(".npy") and name not in keep:
+            try:
+                os.remove(os.path.join(out_dir, name))
+            except OSError:
+                pass
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _as_image(arr):
+    """(h, w, 4) uint8 배열 → 복사 없는 읽기 전용 RGBA 이미지"""
+    h, w = arr.shape[:2]
+    return Image.frombuffer("RGBA", (w, h), arr, "raw", "RGBA", 0, 1)
+
+
+def load_bundle(specs, out_dir=None):
+    """
+    {key: PIL.Image | None} 리턴. 번들이 없거나 오래됐으면 다시 만든다.
+    번들 디렉토리에 쓸 수 없으면 메모리에서 바로 가공한다 (캐시 없이 동작).
+    """
+    out_dir = out_dir or get_bundle_dir()
+    signature = bundle_signature(specs)
+    manifest = _read_manifest(out_dir)
+
+    if not manifest or manifest.get("signature") != signature:
+        try:
+            manifest = build_bundle(specs, out_dir)
+        except OSError as e:
+            print(f"⚠️  Asset bundle not writable ({out_dir}): {e}. Decoding assets in memory.")
+            return {
+                key: (_as_image(arr) if arr is not None else None)
+                for key, arr in ((k, _prepare_layer(*spec)) for k, spec in specs.items())
+            }
+
+    images = {}
+    for key in specs:
+        file_name = manifest["layers"].get(key)
+        if not file_name:
+            images[key] = None
+            continue
+        arr = np.load(os.path.join(out_dir, file_name), mmap_mode="r")
+        images[key] = _as_image(arr)
+    return images
+
+
+def main():
+    from .generate_quiz_video import theme_layer_specs
+
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    build_bundle(theme_layer_specs(), out_dir)
+
+
+if __name__ == "__main__":
+    main()
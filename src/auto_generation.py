@@ -1,55 +1,60 @@
 import os
 import time
 import datetime
-from generate_quiz_video import make_video as gen_quiz_video, quiz_json_str
+import itertools
+from .generate_quiz_video import make_video as gen_quiz_video, load_quizzes_from_file, BASE_DIR
+from .video_retention import RetentionManager
 
 # 🔧 설정
 DEST_DIR = "videos_out"           # 출력(생성된 영상) 저장 폴더
 INTERVAL_SECONDS = 3             # 주기 (3초마다 실행)
+QUIZ_SOURCE = os.path.join(BASE_DIR, "dummy_quizzes.json")
+RETENTION_EVERY = 100            # 이만큼 tick 마다 보관 정책 적용
 
-def make_video():
-    """
-    진짜 영상 생성 함수로 교체 버전
-    generate_quiz_video.make_video() 는 파일을 생성하고
-    파일명을 OUTPUT에 저장한다고 가정한다.
-    """
-    path = gen_quiz_video(quiz_json_str)  # ← 기존 quiz 생성 함수 호출
-    with open(path, "rb") as f:
-        data = f.read()
-    base = os.path.basename(path)
-    return data, base
+_quizzes = None
 
-def save_output(video_bytes, base_name):
+def next_quiz():
+    """QUIZ_SOURCE 의 퀴즈를 돌아가며 하나씩"""
+    global _quizzes
+    if _quizzes is None:
+        _quizzes = itertools.cycle(load_quizzes_from_file(QUIZ_SOURCE))
+    return next(_quizzes)
+
+def dated_output_path(base_name):
     """
-    날짜별 폴더(YYYY-MM-DD)에 저장.
+    날짜별 폴더(YYYY-MM-DD) 안의 최종 경로.
     파일 이름에 시분초 붙여서 중복 방지.
     """
-    date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-    out_dir = os.path.join(DEST_DIR, date_str)
+    now = datetime.datetime.now()
+    out_dir = os.path.join(DEST_DIR, now.strftime("%Y-%m-%d"))
     os.makedirs(out_dir, exist_ok=True)
+    root, ext = os.path.splitext(os.path.basename(base_name))
+    return os.path.join(out_dir, f"{root}_{now.strftime('%H%M%S')}{ext or '.mp4'}")
 
-    ts = datetime.datetime.now().strftime("%H%M%S")
-    root, _ = os.path.splitext(base_name)
-    out_path = os.path.join(out_dir, f"{root}_{ts}.mp4")
-
-    with open(out_path, "wb") as f:
-        f.write(video_bytes)
-
-    print(f"✅ 저장 완료: {out_path}\n")
-    return out_path
+def make_video(base_name="quiz_video.mp4"):
+    """
+    날짜별 폴더의 최종 경로에 바로 렌더한다 (임시 파일 → 복사 단계 없음).
+    만든 파일 경로 리턴.
+    """
+    out_path = dated_output_path(base_name)
+    return gen_quiz_video(next_quiz(), output_path=out_path)
 
 def tick():
-    data, name = make_video()
-    save_output(data, name)
+    path = make_video()
+    print(f"✅ 저장 완료: {path}\n")
+    return path
 
 def main():
-    print(f"⏱ 주기적 실행 시작 (매 {INTERVAL_SECONDS}CH) — 종료: Ctrl + C")
+    print(f"⏱ 주기적 실행 시작 (매 {INTERVAL_SECONDS}초) — 종료: Ctrl + C")
+    retention = RetentionManager()
     tick()  # 최초 1회 실행
 
     try:
-        while True:
+        for n in itertools.count(1):
             time.sleep(INTERVAL_SECONDS)
             tick()
+            if n % RETENTION_EVERY == 0:
+                retention.enforce()
     except KeyboardInterrupt:
         print("\n👋 종료합니다.")
 
@@ -3,10 +3,14 @@ import json
 import time
 import datetime
 
-from fetch_trends_serpapi import fetch_trending_topics
-from generate_quiz import create_quizzes
-from generate_quiz_video import make_video
-from config import DATA_DIR, VIDEOS_DIR
+from .trend_cache import select_new_topics, mark_processed
+from .quiz_reservoir import get_reservoir
+from .video_retention import RetentionManager
+from .render_queue import get_render_queue, latency_summary, quiz_priority
+from .generate_quiz import create_quizzes_many, stream_quizzes
+from .generate_quiz_video import make_video
+from .quiz_batch import load_quiz_json, flatten_questions
+from .config import DATA_DIR, VIDEOS_DIR
 
 # -----------------------------
 # 설정
@@ -15,6 +19,8 @@ NUM_TOPICS = 3              # 한 번에 가져올 트렌드 수
 QUESTIONS_PER_TOPIC = 2     # 토픽 당 문제 수 → 총 6문제
 LOOP_INTERVAL = 420         # 7분(초 단위) 간격으로 배치 시작
 MAX_QUIZZES_PER_FILE = 60   # 한 JSON 파일당 최대 문제 수
+RESERVOIR_REFILL_MARGIN = 60  # 다음 배치 시작 전 이만큼(초)은 저장소 채우기를 새로 시작하지 않음
+STREAM_MODE = False         # True 면 문제가 검증되는 대로 바로 영상 렌더 (첫 영상까지 시간 단축)
 
 
 def generate_quiz_batch():
@@ -26,16 +32,23 @@ def generate_quiz_batch():
     """
     print("\n==============================")
     print("📈 Fetching trending topics...")
-    topics = fetch_trending_topics(n=NUM_TOPICS, geo="US", category_id=17)
+    trend_seen_at = time.time()
+    topics = select_new_topics(NUM_TOPICS, geo="US", category_id=17)  # 캐시 + 최근 토픽 제외
     print(f"✅ Got topics: {topics}")
 
     new_quizzes = []
 
+    try:
+        quizzes_by_topic = create_quizzes_many(topics)  # AI 검증은 토픽을 묶어서 한 번에
+    except Exception as e:
+        print(f"❌ Error generating quizzes: {e}")
+        quizzes_by_topic = {}
+
     for i, topic in enumerate(topics, start=1):
         print(f"\n=== Topic #{i}: {topic} ===")
         try:
-            raw = create_quizzes(topic)
-            quiz_obj = json.loads(raw)
+            raw = quizzes_by_topic.get(topic, {})
+            quiz_obj = load_quiz_json(raw)  # create_quizzes 는 dict 를 리턴
 
             questions = quiz_obj.get("questions", [])
             if not isinstance(questions, list):
@@ -52,6 +65,8 @@ def generate_quiz_batch():
                     "question": q.get("question"),
                     "options": q.get("options"),
                     "answer": q.get("answer"),
+                    "trend_rank": i - 1,              # 렌더 우선순위용 (render_queue.quiz_priority)
+                    "trend_seen_at": trend_seen_at,
                 }
 
                 if flat_item["question"] and flat_item["options"] and flat_item["answer"]:
@@ -67,10 +82,20 @@ def generate_quiz_batch():
     if len(new_quizzes) > max_quizzes:
         new_quizzes = new_quizzes[:max_quizzes]
 
+    mark_processed({q["topic"] for q in new_quizzes})
+
+    # 트렌드로 모자란 만큼 evergreen 저장소에서 채운다
+    new_quizzes += get_reservoir().draw(max_quizzes - len(new_quizzes))
+
     if not new_quizzes:
         print("⚠️ No quizzes generated in this batch.")
         return [], None
 
+    return new_quizzes, save_quizzes_to_files(new_quizzes)
+
+
+def save_quizzes_to_files(new_quizzes):
+    """new_quizzes 를 quizzes_output_*.json 파일들에 누적 저장. 마지막에 쓴 파일 경로 리턴"""
     # ----------------------------------------------------
     # quizzes_output_*.json 파일들 관리
     #   - 한 파일당 MAX_QUIZZES_PER_FILE 문제
@@ -153,63 +178,161 @@ def generate_quiz_batch():
     )
 
     # 마지막에 손 댄 파일 하나의 이름만 리턴 (원래 output_filename 역할)
-    return new_quizzes, current_filename
+    return current_filename
+
+
+def video_output_path(quiz, idx, ts, output_dir=VIDEOS_DIR):
+    safe_topic = quiz.get("topic", "topic").replace(" ", "_")[:20]
+    return os.path.join(output_dir, f"quiz_{ts}_{idx}_{safe_topic}.mp4")
+
+
+def _render(quiz, output_path):
+    print(f"\n🎬 Generating video → {output_path}")
+    return make_video(quiz, output_path=output_path)
 
 
 def generate_videos_from_quizzes(quizzes, output_dir=VIDEOS_DIR):
     """
     주어진 퀴즈 리스트(each: {category, topic, question, options, answer})로
-    각각에 대해 하나씩 영상 생성.
+    각각에 대해 하나씩 영상 생성. 퀴즈에 저장된 trend_rank / trend_seen_at 으로
+    뜨는 트렌드부터 (공유 render_queue) 렌더한다. evergreen 문제는 순위가 없어서 뒤로.
     """
     os.makedirs(output_dir, exist_ok=True)
 
     ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    created_files = []
+    render_queue = get_render_queue()
+    futures = render_queue.submit_many(
+        [dict(quiz=quiz, output_path=video_output_path(quiz, idx, ts, output_dir), index=idx, **quiz_priority(quiz))
+         for idx, quiz in enumerate(quizzes, start=1)],
+        _render,
+    )
+
+    results = sorted((f.result() for f in futures), key=lambda r: r["index"])
+    created_files = [r["output_path"] for r in results if not r["error"]]
+
+    print(f"\n✨ Video generation done. Created {len(created_files)} files. "
+          f"trend→video: {latency_summary(results)}")
+    return created_files
+
+
+def generate_streaming_batch(render=True, output_dir=VIDEOS_DIR):
+    """
+    스트리밍 모드 배치:
+      - 토픽마다 stream_quizzes 로 문제를 받아서 검증을 통과하는 즉시 렌더 워커에 넘긴다
+      - 토픽 당 QUESTIONS_PER_TOPIC 문제만 받고 스트림을 끊는다
+      - 끝나면 quizzes_output_*.json 에 누적 저장
+    Returns: (퀴즈 리스트, 영상 경로 리스트)
+    """
+    print("\n==============================")
+    print("📈 Fetching trending topics...")
+    topics = select_new_topics(NUM_TOPICS, geo="US", category_id=17)  # 캐시 + 최근 토픽 제외
+    print(f"✅ Got topics: {topics}")
 
-    for idx, quiz in enumerate(quizzes, start=1):
-        safe_topic = quiz.get("topic", "topic").replace(" ", "_")[:20]
-        filename = f"quiz_{ts}_{idx}_{safe_topic}.mp4"
-        output_path = os.path.join(output_dir, filename)
+    os.makedirs(output_dir, exist_ok=True)
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    start = time.time()
+    first_video = []
+    render_queue = get_render_queue()  # 순위 높은 트렌드 문제가 먼저 렌더된다 (배치끼리 공유)
+    futures = []
+
+    def render_and_time(quiz, output_path):
+        output = _render(quiz, output_path)
+        if not first_video:
+            first_video.append(time.time() - start)
+            print(f"⏱ First video ready {first_video[0]:.1f}s after batch start.")
+        return output
+
+    def enqueue(item):
+        new_quizzes.append(item)
+        if render:
+            futures.append(render_queue.submit(item, video_output_path(item, len(new_quizzes), ts, output_dir),
+                                               render_and_time, index=len(new_quizzes), **quiz_priority(item)))
 
-        print(f"\n🎬 Generating video {idx}/{len(quizzes)} → {output_path}")
+    new_quizzes = []
+    for i, topic in enumerate(topics, start=1):
+        print(f"\n=== Topic #{i}: {topic} (streaming) ===")
         try:
-            make_video(quiz, output_path=output_path)
-            created_files.append(output_path)
+            for q in stream_quizzes(topic, limit=QUESTIONS_PER_TOPIC):
+                for item in flatten_questions(topic, {"questions": [q]}, trend_rank=i - 1, trend_seen_at=start):
+                    enqueue(item)
         except Exception as e:
-            print(f"❌ Failed to create video for quiz #{idx}: {e}")
+            print(f"❌ Error generating quiz for topic '{topic}': {e}")
 
-    print(f"\n✨ Video generation done. Created {len(created_files)} files.")
-    return created_files
+    mark_processed({q["topic"] for q in new_quizzes})
+
+    # 트렌드로 모자란 만큼 evergreen 저장소에서 채운다 (순위 없음 → 트렌드 문제 뒤에 렌더)
+    for item in get_reservoir().draw(NUM_TOPICS * QUESTIONS_PER_TOPIC - len(new_quizzes)):
+        enqueue(item)
 
+    results = sorted((f.result() for f in futures), key=lambda r: r["index"])
+    created_files = [r["output_path"] for r in results if not r["error"]]
+    if results:
+        print(f"⏱ trend→video: {latency_summary(results)}")
 
-def main_loop():
+    if not new_quizzes:
+        print("⚠️ No quizzes generated in this batch.")
+        return [], created_files
+
+    json_path = save_quizzes_to_files(new_quizzes)
+    print(f"\n✅ Streaming batch: {len(new_quizzes)} quizzes, {len(created_files)} videos ({json_path}).")
+    return new_quizzes, created_files
+
+
+def run_batch_once(batch_num=1, render=True, stream=STREAM_MODE):
+    """배치 한 번 수행 (퀴즈 생성 + 영상 생성). 생성된 (퀴즈 수, 영상 수) 리턴"""
+    print("\n=======================================")
+    print(f"🚀 Starting batch #{batch_num} at {datetime.datetime.now()}")
+
+    quizzes, videos = [], []
+    try:
+        if stream:
+            quizzes, videos = generate_streaming_batch(render=render)
+            return len(quizzes), len(videos)
+        quizzes, json_path = generate_quiz_batch()
+        if quizzes and render:
+            videos = generate_videos_from_quizzes(quizzes, output_dir=VIDEOS_DIR)
+        elif not quizzes:
+            print("⚠️ No quizzes generated in this batch.")
+    except Exception as e:
+        print(f"❌ Unexpected error in batch #{batch_num}: {e}")
+    return len(quizzes), len(videos)
+
+
+def main_loop(max_batches=None, interval=LOOP_INTERVAL, render=True, stream=STREAM_MODE):
     """
-    배치 시작 기준으로 5분 간격 유지:
+    배치 시작 기준으로 interval(기본 7분) 간격 유지:
       - 배치 한 번 수행 (퀴즈 생성 + 영상 생성)
       - 배치에 걸린 시간을 측정
-      - (5분 - 걸린 시간) 만큼만 sleep
+      - 영상 보관 정책 적용 (오래된/넘치는 영상 정리)
+      - 남는 시간에 evergreen 저장소 채우기
+      - (interval - 걸린 시간) 만큼만 sleep
+    max_batches 를 주면 그만큼만 돌고 끝난다 (벤치마크용).
     """
     batch_num = 1
-    while True:
+    retention = RetentionManager()
+    while max_batches is None or batch_num <= max_batches:
         start_time = time.time()
-        print("\n=======================================")
-        print(f"🚀 Starting batch #{batch_num} at {datetime.datetime.now()}")
-
-        try:
-            quizzes, json_path = generate_quiz_batch()
-            if quizzes:
-                generate_videos_from_quizzes(quizzes, output_dir=VIDEOS_DIR)
-            else:
-                print("⚠️ No quizzes generated in this batch.")
-        except Exception as e:
-            print(f"❌ Unexpected error in batch #{batch_num}: {e}")
+        run_batch_once(batch_num, render=render, stream=stream)
 
         elapsed = time.time() - start_time
-        wait = max(0, LOOP_INTERVAL - elapsed)
         print(f"\n⏱ Batch #{batch_num} took {elapsed:.1f} seconds.")
-        print(f"⏳ Waiting {wait:.1f} seconds before next batch...")
         batch_num += 1
 
+        try:
+            retention.enforce()
+        except Exception as e:
+            print(f"⚠️ Retention failed: {e}")
+
+        if max_batches is not None and batch_num > max_batches:
+            break
+        idle_until = start_time + interval - RESERVOIR_REFILL_MARGIN
+        if time.time() < idle_until:
+            try:
+                get_reservoir().refill(deadline=idle_until)
+            except Exception as e:
+                print(f"⚠️ Reservoir refill failed: {e}")
+        wait = max(0, interval - (time.time() - start_time))
+        print(f"⏳ Waiting {wait:.1f} seconds before next batch...")
         time.sleep(wait)
 
 
@@ -1,32 +1,22 @@
-import os, time, json, random, datetime
+import json, random
 from pathlib import Path
 
 # 너의 비디오 생성 코드 import
-import generate_quiz_video as gqv
+from . import generate_quiz_video as gqv
+from .youtube_auth import get_youtube_client, get_uploader
+from .upload_planner import UploadPlanner, get_ledger, quota_day
+from .video_catalog import get_catalog
 
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 
 
 # =========================
 # YouTube API 설정
 # =========================
-SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
+# 토큰 저장/갱신, 클라이언트 캐시는 youtube_auth.py (처음 한 번: python -m src.youtube_auth)
 
-def get_youtube_client():
-    flow = InstalledAppFlow.from_client_secrets_file("client_secret.json", SCOPES)
-    creds = flow.run_local_server(port=0)  # 첫 실행 때만 브라우저 뜸
-    return build("youtube", "v3", credentials=creds)
-
-def upload_video(youtube, file_path, title, description,
-                 tags=None, category_id="27", privacy="public",
-                 publish_at_iso=None):
-    """
-    videos.insert 로 업로드.
-    - 업로드 1회 quota cost = 1600 units :contentReference[oaicite:3]{index=3}
-    - publishAt 쓰려면 privacyStatus="private" 여야 함 :contentReference[oaicite:4]{index=4}
-    """
+def video_metadata(title, description, tags=None, category_id="27", privacy="public", publish_at_iso=None):
+    """videos.insert body (snippet + status)"""
     if tags is None:
         tags = ["quiz", "shorts", "zepquiz"]
 
@@ -35,7 +25,7 @@ def upload_video(youtube, file_path, title, description,
         status["privacyStatus"] = "private"
         status["publishAt"] = publish_at_iso
 
-    body = {
+    return {
         "snippet": {
             "title": title,
             "description": description,
@@ -45,21 +35,37 @@ def upload_video(youtube, file_path, title, description,
         "status": status
     }
 
-    media = MediaFileUpload(file_path, mimetype="video/*", resumable=True)
-    request = youtube.videos().insert(
-        part="snippet,status",
-        body=body,
-        media_body=media
-    )
-
-    response = None
-    while response is None:
-        progress, response = request.next_chunk()
-        if progress:
-            print(f"Upload progress: {int(progress.progress() * 100)}%")
-
-    print("✅ Uploaded. videoId =", response["id"])
-    return response["id"]
+def set_thumbnail(youtube, video_id, thumbnail_path):
+    """thumbnails.set (50 units). 실패해도 호출은 quota 에 기록한다"""
+    mimetype = "image/webp" if thumbnail_path.endswith(".webp") else "image/jpeg"
+    ledger = get_ledger()
+    try:
+        youtube.thumbnails().set(
+            videoId=video_id,
+            media_body=MediaFileUpload(thumbnail_path, mimetype=mimetype)
+        ).execute()
+    except Exception as e:
+        if "quotaExceeded" in str(e):
+            ledger.exhaust()
+        raise
+    finally:
+        ledger.record("thumbnails.set")
+    print("🖼️  Thumbnail set:", thumbnail_path)
+
+def finish_upload(youtube, ledger, mp4_path, video_id, publish_at=None, thumbnail_path=None):
+    """
+    업로드가 끝난 영상의 후처리: publishAt 슬롯 예약, 카탈로그에 업로드 기록, 썸네일.
+    썸네일 실패(미인증 채널 403, quota 등)는 로그만 남기고 나머지 후처리는 그대로 한다.
+    """
+    if publish_at:
+        ledger.reserve_slot(publish_at)
+        print(f"🗓️  {video_id} publishes at {publish_at}")
+    get_catalog().mark_uploaded(mp4_path, video_id)  # 이제 보관 정책으로 지울 수 있음
+    if thumbnail_path and Path(thumbnail_path).exists():
+        try:
+            set_thumbnail(youtube, video_id, thumbnail_path)
+        except Exception as e:
+            print(f"⚠️ Could not set thumbnail for {video_id}: {e}")
 
 
 # =========================
@@ -86,56 +92,87 @@ def get_quizzes_for_today():
 OUTPUT_DIR = Path("rendered_shorts")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def render_one_quiz_to_mp4(quiz, idx):
-    # generate_quiz_video.py는 OUTPUT 전역 변수로 파일명 결정함 :contentReference[oaicite:5]{index=5}
+def render_one_quiz_to_mp4(quiz, idx, theme=None):
     out_path = OUTPUT_DIR / f"quiz_{idx:03d}.mp4"
-    gqv.OUTPUT = str(out_path)
-    return gqv.make_video(quiz)  # mp4 경로 리턴 :contentReference[oaicite:6]{index=6}
+    return gqv.make_video(quiz, theme=theme, output_path=str(out_path))  # mp4 경로 리턴
+
+def render_one_quiz_thumbnail(quiz, idx, theme):
+    # 영상과 같은 theme 으로 정답 공개 프레임만 렌더 (영상에서 프레임을 뽑지 않음)
+    out_path = OUTPUT_DIR / f"quiz_{idx:03d}.jpg"
+    return gqv.make_thumbnail(quiz, str(out_path), theme=theme, frame="reveal")
 
-def human_safe_sleep(min_minutes=60, max_minutes=240):
+def prepare_upload_jobs(quizzes, numbers=None):
     """
-    너무 촘촘하면 봇/스팸처럼 보일 수 있으니
-    랜덤 간격으로 텀 주기 (예: 1~4시간).
+    업로드 전에 영상/썸네일을 모두 렌더 → [{"mp4", "thumbnail", "title", "description", "tags"}, ...]
+    numbers: 파일명/제목에 쓸 번호 (기본 1, 2, ...)
     """
-    mins = random.uniform(min_minutes, max_minutes)
-    print(f"⏳ Sleeping {mins:.1f} minutes...")
-    time.sleep(mins * 60)
+    jobs = []
+    for i, quiz in zip(numbers or range(1, len(quizzes) + 1), quizzes):
+        print(f"\n🎬 Render quiz #{i} ({len(jobs) + 1}/{len(quizzes)})")
+        theme = random.choice(gqv.AVAILABLE_THEMES)
+        mp4_path = render_one_quiz_to_mp4(quiz, i, theme=theme)
+        get_catalog().register(mp4_path)  # 같은 이름으로 덮어쓰므로 카탈로그에 직접 반영
+        thumb_path = render_one_quiz_thumbnail(quiz, i, theme)
 
-def run_upload_cycle(max_uploads_per_day=5):
+        # Shorts로 잘 분류되게: 9:16 세로 + 60초 이하 + #shorts 추천 :contentReference[oaicite:8]{index=8}
+        jobs.append({
+            "mp4": mp4_path,
+            "thumbnail": thumb_path,
+            "title": f"{quiz.get('category','General')} Quiz #{i} #shorts",
+            "description": (
+                f"Q. {quiz['question']}\n"
+                f"Answer reveals in 5 seconds!\n"
+                "#shorts #quiz"
+            ),
+            "tags": ["quiz", "shorts", quiz.get("category", "general")],
+        })
+    return jobs
+
+def run_upload_cycle(max_uploads_per_day=None):
     """
-    하루 업로드 개수 제한:
-    기본 quota 10,000/day 기준 uploads.insert(1600) ≈ 6개/일이 상한 :contentReference[oaicite:7]{index=7}
-    안전하게 3~5개 추천.
+    quota 가 허락하는 만큼 올리고, 공개 시각은 publishAt 으로 PUBLISH_TIMES 슬롯에 예약한다.
+    - 업로드 1회 = videos.insert 1600 + thumbnails.set 50 units, 기본 quota 10,000/day → 6개/일 :contentReference[oaicite:7]{index=7}
+    - 우선순위(quiz["priority"], 없으면 파일 순서) 순으로 오늘 남은 quota 에 들어가는 것만 렌더/업로드
+    - 나머지 백로그는 다음 quota 날짜로 계획만 하고, 다 공개되기까지 예상 시간을 출력
+    - max_uploads_per_day 를 주면 오늘 업로드 수를 그 이하로 제한
+    지난 실행에서 중단된 업로드가 있으면 먼저 이어서 올린다.
     """
     youtube = get_youtube_client()
-    quizzes = get_quizzes_for_today()
-
-    quizzes = quizzes[:max_uploads_per_day]
-
-    for i, quiz in enumerate(quizzes, start=1):
-        print(f"\n🎬 Render quiz {i}/{len(quizzes)}")
-        mp4_path = render_one_quiz_to_mp4(quiz, i)
-
-        # Shorts로 잘 분류되게: 9:16 세로 + 60초 이하 + #shorts 추천 :contentReference[oaicite:8]{index=8}
-        title = f"{quiz.get('category','General')} Quiz #{i} #shorts"
-        description = (
-            f"Q. {quiz['question']}\n"
-            f"Answer reveals in 5 seconds!\n"
-            "#shorts #quiz"
-        )
-
-        print("🚀 Uploading:", mp4_path)
-        upload_video(
-            youtube,
-            file_path=mp4_path,
-            title=title,
-            description=description,
-            tags=["quiz", "shorts", quiz.get("category","general")]
-        )
-
-        if i != len(quizzes):
-            human_safe_sleep(60, 240)  # 다음 업로드까지 1~4시간 랜덤
+    uploader = get_uploader()
+    planner = UploadPlanner(get_ledger())
+
+    # 지난 실행에서 중단된 업로드: 이어서 올리고 새 업로드와 같은 후처리 (썸네일은 같은 이름의 .jpg)
+    resumed = uploader.pending()
+    if resumed:
+        print(f"↩️  Resuming {len(resumed)} unfinished uploads")
+        for (mp4, metadata, _), result in zip(resumed, uploader.upload_many(resumed)):
+            if result["video_id"]:
+                finish_upload(youtube, planner.ledger, mp4, result["video_id"],
+                              publish_at=metadata.get("status", {}).get("publishAt"),
+                              thumbnail_path=str(Path(mp4).with_suffix(".jpg")))
 
+    quizzes = get_quizzes_for_today()
+    plan = planner.plan([{"quiz": q, "priority": q.get("priority", 0), "thumbnail": True} for q in quizzes])
+    report = planner.drain_report(plan)
+    print(f"📅 Upload plan: {report['backlog']} in backlog, {report['uploads_today']} today, "
+          f"drains in ~{report['drain_hours']}h over {report['quota_days']} quota days")
+
+    today = [p for p in plan if p["quota_day"] == quota_day()][:max_uploads_per_day]
+    if not today:
+        print("⏸️  No quota left today.")
+        return []
+    jobs = prepare_upload_jobs([p["quiz"] for p in today], numbers=[p["index"] + 1 for p in today])
+
+    results = uploader.upload_many([
+        (job["mp4"], video_metadata(job["title"], job["description"], job["tags"],
+                                    publish_at_iso=p["publish_at"]))
+        for job, p in zip(jobs, today)
+    ])
+    for job, p, result in zip(jobs, today, results):
+        if result["video_id"]:
+            finish_upload(youtube, planner.ledger, job["mp4"], result["video_id"],
+                          publish_at=p["publish_at"], thumbnail_path=job["thumbnail"])
+    return results
 
 if __name__ == "__main__":
-    run_upload_cycle(max_uploads_per_day=5)
+    run_upload_cycle()
@@ -0,0 +1,205 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageDraw
+
+from .config import COMPILATION_WORKERS, COUNTDOWN_ANIMATION
+from .generate_quiz_video import (
+    ANSWER_HOLD,
+    AVAILABLE_THEMES,
+    BGM_PATH,
+    BLACK,
+    COUNTDOWN_SECONDS,
+    DATA_DIR,
+    SFX_CORRECT_PATH,
+    THEME_COLORS,
+    VIDEOS_DIR,
+    H,
+    W,
+    get_theme_layers,
+    load_font,
+    load_quizzes_from_file,
+    wrap_text,
+    write_quiz_video,
+)
+from .video_writer import write_timeline_video, concat_videos
+
+# ======================
+# 여러 문제 모음 영상 ("10 questions about X")
+# ======================
+# 문제마다 MoviePy 클립을 만들어 이어 붙이면 모든 프레임이 메모리에 남고 전체를 다시 인코딩한다.
+# 여기서는
+#   1) 인트로 카드 / "Question k/N" 카드 / 문제 구간을 각각 무음 mp4 로 따로 인코딩 (COMPILATION_WORKERS 개 동시)
+#   2) concat demuxer + stream copy 로 이어 붙이고, 그때 BGM 한 줄 + 정답 효과음을 전체에 한 번 깐다
+# 구간 하나를 인코딩할 때만 그 구간의 프레임(몇 장)이 메모리에 있으므로 문제 수와 무관하게 메모리는 일정하다.
+# 모든 구간이 같은 인코딩 설정(write_timeline_video 기본 프로파일)이라 재인코딩 없이 붙는다.
+#
+#   python -m src.compilation quizzes_output.json --topic "NBA history"
+INTRO_SECONDS = 2
+CARD_SECONDS = 1
+QUESTION_SECONDS = COUNTDOWN_SECONDS + ANSWER_HOLD
+BGM_VOLUME = 0.35
+BGM_FADE_OUT = 1.0
+
+
+def render_card(title, subtitle, theme):
+    """인트로/문제 사이 카드 한 장 (테마 배경 + 가운데 큰 글씨)"""
+    layers = get_theme_layers(theme)
+    primary_color = THEME_COLORS[theme]["primary"]
+    if layers["quiz_bg"] is not None:
+        img = layers["quiz_bg"].copy()
+    else:
+        img = Image.new("RGBA", (W, H), (255, 255, 255, 255))
+    draw = ImageDraw.Draw(img)
+
+    title_font = load_font(96, bold=True)
+    lines = wrap_text(draw, title, title_font, W - 160)
+    line_h = title_font.size + 24
+    y = (H - line_h * len(lines)) // 2 - 60
+    for line in lines:
+        line_w = draw.textlength(line, font=title_font)
+        draw.text(((W - line_w) // 2, y), line, font=title_font, fill=primary_color)
+        y += line_h
+
+    if subtitle:
+        sub_font = load_font(56, bold=True)
+        sub_w = draw.textlength(subtitle, font=sub_font)
+        draw.text(((W - sub_w) // 2, y + 40), subtitle, font=sub_font, fill=BLACK)
+
+    if layers["logo"] is not None:
+        logo = layers["logo"]
+        img.paste(logo, ((W - logo.width) // 2, 1560), logo)
+    return img.convert("RGB")
+
+
+def compilation_audio_tracks(question_count, total):
+    """
+    전체 길이에 이어지는 BGM 한 줄 + 문제마다 정답 공개 시점의 효과음.
+    구간 길이가 모두 같으므로 효과음은 입력 하나를 주기(CARD_SECONDS + QUESTION_SECONDS)마다 반복한다.
+    """
+    tracks = []
+    if os.path.exists(BGM_PATH):
+        tracks.append({"path": BGM_PATH, "offset": 0.8, "volume": BGM_VOLUME, "loop": True,
+                       "end": total, "fade_out": BGM_FADE_OUT})
+    if os.path.exists(SFX_CORRECT_PATH) and question_count:
+        first_reveal = INTRO_SECONDS + CARD_SECONDS + COUNTDOWN_SECONDS
+        period = CARD_SECONDS + QUESTION_SECONDS
+        tracks.append({"path": SFX_CORRECT_PATH, "start": first_reveal, "volume": 1.0,
+                       "every": period, "end": first_reveal + period * (question_count - 1) + ANSWER_HOLD})
+    return tracks
+
+
+def _segment_plan(quizzes, title, theme, animate):
+    """[(파일 이름, 그 경로에 구간을 인코딩하는 함수), ...] 재생 순서대로"""
+    n = len(quizzes)
+
+    def card(text, subtitle, seconds):
+        return lambda path: write_timeline_video([(render_card(text, subtitle, theme), seconds)], path)
+
+    plan = [("000_intro.mp4", card(title, f"{n} Questions", INTRO_SECONDS))]
+    for i, quiz in enumerate(quizzes, start=1):
+        plan.append((f"{i:03d}_card.mp4", card(f"Question {i}", f"{i} / {n}", CARD_SECONDS)))
+        plan.append((f"{i:03d}_quiz.mp4", lambda path, quiz=quiz: write_quiz_video(quiz, theme, path, animate=animate)))
+    return plan
+
+
+def make_compilation(quizzes, output_path, title=None, theme=None, workers=COMPILATION_WORKERS,
+                     animate=COUNTDOWN_ANIMATION):
+    """
+    퀴즈 리스트 → 모음 영상 하나. output_path 리턴.
+    구간은 workers 개씩 동시에 인코딩하고 (프레임은 구간마다 만들었다 버림), 마지막에 stream copy 로 붙인다.
+    animate: 문제 구간의 카운트다운을 30fps 애니메이션으로 (make_video 와 같은 설정)
+    """
+    if not quizzes:
+        raise ValueError("Compilation needs at least one quiz.")
+    theme = theme or AVAILABLE_THEMES[0]
+    if theme not in THEME_COLORS:
+        raise ValueError(f"Unknown theme '{theme}'")
+    title = title or quizzes[0].get("topic") or f"{quizzes[0].get('category', 'General').capitalize()} Quiz"
+    plan = _segment_plan(quizzes, title, theme, animate)
+    total = INTRO_SECONDS + len(quizzes) * (CARD_SECONDS + QUESTION_SECONDS)
+
+    started = time.time()
+    work_dir = tempfile.mkdtemp(prefix="quiz_compilation_")
+    try:
+        def encode(item):
+            name, write = item
+            path = os.path.join(work_dir, name)
+            write(path)
+            return path
+
+        print(f"🎬 Rendering {len(plan)} segments for '{title}' ({len(quizzes)} questions, {workers} workers)")
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="compilation") as pool:
+            segments = list(pool.map(encode, plan))
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        concat_videos(segments, output_path, audio_tracks=compilation_audio_tracks(len(quizzes), total), total=total)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"✅ Compilation 생성 완료: {output_path} ({total}s, {time.time() - started:.1f}s)")
+    return output_path
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-")[:60] or "quiz"
+
+
+def run_compilation(quiz_file_name=None, topic=None, theme=None) -> dict:
+    """
+    - quiz_file_name: DATA_DIR 의 퀴즈 JSON 에서 topic 의 문제들 (topic 이 없으면 파일의 첫 토픽)
+    - quiz_file_name 없이 topic 만: create_quizzes(topic) 로 새로 생성
+    VIDEOS_DIR/compilation_<topic>_<시각>.mp4 를 만들고 카탈로그에 등록한다.
+    """
+    if quiz_file_name:
+        quiz_path = DATA_DIR / quiz_file_name
+        if not quiz_path.exists():
+            raise FileNotFoundError(f"{quiz_path} not found")
+        quizzes = load_quizzes_from_file(str(quiz_path))
+        topic = topic or quizzes[0].get("topic")
+        if topic:
+            quizzes = [q for q in quizzes if q.get("topic", topic) == topic]
+    elif topic:
+        from .generate_quiz import create_quizzes
+
+        quizzes = create_quizzes(topic).get("questions", [])
+    else:
+        raise ValueError("Either quiz_file_name or topic is required.")
+    if not quizzes:
+        raise ValueError(f"No quizzes for topic '{topic}'")
+
+    VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    output_path = str(VIDEOS_DIR / f"compilation_{_slug(topic or 'quiz')}_{stamp}.mp4")
+    make_compilation(quizzes, output_path, title=topic, theme=theme)
+
+    from .video_catalog import get_catalog
+
+    get_catalog().register(output_path)
+    return {
+        "success": True,
+        "topic": topic,
+        "question_count": len(quizzes),
+        "duration_s": INTRO_SECONDS + len(quizzes) * (CARD_SECONDS + QUESTION_SECONDS),
+        "video": output_path,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render a multi-question compilation video")
+    parser.add_argument("quiz_file", nargs="?", help="quiz JSON in the data directory (omit to generate from --topic)")
+    parser.add_argument("--topic")
+    parser.add_argument("--theme", choices=AVAILABLE_THEMES)
+    args = parser.parse_args()
+    print(json.dumps(run_compilation(args.quiz_file, topic=args.topic, theme=args.theme), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,85 @@ load_dotenv()
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# OpenAI 엔드포인트 (로컬 가짜 서버로 테스트할 때 예: http://127.0.0.1:8765/v1)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
+
+# OpenAI 요청 스케줄러 (모델별 분당 요청/토큰 한도, 재시도 횟수)
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+
 # SerpApi API Key
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 
+# SerpApi 엔드포인트 (로컬 가짜 서버로 테스트할 때 예: http://127.0.0.1:8765)
+SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL")
+
 # Directory paths
 DATA_DIR = "data"           # 퀴즈 JSON 저장 디렉토리
-VIDEOS_DIR = "videos"       # 비디오 저장 디렉토리
\ No newline at end of file
+VIDEOS_DIR = "videos"       # 비디오 저장 디렉토리
+
+# 사전 가공 에셋 번들 위치 (없으면 assets/.bundle)
+ASSET_BUNDLE_DIR = os.getenv("ASSET_BUNDLE_DIR")
+
+# AI 검증 한 번의 요청에 넣을 최대 문제 수 (여러 토픽을 묶어서 검증)
+AI_VALIDATION_BATCH_SIZE = int(os.getenv("AI_VALIDATION_BATCH_SIZE", "30"))
+
+# 트렌드 캐시 TTL (초) 와 최근 처리 토픽 중복 방지
+TRENDS_CACHE_TTL = int(os.getenv("TRENDS_CACHE_TTL", "1800"))
+RECENT_TOPICS_WINDOW_HOURS = float(os.getenv("RECENT_TOPICS_WINDOW_HOURS", "24"))
+RECENT_TOPIC_POLICY = os.getenv("RECENT_TOPIC_POLICY", "skip")  # "skip" 또는 "downweight"
+
+# 트렌드 집계 소스 "geo:category_id:weight,..." 와 동시 요청 수
+TREND_SOURCES = os.getenv("TREND_SOURCES", "US:17:1.0,US:16:0.8,KR:17:0.6,KR:16:0.5,GB:17:0.7,GB:16:0.5")
+TREND_FETCH_CONCURRENCY = int(os.getenv("TREND_FETCH_CONCURRENCY", "6"))
+
+# 생성된 퀴즈 재사용 기간 (같은 엔티티의 다른 트렌드 표기에 다시 제공)
+QUIZ_STORE_TTL_HOURS = float(os.getenv("QUIZ_STORE_TTL_HOURS", "72"))
+
+# Evergreen 퀴즈 저장소 (트렌드가 부족할 때 사용). 유휴 시간에 토픽당 목표 개수까지 미리 생성
+EVERGREEN_TOPICS = os.getenv(
+    "EVERGREEN_TOPICS",
+    "NBA history,FIFA World Cup history,Olympic Games records,Super Bowl history,"
+    "Tennis Grand Slam records,MLB World Series history,Premier League history,Formula 1 champions",
+)
+RESERVOIR_TARGET_PER_TOPIC = int(os.getenv("RESERVOIR_TARGET_PER_TOPIC", "10"))
+RESERVOIR_MAX_AGE_DAYS = float(os.getenv("RESERVOIR_MAX_AGE_DAYS", "30"))
+
+# YouTube resumable 업로드 (로컬 가짜 서버로 테스트할 때 예: http://127.0.0.1:8765/upload/youtube/v3/videos)
+YOUTUBE_UPLOAD_URL = os.getenv("YOUTUBE_UPLOAD_URL", "https://www.googleapis.com/upload/youtube/v3/videos")
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))  # 256 KiB 배수로 맞춰짐
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "2"))
+
+# YouTube OAuth (client_secret.json 으로 한 번 로그인 → 토큰 파일에 저장, 이후 자동 갱신)
+YOUTUBE_CLIENT_SECRETS = os.getenv("YOUTUBE_CLIENT_SECRETS", "client_secret.json")
+YOUTUBE_TOKEN_FILE = os.getenv("YOUTUBE_TOKEN_FILE", os.path.join("data", "youtube_token.json"))
+
+# YouTube 일일 quota (units, 매일 자정 Pacific 에 리셋) 와 공개 예약 시각 (publishAt)
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+PUBLISH_TIMES = os.getenv("PUBLISH_TIMES", "08:00,11:00,14:00,17:00,20:00,22:00")  # 하루 중 공개 시각 "HH:MM,..."
+PUBLISH_TIMEZONE = os.getenv("PUBLISH_TIMEZONE", "")  # PUBLISH_TIMES 기준 시간대 (예: America/New_York, 비우면 서버 로컬)
+PUBLISH_LEAD_MINUTES = int(os.getenv("PUBLISH_LEAD_MINUTES", "30"))  # 업로드 후 공개까지 최소 여유 (처리 시간)
+
+# 렌더된 영상 보관 정책. 기본은 꺼져 있음 (0 이면 해당 정책 끔) → 파일을 지우려면 직접 켠다
+#   예: RETENTION_MAX_BYTES=21474836480 (20 GiB), RETENTION_MAX_AGE_DAYS=14
+#   먼저 python -m src.video_retention --dry-run 으로 지울 대상을 확인할 것
+RETENTION_ROOTS = os.getenv("RETENTION_ROOTS", f"{VIDEOS_DIR},rendered_shorts,videos_out")  # 관리할 폴더
+RETENTION_MAX_BYTES = int(os.getenv("RETENTION_MAX_BYTES", "0"))  # 전체 용량 상한 (오래 안 받은 것부터 삭제)
+RETENTION_MAX_AGE_DAYS = float(os.getenv("RETENTION_MAX_AGE_DAYS", "0"))
+RETENTION_KEEP_UNTIL_UPLOADED = os.getenv("RETENTION_KEEP_UNTIL_UPLOADED", "rendered_shorts")  # 업로드 전엔 안 지울 폴더
+
+# POST /render (단일 퀴즈 즉시 렌더): 전용 렌더 스레드 수, 결과 캐시 폴더와 최대 크기 (bytes)
+# 결과는 디스크에 두므로 uvicorn 워커 여러 개가 같은 폴더를 보면 어느 워커든 /render/<key>.mp4 를 준다
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", "1"))
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "render_cache")
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# 배치 렌더 큐 (/video-batch, 스케줄러가 같이 씀): 동시에 렌더할 영상 수 (ffmpeg 가 코어를 다 씀)
+RENDER_QUEUE_WORKERS = int(os.getenv("RENDER_QUEUE_WORKERS", "1"))
+
+# 여러 문제 모음 영상 (compilation): 문제 구간을 동시에 몇 개까지 렌더할지
+COMPILATION_WORKERS = int(os.getenv("COMPILATION_WORKERS", "2"))
+
+# 카운트다운 진행 표시줄을 30fps 로 부드럽게 채우기 (1 이면 켬, 0 이면 1초마다 바뀌는 정지 프레임)
+COUNTDOWN_ANIMATION = os.getenv("COUNTDOWN_ANIMATION", "0") == "1"
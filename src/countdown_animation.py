@@ -0,0 +1,173 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .generate_quiz_video import (
+    ANSWER_HOLD,
+    COUNTDOWN_SECONDS,
+    FPS,
+    PROGRESS_BAR_Y,
+    PROGRESS_GRAY,
+    PROGRESS_LINE_WIDTH,
+    PROGRESS_RADIUS,
+    PROGRESS_WIDTH,
+    THEME_COLORS,
+    parse_quiz,
+    progress_positions,
+    render_frame,
+    validate_word_limits,
+)
+
+# ======================
+# 부드러운 카운트다운 (30fps)
+# ======================
+# 정지 버전은 진행 표시줄만 다른 전체 프레임 5장을 렌더한다. 애니메이션 버전은
+#   - 진행 표시줄이 빈 base 프레임을 한 번만 렌더하고
+#   - 진행 표시줄 띠(STRIP) 만 프레임마다 numpy 로 합성한다
+#       · 선: 미리 그린 마스크에서 채워진 길이만큼 열을 테마색으로 (np.copyto)
+#       · 원: 미리 그린 스프라이트 (크기별 pop 애니메이션) 를 alpha 합성
+#       · 끝난 선/원은 settled 띠에 한 번 구워 두고, 프레임마다 바뀌는 부분(채우는 선, pop 중인 원)만 다시 그린다
+#   - 띠는 rawvideo 로 ffmpeg 에 흘려보내고 ffmpeg 가 base 위에 overlay (video_writer.write_overlay_video)
+# 원 i 는 i 초에 채워지며 (정지 버전의 progress=i+1 와 같은 시점) POP_FRAMES 동안 POP_SCALE 만큼 커졌다 돌아오고,
+# 그 다음 1초 동안 원 i → i+1 사이 선이 채워진다.
+POP_FRAMES = 9           # 0.3초 @ 30fps
+POP_SCALE = 0.25         # 최대 25% 커짐
+STRIP_PAD = 40           # 원 중심에서 띠 가장자리까지 (pop 최대 반지름 + 여유, 짝수)
+OUTLINE_WIDTH = 5
+SPRITE_RADIUS = int(math.ceil(PROGRESS_RADIUS * (1 + POP_SCALE))) + 1
+
+STRIP_X = progress_positions()[0] - STRIP_PAD
+STRIP_Y = PROGRESS_BAR_Y - STRIP_PAD
+STRIP_SIZE = (PROGRESS_WIDTH + 2 * STRIP_PAD, 2 * STRIP_PAD)   # (w, h), yuv420 overlay 라 짝수
+
+
+def pop_scales(frames=POP_FRAMES, amount=POP_SCALE):
+    """pop 애니메이션 프레임별 크기 배율 (1 → 1+amount → 1)"""
+    return [1 + amount * math.sin(math.pi * k / frames) for k in range(frames)]
+
+
+@lru_cache(maxsize=None)
+def circle_sprite(color, scale=1.0):
+    """
+    채워진 원 스프라이트 (premultiplied rgb, 1 - alpha) float32 배열, 크기 (2R+1, 2R+1).
+    scale=1 이면 draw_progress_bar 의 원과 픽셀 단위로 같다 (alpha 는 0/1).
+    """
+    size = 2 * SPRITE_RADIUS + 1
+    sprite = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    r = int(round(PROGRESS_RADIUS * scale))
+    c = SPRITE_RADIUS
+    ImageDraw.Draw(sprite).ellipse([c - r, c - r, c + r, c + r], fill=tuple(color),
+                                   outline=PROGRESS_GRAY, width=OUTLINE_WIDTH)
+    rgba = np.asarray(sprite, dtype=np.float32) / 255.0
+    alpha = rgba[..., 3:4]
+    return rgba[..., :3] * alpha * 255.0, 1.0 - alpha
+
+
+@lru_cache(maxsize=1)
+def line_masks():
+    """선 4개의 마스크 (띠 좌표, 원 영역은 제외) 와 각 선의 띠 안 x 범위 [(x0, x1), ...]"""
+    w, h = STRIP_SIZE
+    mask = Image.new("L", (w, h), 0)
+    draw = ImageDraw.Draw(mask)
+    centers = [x - STRIP_X for x in progress_positions()]
+    cy = PROGRESS_BAR_Y - STRIP_Y
+    r = PROGRESS_RADIUS
+    spans = []
+    for x1, x2 in zip(centers, centers[1:]):
+        draw.line([(x1 + r, cy), (x2 - r, cy)], fill=255, width=PROGRESS_LINE_WIDTH)
+        spans.append((x1 + r, x2 - r + 1))
+    # 원이 선 위에 그려지므로 원 영역은 선 마스크에서 뺀다 → 선과 원은 겹치지 않는다
+    for x in centers:
+        draw.ellipse([x - r, cy - r, x + r, cy + r], fill=0)
+    return np.asarray(mask, dtype=bool), spans
+
+
+class CountdownAnimator:
+    def __init__(self, base_strip, theme_color, fps=FPS, seconds=COUNTDOWN_SECONDS):
+        """base_strip: 진행 표시줄이 비어 있는 (progress=0) 프레임에서 잘라낸 띠 (h, w, 3) uint8"""
+        self.base = np.ascontiguousarray(base_strip, dtype=np.uint8)
+        self.color = np.array(theme_color[:3], dtype=np.uint8)
+        self.fps = fps
+        self.seconds = seconds
+        self.mask, self.spans = line_masks()
+        self.centers = [x - STRIP_X for x in progress_positions()]
+        self.cy = PROGRESS_BAR_Y - STRIP_Y
+        self.sprites = [circle_sprite(tuple(theme_color[:3]), round(s, 4)) for s in pop_scales()]
+        self.settled_sprite = circle_sprite(tuple(theme_color[:3]), 1.0)
+
+    @property
+    def frame_count(self):
+        return self.seconds * self.fps
+
+    def _fill_line(self, strip, i, fraction):
+        x0, x1 = self.spans[i]
+        cut = x0 + int(round((x1 - x0) * fraction))
+        if cut > x0:
+            np.copyto(strip[:, x0:cut], self.color, where=self.mask[:, x0:cut, None])
+
+    def _blend_circle(self, strip, i, sprite):
+        premul, inv_alpha = sprite
+        x0 = self.centers[i] - SPRITE_RADIUS
+        y0 = self.cy - SPRITE_RADIUS
+        h, w = inv_alpha.shape[:2]
+        region = strip[y0:y0 + h, x0:x0 + w]
+        region[...] = (region * inv_alpha + premul + 0.5).astype(np.uint8)
+
+    def frames(self):
+        """띠 프레임 generator (frame_count 장). 같은 배열을 재사용하지 않으므로 받은 쪽이 보관해도 된다"""
+        settled = self.base.copy()
+        lines = len(self.spans)
+        for k in range(self.frame_count):
+            sec, sub = divmod(k, self.fps)
+            if sub == 0 and sec > 0:
+                # 지난 1초의 선과 원을 settled 에 굽는다 (선과 원은 겹치지 않으므로 순서 무관)
+                if sec - 1 < lines:
+                    self._fill_line(settled, sec - 1, 1.0)
+                self._blend_circle(settled, sec - 1, self.settled_sprite)
+            strip = settled.copy()
+            if sec < lines:
+                self._fill_line(strip, sec, (sub + 1) / self.fps)
+            if sec < len(self.centers):
+                sprite = self.sprites[sub] if sub < len(self.sprites) else self.settled_sprite
+                self._blend_circle(strip, sec, sprite)
+            yield strip
+
+    def final(self):
+        """카운트다운이 끝난 뒤의 띠 (선/원 모두 채워짐) → 정답 공개 프레임에 붙인다"""
+        strip = self.base.copy()
+        for i in range(len(self.spans)):
+            self._fill_line(strip, i, 1.0)
+        for i in range(min(self.seconds, len(self.centers))):
+            self._blend_circle(strip, i, self.settled_sprite)
+        return strip
+
+
+def crop_strip(frame):
+    w, h = STRIP_SIZE
+    return np.asarray(frame.crop((STRIP_X, STRIP_Y, STRIP_X + w, STRIP_Y + h)))
+
+
+def build_animated_countdown(quiz_data, theme, fps=FPS):
+    """
+    write_overlay_video 에 넘길 값 dict:
+      base (진행 표시줄이 빈 프레임), frames (띠 generator), frame_count, overlay_xy,
+      tail ([(정답 공개 프레임, ANSWER_HOLD)], 진행 표시줄은 애니메이션 마지막 상태)
+    """
+    question, choices, answer_idx, category = parse_quiz(quiz_data)
+    validate_word_limits(question, choices, q_limit=10, a_limit=5)
+
+    base = render_frame(question, choices, category, progress=0, reveal=False, answer_idx=answer_idx, theme=theme)
+    animator = CountdownAnimator(crop_strip(base), THEME_COLORS[theme]["primary"], fps=fps)
+
+    ans_frame = render_frame(question, choices, category, progress=COUNTDOWN_SECONDS, reveal=True,
+                             answer_idx=answer_idx, theme=theme)
+    ans_frame.paste(Image.fromarray(animator.final()), (STRIP_X, STRIP_Y))
+    return {
+        "base": base,
+        "frames": animator.frames(),
+        "frame_count": animator.frame_count,
+        "overlay_xy": (STRIP_X, STRIP_Y),
+        "tail": [(ans_frame, ANSWER_HOLD)],
+    }
@@ -0,0 +1,388 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# ======================
+# 로컬 가짜 OpenAI / SerpAPI 서버
+# ======================
+# 돈/네트워크 없이 파이프라인 처리량과 재시도 동작을 재현 가능하게 측정하기 위한 stand-in.
+#   POST /v1/chat/completions  - 퀴즈 생성 / AI 검증 프롬프트에 맞는 JSON 응답 (stream=true 면 SSE)
+#   GET  /search.json          - SerpAPI google_trends_trending_now 형식 응답
+#   POST /upload/youtube/v3/videos?uploadType=resumable → Location (session URI)
+#   PUT  <session URI>         - resumable 업로드 chunk / 상태 조회 (308 + Range, 완료 시 200)
+#   GET  /_stats               - 요청/주입된 오류 카운트
+#
+#   python -m src.fake_services --port 8765 --latency 0.5 --error-rate 0.05 --malformed-rate 0.05
+#   OPENAI_BASE_URL=http://127.0.0.1:8765/v1 SERPAPI_BASE_URL=http://127.0.0.1:8765 python -m src.quiz_batch
+
+TREND_POOL = {
+    "17": [
+        "lakers vs celtics", "boston celtics", "celtics game", "lionel messi", "inter miami",
+        "real madrid", "manchester united", "chiefs vs bills", "patrick mahomes", "yankees",
+        "shohei ohtani", "dodgers", "stephen curry", "golden state warriors", "son heung-min",
+        "tottenham", "wimbledon", "carlos alcaraz", "f1 las vegas", "lewis hamilton",
+        "nba trade deadline", "super bowl", "world series", "premier league", "la liga",
+    ],
+    "16": [
+        "taylor swift", "bts", "oscars", "squid game", "grammys", "stranger things",
+        "beyonce", "marvel", "netflix", "dune", "blackpink", "the bear",
+    ],
+}
+
+
+class FakeServiceSettings:
+    """주입할 지연/오류 설정. 모든 비율은 0~1"""
+
+    def __init__(self, latency=0.2, latency_jitter=0.5, error_rate=0.0, rate_limit_share=0.7,
+                 retry_after=1.0, malformed_rate=0.0, reject_rate=0.1, stream_chunk_chars=16,
+                 stream_chunk_delay=0.02, upload_error_rate=0.0, seed=None):
+        self.latency = latency                  # 평균 응답 지연 (초)
+        self.latency_jitter = latency_jitter    # 지연 변동 비율 (±)
+        self.error_rate = error_rate            # HTTP 오류 응답 비율
+        self.rate_limit_share = rate_limit_share  # 오류 중 429 비율 (나머지 500)
+        self.retry_after = retry_after          # 429 의 Retry-After (초)
+        self.malformed_rate = malformed_rate    # 200 이지만 JSON 이 깨진 응답 비율
+        self.reject_rate = reject_rate          # AI 검증에서 문제를 reject 하는 비율
+        self.stream_chunk_chars = stream_chunk_chars  # stream=true 응답 chunk 당 글자 수
+        self.stream_chunk_delay = stream_chunk_delay  # chunk 사이 지연 (토큰 생성 속도 흉내)
+        self.upload_error_rate = upload_error_rate    # 업로드 chunk 를 절반만 받고 503 내는 비율
+        self.uploads = {}  # upload_id → {"size", "received": bytearray, "metadata", "video_id"}
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "chat_requests": 0, "search_requests": 0, "errors_429": 0, "errors_500": 0,
+            "malformed": 0, "streamed_requests": 0, "uploads_started": 0, "upload_chunks": 0,
+            "upload_errors": 0, "uploads_completed": 0, "upload_bytes": 0, "generated_questions": 0, "validated_questions": 0, "rejected_questions": 0,
+        }
+
+    def rand(self):
+        with self.lock:
+            return self.random.random()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+
+# -------------------------------------------
+# 응답 생성
+# -------------------------------------------
+def _fake_questions(topic, count, rng):
+    words = topic.split()[:5]
+    subject = " ".join(words) or "this team"
+    questions = []
+    for i in range(count):
+        n = rng.randint(1, 10_000)
+        options = [f"Choice {n + k}" for k in range(4)]
+        questions.append({
+            "question": f"Which fact #{n} is true about {subject}?",
+            "options": options,
+            "answer": rng.choice(options),
+        })
+    return questions
+
+
+def _generation_content(prompt, settings):
+    count_match = re.search(r"Create \*\*(\d+)\*\* NEW", prompt)
+    topic_match = re.search(r'questions about "(.*?)"', prompt)
+    count = int(count_match.group(1)) if count_match else 10
+    topic = topic_match.group(1) if topic_match else "sports"
+    with settings.lock:
+        questions = _fake_questions(topic, count, settings.random)
+    settings.count("generated_questions", len(questions))
+    return json.dumps({"questions": questions})
+
+
+def _validation_content(prompt, settings):
+    # 검증 프롬프트의 "JSON:" 뒤 질문 목록에서 id 를 읽는다
+    ids = [int(m) for m in re.findall(r'"_id":\s*(\d+)', prompt)]
+    if not ids:
+        ids = [int(m) for m in re.findall(r'"id":\s*(\d+)', prompt)]
+    results = []
+    for q_id in ids:
+        valid = settings.rand() >= settings.reject_rate
+        results.append({"id": q_id, "valid": valid, "reason": "" if valid else "Answer is not verifiable"})
+        settings.count("validated_questions")
+        if not valid:
+            settings.count("rejected_questions")
+    return json.dumps({"results": results})
+
+
+def build_chat_content(messages, settings):
+    prompt = "\n".join(m.get("content") or "" for m in messages if m.get("role") == "user")
+    if "factual validator" in prompt:
+        return _validation_content(prompt, settings)
+    return _generation_content(prompt, settings)
+
+
+def _chat_completion_body(model, content):
+    prompt_tokens = 800
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _chat_chunk(chunk_id, model, delta, finish_reason=None):
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def _trending_body(params, settings):
+    category = params.get("category_id", "17")
+    pool = list(TREND_POOL.get(str(category), TREND_POOL["17"]))
+    with settings.lock:
+        settings.random.shuffle(pool)
+    return {
+        "search_metadata": {"status": "Success"},
+        "search_parameters": params,
+        "trending_searches": [
+            {"query": q, "search_volume": 1000 * (len(pool) - i), "active": True}
+            for i, q in enumerate(pool)
+        ],
+    }
+
+
+# -------------------------------------------
+# HTTP handler
+# -------------------------------------------
+class FakeServiceHandler(BaseHTTPRequestHandler):
+    settings = None  # make_server 에서 주입
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):  # 요청마다 stderr 출력하지 않음
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, model, content):
+        """chat.completions stream=true 형식 (SSE) 으로 content 를 조금씩 보낸다"""
+        s = self.settings
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(body):
+            self.wfile.write(f"data: {json.dumps(body)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        step = max(1, s.stream_chunk_chars)
+        try:
+            event(_chat_chunk(chunk_id, model, {"role": "assistant", "content": ""}))
+            for i in range(0, len(content), step):
+                time.sleep(s.stream_chunk_delay)
+                event(_chat_chunk(chunk_id, model, {"content": content[i:i + step]}))
+            event(_chat_chunk(chunk_id, model, {}, "stop"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 스트림을 중간에 끊음
+
+    def _simulate(self):
+        """지연 + 오류 주입. 오류 응답을 보냈으면 True"""
+        s = self.settings
+        jitter = 1 + (s.rand() * 2 - 1) * s.latency_jitter
+        time.sleep(max(0.0, s.latency * jitter))
+        if s.rand() < s.error_rate:
+            if s.rand() < s.rate_limit_share:
+                s.count("errors_429")
+                self._send_json(429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                                "code": "rate_limit_exceeded"}},
+                                {"Retry-After": f"{s.retry_after:g}"})
+            else:
+                s.count("errors_500")
+                self._send_json(500, {"error": {"message": "Internal server error", "type": "server_error"}})
+            return True
+        return False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/_stats":
+            with self.settings.lock:
+                self._send_json(200, dict(self.settings.stats))
+            return
+        if url.path == "/search.json":
+            self.settings.count("search_requests")
+            if self._simulate():
+                return
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            self._send_json(200, _trending_body(params, self.settings))
+            return
+        self._send_json(404, {"error": "not found"})
+
+    # -------------------------------------------
+    # YouTube resumable upload stand-in
+    # -------------------------------------------
+    def _start_upload(self, raw):
+        s = self.settings
+        upload_id = uuid.uuid4().hex
+        size = int(self.headers.get("X-Upload-Content-Length") or 0)
+        with s.lock:
+            s.uploads[upload_id] = {"size": size, "received": bytearray(), "metadata": json.loads(raw or b"{}"),
+                                    "video_id": None}
+        s.count("uploads_started")
+        host = self.headers.get("Host") or f"{self.server.server_address[0]}:{self.server.server_address[1]}"
+        location = f"http://{host}/upload/youtube/v3/videos?uploadType=resumable&upload_id={upload_id}"
+        self._send_json(200, {}, {"Location": location})
+
+    def _upload_status(self, upload):
+        if upload["video_id"]:
+            body = {"id": upload["video_id"], "kind": "youtube#video", **upload["metadata"],
+                    "status": {**upload["metadata"].get("status", {}), "uploadStatus": "uploaded"}}
+            self._send_json(200, body)
+            return
+        received = len(upload["received"])
+        headers = {"Range": f"bytes=0-{received - 1}"} if received else {}
+        self._send_json(308, b"", headers)
+
+    def do_PUT(self):
+        s = self.settings
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+
+        with s.lock:
+            upload = s.uploads.get(params.get("upload_id"))
+        if not url.path.startswith("/upload/") or upload is None:
+            self._send_json(404, {"error": "upload session not found"})
+            return
+
+        content_range = self.headers.get("Content-Range", "")
+        match = re.match(r"bytes (\d+)-(\d+)/(\d+)", content_range)
+        if not match:  # "bytes */total" → 상태 조회
+            self._upload_status(upload)
+            return
+
+        s.count("upload_chunks")
+        start = int(match.group(1))
+        with s.lock:
+            received = len(upload["received"])
+        if start != received:
+            self._upload_status(upload)  # 클라이언트가 위치를 다시 맞추도록
+            return
+
+        if s.rand() < s.upload_error_rate:
+            # chunk 절반만 받고 서버 오류 → 클라이언트는 상태 조회 후 이어서 보내야 한다
+            with s.lock:
+                upload["received"] += data[: len(data) // 2]
+            s.count("upload_errors")
+            s.count("upload_bytes", len(data) // 2)
+            self._send_json(503, {"error": {"message": "Backend Error"}})
+            return
+
+        with s.lock:
+            upload["received"] += data
+            done = len(upload["received"]) >= upload["size"]
+            if done:
+                upload["video_id"] = f"fake{uuid.uuid4().hex[:7]}"
+        s.count("upload_bytes", len(data))
+        if done:
+            s.count("uploads_completed")
+        self._upload_status(upload)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+
+        if url.path.startswith("/upload/") and url.path.endswith("/videos"):
+            self._start_upload(raw)
+            return
+
+        if url.path.rstrip("/").endswith("/chat/completions"):
+            self.settings.count("chat_requests")
+            if self._simulate():
+                return
+            req = json.loads(raw or b"{}")
+            content = build_chat_content(req.get("messages", []), self.settings)
+            if self.settings.rand() < self.settings.malformed_rate:
+                self.settings.count("malformed")
+                content = content[: len(content) // 2]  # 잘린 JSON
+            if req.get("stream"):
+                self.settings.count("streamed_requests")
+                self._send_stream(req.get("model", "fake"), content)
+                return
+            self._send_json(200, _chat_completion_body(req.get("model", "fake"), content))
+            return
+        self._send_json(404, {"error": "not found"})
+
+
+def make_server(host="127.0.0.1", port=0, settings=None):
+    settings = settings or FakeServiceSettings()
+    handler = type("BoundFakeServiceHandler", (FakeServiceHandler,), {"settings": settings})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_fake_server(host="127.0.0.1", port=0, settings=None):
+    """백그라운드 스레드에서 서버 실행. (server, base_url) 리턴. 끝나면 server.shutdown()"""
+    server = make_server(host, port, settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake OpenAI / SerpAPI server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.1)
+    parser.add_argument("--upload-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = FakeServiceSettings(latency=args.latency, error_rate=args.error_rate,
+                                   malformed_rate=args.malformed_rate, reject_rate=args.reject_rate,
+                                   upload_error_rate=args.upload_error_rate, seed=args.seed)
+    server = make_server(args.host, args.port, settings)
+    print(f"🧪 Fake OpenAI/SerpAPI/YouTube upload on http://{args.host}:{args.port} "
+          f"(OPENAI_BASE_URL=http://{args.host}:{args.port}/v1, "
+          f"YOUTUBE_UPLOAD_URL=http://{args.host}:{args.port}/upload/youtube/v3/videos)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 종료합니다.")
+
+
+if __name__ == "__main__":
+    main()
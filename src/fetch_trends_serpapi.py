@@ -1,5 +1,42 @@
-from serpapi import GoogleSearch
-from .config import SERPAPI_API_KEY
+from .config import SERPAPI_API_KEY, SERPAPI_BASE_URL
+
+# 검색 백엔드: params dict → SerpAPI 응답 dict. 테스트/벤치마크에서 set_search_backend 로 교체
+_search_backend = None
+
+
+def _http_get_json(base_url, params, session=None):
+    import requests
+
+    resp = (session or requests).get(f"{base_url.rstrip('/')}/search.json", params=params, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def serpapi_search(params):
+    """
+    기본 백엔드. SERPAPI_BASE_URL 이 있으면 (로컬 가짜 서버 등) 그 주소로 직접 요청하고,
+    없으면 google-search-results 의 GoogleSearch 를 쓴다.
+    """
+    if SERPAPI_BASE_URL:
+        return _http_get_json(SERPAPI_BASE_URL, params)
+
+    from serpapi import GoogleSearch  # 첫 호출 때만 import (앱 시작 시간 단축)
+
+    return GoogleSearch(params).get_dict()
+
+
+def http_search_backend(base_url):
+    """base_url 의 SerpAPI 호환 서버(/search.json)를 쓰는 백엔드 (커넥션 재사용)"""
+    import requests
+
+    session = requests.Session()
+    return lambda params: _http_get_json(base_url, params, session)
+
+
+def set_search_backend(backend):
+    """backend(params) -> dict 로 교체. None 이면 serpapi_search 로 복귀"""
+    global _search_backend
+    _search_backend = backend
 
 
 def fetch_trending_topics(n: int = 15, geo: str = "US", category_id: int = 17):
@@ -26,8 +63,7 @@ def fetch_trending_topics(n: int = 15, geo: str = "US", category_id: int = 17):
         "only_active": True, # Include only currently active trends
     }
 
-    search = GoogleSearch(params)
-    result = search.get_dict()
+    result = (_search_backend or serpapi_search)(params)
 
     # Extract topics (queries) from the result
     trending = result.get("trending_searches", [])
@@ -1,25 +1,86 @@
 import json
 import re
-import time
-import random
 import logging
-from openai import OpenAI
-from .config import OPENAI_API_KEY
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .config import OPENAI_API_KEY, OPENAI_BASE_URL, AI_VALIDATION_BATCH_SIZE
+from .openai_scheduler import get_scheduler, estimate_tokens
+from .quiz_prescreen import prescreen_quiz, record_request_saved
 
 # -------------------------------------------
 # Initialization
 # -------------------------------------------
 KNOWLEDGE_CUTOFF = "May 2024"
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+GENERATION_MODEL = "gpt-5-mini"
+VALIDATION_MODEL = "gpt-5.1"
+# 카테고리별 "검증 가능한 사실" 예시 (프롬프트용)
+CATEGORY_FACT_EXAMPLES = {
+    "Sports": "team titles, main stadium names, career totals, draft year, team roster moves",
+    "Entertainment": "award wins, release years, lead cast, chart-topping hits, franchise entries",
+}
+DEFAULT_CATEGORY = "Sports"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
+# token bucket 용 예상 응답 토큰 수
+GENERATION_COMPLETION_TOKENS = 3000
+VALIDATION_COMPLETION_TOKENS = 800
+
+# OpenAI 클라이언트/로깅은 처음 쓸 때 만든다 (import 시점 비용·부작용 없음)
+_client = None
+_client_lock = threading.Lock()
 
 logger = logging.getLogger(__name__)
 
+
+def setup_logging():
+    """기본 로깅 설정 (이미 핸들러가 있으면 아무것도 하지 않음)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+
+def get_client():
+    """프로세스 당 하나의 OpenAI 클라이언트 (첫 호출 때 openai 를 import)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+
+                setup_logging()
+                # 재시도는 openai_scheduler 가 담당하므로 SDK 자체 재시도는 끈다
+                _client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)
+    return _client
+
+
+def set_client(client):
+    """
+    OpenAI 호환 클라이언트 교체 (테스트/벤치마크용).
+    예: set_client(OpenAI(base_url="http://127.0.0.1:8765/v1", api_key="fake", max_retries=0))
+    None 을 넣으면 다음 호출 때 설정값으로 다시 만든다.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def chat_completion(model: str, messages: list[dict], completion_tokens: int, **kwargs):
+    """공용 스케줄러(rate limit + backoff 재시도)를 거쳐 chat.completions.create 호출"""
+    return get_scheduler().call(
+        model,
+        lambda: get_client().chat.completions.create(model=model, messages=messages, **kwargs),
+        est_tokens=estimate_tokens(messages, completion_tokens),
+    )
+
+
+def __getattr__(name):
+    # 기존 코드의 generate_quiz.client 접근 호환
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # -------------------------------------------
 # Utility helpers
 # -------------------------------------------
@@ -149,22 +210,31 @@ def validate_and_fix_quiz(quiz_obj: dict) -> tuple[dict, bool]:
 # -------------------------------------------
 # AI Fact Check
 # -------------------------------------------
-def validate_with_ai(quiz_data: dict, topic: str) -> tuple[list, str]:
+def build_validation_prompt(items: list[dict], category: str = DEFAULT_CATEGORY) -> str:
     """
-    Validates questions individually.
-    Returns: (list_valid_question, )
+    items: 검증할 문제들. 각 문제에 "_id" (요청 안에서 고유) 와 "topic" 이 들어 있다.
+    토픽이 하나면 기존 단일 토픽 프롬프트, 여러 개면 문제마다 topic 태그를 붙여서 보낸다.
+    category: 문제들이 모두 같은 카테고리면 그 이름, 섞여 있으면 None
     """
-    questions = quiz_data.get("questions", [])
-    
-    for idx, q in enumerate(questions):
-        q["_id"] = idx
-
-    quiz_text = json.dumps(questions, indent=2)
-
-    validation_prompt = f"""
+    facts = f"{category.lower()} facts" if category else "facts"
+    topics = list(dict.fromkeys(q["topic"] for q in items))
+    if len(topics) == 1:
+        topic_line = f'TOPIC: "{topics[0]}"'
+        payload = [{k: v for k, v in q.items() if k != "topic"} for q in items]
+        relevance_rule = f'Reject only if the question is completely unrelated to any main entity or component mentioned in the TOPIC: "{topics[0]}".'
+        duplicate_rule = f"The {len(items)} questions must be different."
+    else:
+        topic_line = 'TOPICS: each question has its own "topic" field.'
+        payload = items
+        relevance_rule = 'Reject only if the question is completely unrelated to any main entity or component mentioned in **its own** "topic" field. Judge every question independently.'
+        duplicate_rule = 'Questions with the same "topic" must be different from each other.'
+
+    quiz_text = json.dumps(payload, indent=2)
+
+    return f"""
         You are an expert factual validator. Check this trivia quiz:
 
-        TOPIC: "{topic}"
+        {topic_line}
 
         JSON:
         {quiz_text}
@@ -173,12 +243,12 @@ def validate_with_ai(quiz_data: dict, topic: str) -> tuple[list, str]:
         1. **Factual correctness**: **REJECT ONLY** if the **correct answer provided is provably false** as a stable, verifiable fact (up to {KNOWLEDGE_CUTOFF}). Do not reject if the question is "misleading" but the provided answer is factually correct (e.g., Toluca has 10 titles, Monterrey has 5; rejecting the answer "Toluca" is incorrect).
         2. **Ambiguity**: **REJECT ONLY** if the correct answer is subjective (e.g., 'most important') or if multiple options could also be the single correct answer based on stable facts. **Questions about relative counts/rankings (e.g., "who has more titles?") are allowed if the answer is factually correct.**
         3. **Future content**: Reject if referencing events after **{KNOWLEDGE_CUTOFF}**.
-        4. **Topic relevance**: Reject only if the question is completely unrelated to any main entity or component mentioned in the TOPIC: "{topic}".
+        4. **Topic relevance**: {relevance_rule}
 
-        - The ten questions must be different.
-        - Use only widely-known, verifiable sports facts up to **{KNOWLEDGE_CUTOFF}**.
+        - {duplicate_rule}
+        - Use only widely-known, verifiable {facts} up to **{KNOWLEDGE_CUTOFF}**.
 
-        Output **strictly** this JSON format:
+        Output **strictly** this JSON format, one entry for every "_id":
         {{
             "results": [
                 {{ "id": 0, "valid": true, "reason": "" }},
@@ -187,57 +257,116 @@ def validate_with_ai(quiz_data: dict, topic: str) -> tuple[list, str]:
         }}
     """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-5.1",
-            messages=[
-                {"role": "system", "content": "You output strict JSON only."},
-                {"role": "user", "content": validation_prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
 
-        content = response.choices[0].message.content
-        result = json.loads(content)
-        
-        valid_indices = set()
-        rejection_notes = []
-
-        # Parse AI results
-        for res in result.get("results", []):
-            q_id = res.get("id")
-            is_valid = res.get("valid")
-            reason = res.get("reason", "")
-            
-            if is_valid:
-                valid_indices.add(q_id)
-            else:
-                rejection_notes.append(f"Q (ID {q_id}) rejected: {reason}")
+def _validate_chunk(items: list[dict], category: str = DEFAULT_CATEGORY) -> dict:
+    """
+    한 번의 AI 요청으로 items 검증.
+    Returns: {_id: (valid, reason)}  (응답에 없는 id 는 빠짐)
+    """
+    response = chat_completion(
+        VALIDATION_MODEL,
+        [
+            {"role": "system", "content": "You output strict JSON only."},
+            {"role": "user", "content": build_validation_prompt(items, category)},
+        ],
+        VALIDATION_COMPLETION_TOKENS * max(1, (len(items) + 9) // 10),  # 문제 10개당 예상 응답 토큰
+        response_format={"type": "json_object"},
+        temperature=0.1,
+    )
+
+    content = response.choices[0].message.content
+    result = json.loads(content)
+
+    verdicts = {}
+    for res in result.get("results", []):
+        verdicts[res.get("id")] = (bool(res.get("valid")), res.get("reason", ""))
+    return verdicts
+
 
-        # Filter the original list
-        final_valid_questions = [q for q in questions if q["_id"] in valid_indices]
+def _num_requests(n_questions: int, batch_size: int = None) -> int:
+    batch_size = max(1, batch_size or AI_VALIDATION_BATCH_SIZE)
+    return (n_questions + batch_size - 1) // batch_size
 
-        # Cleanup internal ID
-        for q in final_valid_questions:
-            q.pop("_id", None)
 
-        if len(final_valid_questions) > 0:
-            logger.info(f"AI Check Passed: {len(final_valid_questions)} questions valid.")
-            return final_valid_questions, "; ".join(rejection_notes)
+def validate_with_ai_batch(batches: list[tuple[str, dict]], batch_size: int = None,
+                           categories: dict = None) -> list[tuple[list, str]]:
+    """
+    여러 토픽의 문제를 묶어서 검증한다 (요청 하나에 최대 batch_size 문제).
+    batches: [(topic, quiz_data), ...]
+    categories: {topic: category} (없으면 전부 DEFAULT_CATEGORY)
+    Returns: batches 와 같은 순서로 [(valid_questions, rejection_reasons), ...]
+             (토픽별 결과/사유는 validate_with_ai 를 따로 부른 것과 같은 형식)
+    """
+    batch_size = max(1, batch_size or AI_VALIDATION_BATCH_SIZE)
+
+    # 요청 안에서 고유한 _id 를 붙이고, _id → (batch 번호, 토픽 내 번호) 를 기억
+    items = []
+    id_map = {}
+    for b_idx, (topic, quiz_data) in enumerate(batches):
+        for local_id, q in enumerate(quiz_data.get("questions", [])):
+            q_id = len(items)
+            id_map[q_id] = (b_idx, local_id)
+            items.append({**q, "_id": q_id, "topic": topic})
+
+    verdicts = {}
+    errors = {}  # batch 번호 → 오류 메시지
+    for start in range(0, len(items), batch_size):
+        chunk = items[start:start + batch_size]
+        chunk_categories = {(categories or {}).get(q["topic"], DEFAULT_CATEGORY) for q in chunk}
+        try:
+            verdicts.update(_validate_chunk(chunk, chunk_categories.pop() if len(chunk_categories) == 1 else None))
+        except Exception as e:
+            logger.error(f"AI Validation Error: {e}")
+            for q in chunk:
+                errors.setdefault(id_map[q["_id"]][0], f"AI Validation Error: {e}")
+
+    valid = [[] for _ in batches]
+    notes = [[] for _ in batches]
+    for q in items:
+        b_idx, local_id = id_map[q["_id"]]
+        if b_idx in errors or q["_id"] not in verdicts:
+            continue
+        is_valid, reason = verdicts[q["_id"]]
+        if is_valid:
+            valid[b_idx].append({k: v for k, v in q.items() if k not in ("_id", "topic")})
         else:
-            logger.warning(f"AI Check Failed: 0 valid. Reasons: {'; '.join(rejection_notes)}")
-            return [], "; ".join(rejection_notes)
+            notes[b_idx].append(f"Q (ID {local_id}) rejected: {reason}")
 
-    except Exception as e:
-        logger.error(f"AI Validation Error: {e}")
-        return [], f"AI Validation Error: {e}"
+    results = []
+    for b_idx, (topic, _) in enumerate(batches):
+        if b_idx in errors:
+            # 한 토픽이라도 실패한 요청에 들어 있었으면 그 토픽은 전부 다시 생성
+            results.append(([], errors[b_idx]))
+            continue
+        reasons = "; ".join(notes[b_idx])
+        if valid[b_idx]:
+            logger.info(f"AI Check Passed: {len(valid[b_idx])} questions valid for '{topic}'.")
+        else:
+            logger.warning(f"AI Check Failed: 0 valid for '{topic}'. Reasons: {reasons}")
+        results.append((valid[b_idx], reasons))
+
+    if len(items) > 0:
+        logger.info(f"AI validation: {len(items)} questions / {len(batches)} topics in "
+                    f"{_num_requests(len(items), batch_size)} request(s).")
+    return results
+
+
+def validate_with_ai(quiz_data: dict, topic: str, category: str = DEFAULT_CATEGORY) -> tuple[list, str]:
+    """
+    Validates questions individually.
+    Returns: (list_valid_question, rejection_reasons)
+    """
+    return validate_with_ai_batch([(topic, quiz_data)], categories={topic: category})[0]
 
 
 # -------------------------------------------
 # Prompt Builder
 # -------------------------------------------
-def build_quiz_prompt(topic: str, count: int, existing_questions: list[dict], feedback: str) -> str:
+def build_quiz_prompt(topic: str, count: int, existing_questions: list[dict], feedback: str,
+                      category: str = DEFAULT_CATEGORY) -> str:
+    subject = category.lower()
+    examples = CATEGORY_FACT_EXAMPLES.get(category, CATEGORY_FACT_EXAMPLES[DEFAULT_CATEGORY])
+
     # Create a summary of what we already have to prevent duplicates
     existing_summaries = ""
     if existing_questions:
@@ -260,7 +389,7 @@ def build_quiz_prompt(topic: str, count: int, existing_questions: list[dict], fe
         """
 
     base_prompt = f"""
-        You are a creator who makes **fun and engaging** sports quiz content for YouTube.
+        You are a creator who makes **fun and engaging** {subject} quiz content for YouTube.
         Create **{count}** NEW multiple-choice questions about "{topic}" that include interesting and relevant information for casual fans.
 
         {feedback_block}
@@ -269,14 +398,14 @@ def build_quiz_prompt(topic: str, count: int, existing_questions: list[dict], fe
         - The **{count}** questions must be different.
         - **Uniqueness:** Do NOT repeat the content of the "ALREADY GENERATED QUESTIONS".
         - **Limit the word count:** max 12 words for a question and max 6 words for an option.
-        - **Verifiable Facts:** Use **widely-known, verifiable sports facts** (e.g., team titles, main stadium names, career totals, draft year, team roster moves).
+        - **Verifiable Facts:** Use **widely-known, verifiable {subject} facts** (e.g., {examples}).
         - **INFORMATION CUTOFF: All facts MUST be verifiable as of {KNOWLEDGE_CUTOFF}.** Do NOT include any information about events, stats, or team changes that occurred after this date.
         - **Topic Relevance:** Questions must relate to at least one primary component of the TOPIC: "{topic}".
         - **Answer Clarity:** Ensure there is **one clear, correct answer** that exactly matches one option.
         - Avoid overly detailed statistics or rare events unless widely known.
-        - Questions must reference the given sports topic directly.
+        - Questions must reference the given {subject} topic directly.
         - Do not generate questions with multiple potentially correct answers.
-        - Focus on fun, engaging, and factual sports trivia.
+        - Focus on fun, engaging, and factual {subject} trivia.
         - All questions and answers MUST be in English
 
         Output **EXACTLY** this JSON structure - no explanations, no preamble:
@@ -297,75 +426,317 @@ def build_quiz_prompt(topic: str, count: int, existing_questions: list[dict], fe
 # -------------------------------------------
 # Quiz Generator (Modified)
 # -------------------------------------------
-def create_quizzes(topic: str, max_trial=3) -> dict:
-    TARGET_COUNT = 10
-    collected_questions = []
-    rejection_feedback = ""
-    
-    for attempt in range(max_trial):
-        # Check if we desired num of quizzes
-        current_count = len(collected_questions)
-        if current_count >= TARGET_COUNT:
-            break
-            
-        needed = TARGET_COUNT - current_count
-        
-        logger.info(f"Attempt {attempt+1}: Have {current_count}, need {needed} more for '{topic}'")
+TARGET_COUNT = 10
+STRUCTURE_FEEDBACK = "Structural or format issue found (e.g., question too long, wrong number of options, answer not matching option). Ensure all format rules are strictly followed."
 
-        if attempt > 0:
-            time.sleep(1)
 
-        # Build prompt asking only for needed amount
-        current_prompt = build_quiz_prompt(topic, needed, collected_questions, rejection_feedback)
+def _generate_candidates(topic: str, needed: int, collected_questions: list[dict], rejection_feedback: str,
+                         category: str = DEFAULT_CATEGORY) -> tuple[dict, str]:
+    """
+    생성 모델로 needed 개 요청 → 구조 검증까지.
+    Returns: (cleaned_data, "") 또는 실패 시 (None, 다음 시도에 넣을 feedback)
+    """
+    current_prompt = build_quiz_prompt(topic, needed, collected_questions, rejection_feedback, category)
 
-        try:
-            response = client.chat.completions.create(
-                model="gpt-5-mini",
-                messages=[
-                    {"role": "system", "content": "Output valid JSON only."},
-                    {"role": "user", "content": current_prompt},
-                ],
-                response_format={"type": "json_object"},
-            )
+    try:
+        response = chat_completion(
+            GENERATION_MODEL,
+            [
+                {"role": "system", "content": "Output valid JSON only."},
+                {"role": "user", "content": current_prompt},
+            ],
+            GENERATION_COMPLETION_TOKENS,
+            response_format={"type": "json_object"},
+        )
 
-            content = response.choices[0].message.content.strip()
-            raw_data = json.loads(content)
-        
-        except Exception as e:
-            rejection_feedback = f"JSON/API Error: {e}"
-            continue
-        
-        # Structural Validation
-        cleaned_data, ok = validate_and_fix_quiz(raw_data)
-        if not ok:
-            rejection_feedback = "Structural or format issue found (e.g., question too long, wrong number of options, answer not matching option). Ensure all format rules are strictly followed."
-            continue
+        content = response.choices[0].message.content.strip()
+        raw_data = json.loads(content)
 
-        # AI Fact Check
-        new_valid_questions, reason = validate_with_ai(cleaned_data, topic)
-        
-        if new_valid_questions:
-            collected_questions.extend(new_valid_questions)
-            rejection_feedback = "" 
-        else:
-            rejection_feedback = f"Critic rejected batch: {reason}"
+    except Exception as e:
+        return None, f"JSON/API Error: {e}"
+
+    # Structural Validation
+    cleaned_data, ok = validate_and_fix_quiz(raw_data)
+    if not ok:
+        return None, STRUCTURE_FEEDBACK
+    return cleaned_data, ""
+
+
+def _finalize(topic: str, collected_questions: list[dict], target: int = TARGET_COUNT) -> dict:
+    if len(collected_questions) >= target:
+        return {"questions": collected_questions[:target]}
 
-    # Final Check
-    if len(collected_questions) >= TARGET_COUNT:
-        return {"questions": collected_questions[:TARGET_COUNT]}
-    
     # Save all valid questions
-    if len(collected_questions) > 0: 
-        logger.warning(f"Partial success: Returning {len(collected_questions)} questions.")
+    if len(collected_questions) > 0:
+        logger.warning(f"Partial success: Returning {len(collected_questions)} questions for '{topic}'.")
         return {"questions": collected_questions}
-        
+
     logger.error(f"Failed to generate any valid quizzes for '{topic}'.")
     return {}
 
 
+def create_quizzes_many(topics: list[str], max_trial=3, categories: dict = None, targets: dict = None,
+                        deadline: float = None) -> dict:
+    """
+    여러 토픽을 한꺼번에 생성. 시도(attempt)마다 토픽별로 생성/구조 검증을 하고,
+    AI 검증은 그 라운드의 모든 토픽을 묶어서 (AI_VALIDATION_BATCH_SIZE 단위) 요청한다.
+    categories: {topic: "Sports" | "Entertainment" ...} (없으면 DEFAULT_CATEGORY)
+    targets: {topic: 필요한 문제 수} (없으면 TARGET_COUNT)
+    deadline: time.time() 기준. 넘기면 새 토픽 생성은 시작하지 않는다 (이미 생성한 문제는 검증까지 마침)
+    Returns: {topic: quiz_dict}  (각 값은 create_quizzes 결과와 같은 형식)
+    """
+    topics = list(dict.fromkeys(topics))
+    categories = {t: (categories or {}).get(t, DEFAULT_CATEGORY) for t in topics}
+    targets = {t: (targets or {}).get(t, TARGET_COUNT) for t in topics}
+    collected = {t: [] for t in topics}
+    feedback = {t: "" for t in topics}
+
+    def out_of_time():
+        return deadline is not None and time.time() >= deadline
+
+    for attempt in range(max_trial):
+        pending = []  # 이번 라운드 AI 검증 대상 [(topic, cleaned_data)]
+        screen_notes = {}  # pre-screen 에서 버린 사유
+        before = 0         # pre-screen 전 문제 수
+
+        for topic in topics:
+            # Check if we desired num of quizzes
+            current_count = len(collected[topic])
+            if current_count >= targets[topic]:
+                continue
+            if out_of_time():
+                logger.info(f"Deadline reached, not generating more for '{topic}'")
+                break
+
+            needed = targets[topic] - current_count
+            logger.info(f"Attempt {attempt+1}: Have {current_count}, need {needed} more for '{topic}'")
+
+            cleaned_data, error = _generate_candidates(topic, needed, collected[topic], feedback[topic],
+                                                       categories[topic])
+            if cleaned_data is None:
+                feedback[topic] = error
+                continue
+
+            # Local pre-screen (규칙 기반, API 호출 없음)
+            before += len(cleaned_data["questions"])
+            screened_data, screen_reason = prescreen_quiz(cleaned_data, KNOWLEDGE_CUTOFF)
+            screen_notes[topic] = screen_reason
+            if not screened_data["questions"]:
+                logger.warning(f"Pre-screen rejected all questions for '{topic}': {screen_reason}")
+                feedback[topic] = f"Pre-screen rejected batch: {screen_reason}"
+                continue
+            if screen_reason:
+                logger.info(f"Pre-screen dropped some questions for '{topic}': {screen_reason}")
+            pending.append((topic, screened_data))
+
+        # pre-screen 덕분에 줄어든 AI 검증 요청 수
+        after = sum(len(data["questions"]) for _, data in pending)
+        saved = _num_requests(before) - _num_requests(after)
+        if saved > 0:
+            record_request_saved(saved)
+
+        if not pending:
+            if out_of_time() or all(len(collected[t]) >= targets[t] for t in topics):
+                break
+            continue
+
+        # AI Fact Check (multi-topic batch)
+        for (topic, _), (new_valid_questions, reason) in zip(pending, validate_with_ai_batch(pending, categories=categories)):
+            if new_valid_questions:
+                collected[topic].extend(new_valid_questions)
+                feedback[topic] = ""
+            else:
+                feedback[topic] = f"Critic rejected batch: {reason}"
+            if screen_notes.get(topic):
+                # pre-screen 사유도 다음 생성 프롬프트에 알려준다
+                feedback[topic] = "; ".join(filter(None, [feedback[topic], f"Pre-screen rejected: {screen_notes[topic]}"]))
+
+    return {topic: _finalize(topic, collected[topic], targets[topic]) for topic in topics}
+
+
+def create_quizzes(topic: str, max_trial=3) -> dict:
+    return create_quizzes_many([topic], max_trial)[topic]
+
+
+# -------------------------------------------
+# Streaming Quiz Generator
+# -------------------------------------------
+# 몇 문제씩 모아서 AI 검증을 보낼지. 작을수록 첫 문제가 빨리 나오지만 검증 요청 수가 늘어난다.
+STREAM_VALIDATION_GROUP = 2
+STREAM_VALIDATION_WORKERS = 2
+
+
+class QuestionStreamParser:
+    """
+    스트리밍으로 조금씩 들어오는 {"questions": [{...}, {...}]} 텍스트에서
+    완성된 문제 객체를 들어오는 순서대로 꺼낸다 (문자열 안의 괄호/escape 는 무시).
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.buf = None  # 현재 모으는 문제 객체 텍스트
+
+    def feed(self, text: str) -> list[dict]:
+        parsed = []
+        for ch in text:
+            if self.buf is None and ch == "{" and self.depth == 2 and not self.in_string:
+                self.buf = []  # questions 배열 안의 객체 시작
+            if self.buf is not None:
+                self.buf.append(ch)
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 2 and self.buf is not None:
+                    text_obj = "".join(self.buf)
+                    self.buf = None
+                    try:
+                        obj = json.loads(text_obj)
+                    except ValueError:
+                        continue
+                    if isinstance(obj, dict):
+                        parsed.append(obj)
+        return parsed
+
+
+def _stream_candidates(topic: str, needed: int, collected_questions: list[dict], rejection_feedback: str,
+                       category: str = DEFAULT_CATEGORY):
+    """생성 모델 스트리밍 응답에서 문제 dict 를 완성되는 대로 yield"""
+    current_prompt = build_quiz_prompt(topic, needed, collected_questions, rejection_feedback, category)
+    stream = chat_completion(
+        GENERATION_MODEL,
+        [
+            {"role": "system", "content": "Output valid JSON only."},
+            {"role": "user", "content": current_prompt},
+        ],
+        GENERATION_COMPLETION_TOKENS,
+        response_format={"type": "json_object"},
+        stream=True,
+    )
+    parser = QuestionStreamParser()
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield from parser.feed(delta)
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+
+
+def stream_quizzes(topic: str, max_trial=3, limit: int = TARGET_COUNT, category: str = DEFAULT_CATEGORY):
+    """
+    스트리밍 모드 생성기. 생성 응답을 조금씩 파싱해서
+    구조 검증 → pre-screen → AI 검증(STREAM_VALIDATION_GROUP 문제씩, 백그라운드) 을 통과한
+    문제를 하나씩 바로 yield 한다. 최대 limit 문제. 중간에 close() 해도 된다.
+    """
+    collected_questions = []
+    rejection_feedback = ""
+    screened = []  # 라운드마다 [pre-screen 전 문제 수, 후 문제 수] → 아낀 검증 요청 수
+    pool = ThreadPoolExecutor(max_workers=STREAM_VALIDATION_WORKERS, thread_name_prefix="quiz-validate")
+
+    def finished(futures, block):
+        """끝난 검증 결과를 (valid 문제들, 사유) 로 꺼낸다"""
+        for fut in list(futures):
+            if block or fut.done():
+                futures.remove(fut)
+                yield fut.result()
+
+    try:
+        for attempt in range(max_trial):
+            needed = limit - len(collected_questions)
+            if needed <= 0:
+                break
+            logger.info(f"[stream] Attempt {attempt+1}: Have {len(collected_questions)}, need {needed} more for '{topic}'")
+
+            futures = []
+            group = []
+            notes = []
+            round_valid = 0
+            counts = [0, 0]
+            screened.append(counts)
+
+            def submit(questions):
+                futures.append(pool.submit(validate_with_ai, {"questions": list(questions)}, topic, category))
+
+            try:
+                for q in _stream_candidates(topic, needed, collected_questions, rejection_feedback, category):
+                    cleaned_data, ok = validate_and_fix_quiz({"questions": [q]})
+                    if not ok:
+                        notes.append(STRUCTURE_FEEDBACK)
+                        continue
+                    screened_data, screen_reason = prescreen_quiz(cleaned_data, KNOWLEDGE_CUTOFF)
+                    counts[0] += len(cleaned_data["questions"])
+                    counts[1] += len(screened_data["questions"])
+                    if screen_reason:
+                        notes.append(f"Pre-screen rejected: {screen_reason}")
+                    group.extend(screened_data["questions"])
+                    if len(group) >= STREAM_VALIDATION_GROUP:
+                        submit(group)
+                        group = []
+
+                    # 스트림을 읽는 동안 끝난 검증 결과는 바로 내보낸다
+                    for valid, reason in finished(futures, block=False):
+                        if reason:
+                            notes.append(reason)
+                        for vq in valid:
+                            collected_questions.append(vq)
+                            round_valid += 1
+                            yield vq
+                            if len(collected_questions) >= limit:
+                                return
+            except Exception as e:
+                notes.append(f"JSON/API Error: {e}")
+
+            if group:
+                submit(group)
+            for valid, reason in finished(futures, block=True):
+                if reason:
+                    notes.append(reason)
+                for vq in valid:
+                    collected_questions.append(vq)
+                    round_valid += 1
+                    yield vq
+                    if len(collected_questions) >= limit:
+                        return
+
+            rejection_feedback = "" if round_valid else f"Critic rejected batch: {'; '.join(notes)}"
+
+        if not collected_questions:
+            logger.error(f"Failed to generate any valid quizzes for '{topic}'.")
+        elif len(collected_questions) < limit:
+            logger.warning(f"Partial success: Streamed {len(collected_questions)} questions for '{topic}'.")
+    finally:
+        # 소비자가 중간에 멈추면 남은 검증은 버린다
+        pool.shutdown(wait=False, cancel_futures=True)
+        # pre-screen 덕분에 줄어든 AI 검증 요청 수 (검증은 STREAM_VALIDATION_GROUP 문제씩)
+        saved = sum(_num_requests(before, STREAM_VALIDATION_GROUP) - _num_requests(after, STREAM_VALIDATION_GROUP)
+                    for before, after in screened)
+        if saved > 0:
+            record_request_saved(saved)
+
+
 # -------------------------------------------
 # CLI testing
 # -------------------------------------------
 if __name__ == "__main__":
+    setup_logging()
     result = create_quizzes("Lionel Messi")
     print(json.dumps(result, indent=2))
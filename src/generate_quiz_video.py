@@ -1,12 +1,11 @@
-import json, os, random
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from moviepy.editor import (
-    ImageClip, concatenate_videoclips,
-    AudioFileClip, CompositeAudioClip, vfx
-)
+import io, json, os, random
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
-from .config import DATA_DIR, VIDEOS_DIR
+from .config import DATA_DIR, VIDEOS_DIR, COUNTDOWN_ANIMATION
+from .asset_bundle import load_bundle
+from .video_writer import write_timeline_video, write_overlay_video, resolve_profiles
+from .render_queue import get_render_queue, latency_summary, quiz_priority
 
 DATA_DIR = Path(DATA_DIR)
 VIDEOS_DIR = Path(VIDEOS_DIR)
@@ -67,7 +66,12 @@ OUTPUT = "quiz_video.mp4"
 # Available themes
 AVAILABLE_THEMES = ["purple", "green", "blue"]
 
+# 썸네일 (영상 인코딩 없이 프레임 하나만 렌더)
+THUMBNAIL_FORMATS = {"jpeg": ("JPEG", "image/jpeg"), "jpg": ("JPEG", "image/jpeg"), "webp": ("WEBP", "image/webp")}
+THUMBNAIL_QUALITY = 85
 
+
+@lru_cache(maxsize=None)
 def get_theme_assets(theme):
     """Return asset paths for the given theme (purple, green, or blue)"""
     theme_dir = os.path.normpath(os.path.join(ASSETS, "v1_design", theme))
@@ -83,9 +87,64 @@ def get_theme_assets(theme):
     return assets
 
 
+# ----------------------
+# 사전 가공 레이어 (asset_bundle)
+# ----------------------
+# render_frame 에서 쓰는 최종 크기
+PAPER_SIZE = (925, 385)
+CHOICES_SIZE = (726, 536)
+ANSWER_SIZE = (CHOICES_SIZE[0], CHOICES_SIZE[1] // 4)
+LOGO_WIDTH = 342
+BG_OPACITY = 0.8
+
+
+def _prepare_background(src, size, opacity):
+    """흰 바탕 위에 opacity 만큼 투명도를 낮춘 배경을 합성"""
+    bg = src.convert("RGBA").resize(size)
+    bg.putalpha(Image.eval(bg.split()[3], lambda a: int(a * opacity)))
+    return Image.alpha_composite(Image.new("RGBA", size, (255, 255, 255, 255)), bg)
+
+
+def _prepare_resized(src, size):
+    return src.convert("RGBA").resize(size)
+
+
+def _prepare_logo(src, width):
+    logo = src.convert("RGBA")
+    aspect = logo.height / logo.width
+    return logo.resize((width, int(width * aspect)))
+
+
+def theme_layer_specs():
+    """번들에 미리 구워 둘 레이어: {key: (원본 경로, 가공 함수, 인자)}"""
+    specs = {}
+    for theme in AVAILABLE_THEMES:
+        assets = get_theme_assets(theme)
+        specs[f"{theme}/quiz_bg"] = (assets["quiz_bg"], _prepare_background, ((W, H), BG_OPACITY))
+        specs[f"{theme}/paper"] = (assets["paper"], _prepare_resized, (PAPER_SIZE,))
+        specs[f"{theme}/all_choices"] = (assets["all_choices"], _prepare_resized, (CHOICES_SIZE,))
+        specs[f"{theme}/answer"] = (assets["answer"], _prepare_resized, (ANSWER_SIZE,))
+    specs["logo"] = (get_theme_assets(AVAILABLE_THEMES[0])["logo"], _prepare_logo, (LOGO_WIDTH,))
+    return specs
+
+
+@lru_cache(maxsize=1)
+def _bundle_layers():
+    return load_bundle(theme_layer_specs())
+
+
+def get_theme_layers(theme):
+    """theme 의 레이어 (quiz_bg/paper/all_choices/answer/logo → RGBA Image 또는 None)"""
+    layers = _bundle_layers()
+    result = {name: layers.get(f"{theme}/{name}") for name in ("quiz_bg", "paper", "all_choices", "answer")}
+    result["logo"] = layers.get("logo")
+    return result
+
+
 # ----------------------
 # 유틸
 # ----------------------
+@lru_cache(maxsize=None)
 def load_font(size, bold=False, medium=False):
     try:
         return ImageFont.truetype(FONT_BOLD_PATH, size)
@@ -116,21 +175,32 @@ def wrap_text(draw, text, font, max_w):
     return lines
 
 
+# 진행 표시줄 위치 (countdown_animation 도 같은 값을 쓴다)
+PROGRESS_BAR_Y = 240
+PROGRESS_RADIUS = 30
+PROGRESS_WIDTH = 620
+PROGRESS_LINE_WIDTH = 10
+PROGRESS_GRAY = (200, 200, 200)
+
+
+def progress_positions():
+    """5 단계 원의 중심 x 좌표"""
+    start_x = (W - PROGRESS_WIDTH) // 2
+    step_width = PROGRESS_WIDTH // 4
+    return [start_x + i * step_width for i in range(5)]
+
+
 def draw_progress_bar(img, progress, theme_color):
     """디자인의 진행 표시줄 그리기 (체크마크와 원)"""
     # Progress bar positioning - moved down
-    bar_y = 240
-    circle_radius = 30
+    bar_y = PROGRESS_BAR_Y
+    circle_radius = PROGRESS_RADIUS
     line_y = bar_y
 
-    # Calculate positions for 5 steps - wider spacing
-    total_width = 620
-    start_x = (W - total_width) // 2
-    step_width = total_width // 4
-
     draw = ImageDraw.Draw(img)
 
-    positions = [start_x + i * step_width for i in range(5)]
+    # Calculate positions for 5 steps - wider spacing
+    positions = progress_positions()
 
     # Draw connecting lines
     for i in range(4):
@@ -138,7 +208,7 @@ def draw_progress_bar(img, progress, theme_color):
 
         # Incomplete line (gray)
         draw.line([(x1 + circle_radius, line_y), (x2 - circle_radius, line_y)],
-                  fill=(200, 200, 200), width=10)
+                  fill=PROGRESS_GRAY, width=PROGRESS_LINE_WIDTH)
 
     # Draw circles and checkmarks/dots
     for i, x in enumerate(positions):
@@ -146,12 +216,12 @@ def draw_progress_bar(img, progress, theme_color):
             # Completed step: theme color circle
             draw.ellipse([x - circle_radius, bar_y - circle_radius,
                           x + circle_radius, bar_y + circle_radius],
-                         fill=theme_color, outline=(200, 200, 200), width=5)
+                         fill=theme_color, outline=PROGRESS_GRAY, width=5)
         else:
             # Incomplete step: gray circle
             draw.ellipse([x - circle_radius, bar_y - circle_radius,
                           x + circle_radius, bar_y + circle_radius],
-                         fill=WHITE, outline=(200, 200, 200), width=5)
+                         fill=WHITE, outline=PROGRESS_GRAY, width=5)
 
 
 def get_font_for_text(draw, text, base_size, max_w, min_size=20, step=2, bold=True):
@@ -264,25 +334,19 @@ def get_question_font_and_lines(draw, question_text, base_size=62, max_w=800, mi
     return font, lines
 
 
-def render_frame(question, choices, category, progress, reveal, answer_idx, theme_assets, theme):
-    """디자인에 맞춘 프레임 렌더링"""
-    img = Image.new("RGBA", (W, H), (255, 255, 255, 255))
-    
+def render_frame(question, choices, category, progress, reveal, answer_idx, theme):
+    """디자인에 맞춘 프레임 렌더링 (번들에서 최종 크기로 가공된 테마 레이어 사용)"""
+    layers = get_theme_layers(theme)
+
     # Get theme colors
     letter_color = THEME_COLORS[theme]["letter"]
     primary_color = THEME_COLORS[theme]["primary"]
 
-    # Load background with 40% opacity and overlay it
-    if os.path.exists(theme_assets["quiz_bg"]):
-        try:
-            bg = Image.open(theme_assets["quiz_bg"]).convert("RGBA").resize((W, H))
-            # Reduce opacity to ~80% of original alpha (keeps it visible but muted)
-            if bg.mode == "RGBA" and len(bg.split()) >= 4:
-                bg.putalpha(Image.eval(bg.split()[3], lambda a: int(a * 0.8)))
-            # Composite the background over the solid white
-            img = Image.alpha_composite(img, bg)
-        except Exception:
-            pass
+    # Background: 흰 바탕 + 80% 투명도 배경이 미리 합성되어 있음
+    if layers["quiz_bg"] is not None:
+        img = layers["quiz_bg"].copy()
+    else:
+        img = Image.new("RGBA", (W, H), (255, 255, 255, 255))
 
     draw = ImageDraw.Draw(img)
 
@@ -309,19 +373,12 @@ def render_frame(question, choices, category, progress, reveal, answer_idx, them
     # --- Purple paper background for question ---
     # Wider and moved down
     paper_y = 486
-    paper_width = 925
-    paper_height = 385
+    paper_width, paper_height = PAPER_SIZE
 
-    if os.path.exists(theme_assets["paper"]):
-        try:
-            paper = Image.open(theme_assets["paper"]).convert("RGBA")
-            paper = paper.resize((paper_width, paper_height))
-            paper_x = 90
-            img.paste(paper, (paper_x, paper_y), paper)
-        except Exception:
-            paper_x = (W - paper_width) // 2
-            draw.rounded_rectangle([paper_x, paper_y, paper_x + paper_width, paper_y + paper_height],
-                                   radius=35, fill=(200, 190, 255))
+    if layers["paper"] is not None:
+        paper = layers["paper"]
+        paper_x = 90
+        img.paste(paper, (paper_x, paper_y), paper)
     else:
         # Fallback: draw rounded rectangle
         paper_x = (W - paper_width) // 2
@@ -357,36 +414,24 @@ def render_frame(question, choices, category, progress, reveal, answer_idx, them
     # --- Answer choices ---
     # Moved down significantly and made wider
     choices_y = 914
-    choices_width = 726
-    choices_height = 536
+    choices_width, choices_height = CHOICES_SIZE
 
-    if os.path.exists(theme_assets["all_choices"]):
+    if layers["all_choices"] is not None:
         # Use the pre-made choices image with ABCD
-        try:
-            choices_img = Image.open(theme_assets["all_choices"]).convert("RGBA")
-            choices_img = choices_img.resize((choices_width, choices_height))
-            choices_x = (W - choices_width) // 2
+        choices_img = layers["all_choices"]
+        choices_x = (W - choices_width) // 2
 
-            # Paste the base choices image first
-            img.paste(choices_img, (choices_x, choices_y), choices_img)
-        except Exception:
-            # fallback placement
-            choices_x = (W - choices_width) // 2
-            draw.rounded_rectangle([choices_x, choices_y, choices_x + choices_width, choices_y + choices_height],
-                                   radius=20, fill=(245, 245, 245))
+        # Paste the base choices image first
+        img.paste(choices_img, (choices_x, choices_y), choices_img)
 
         # If revealing answer, overlay purple_answer.png on the correct answer
-        if reveal and os.path.exists(theme_assets["answer"]):
-            try:
-                purple_ans_img = Image.open(theme_assets["answer"]).convert("RGBA")
-                # Size of a single answer bubble
-                single_answer_height = choices_height // 4
-                purple_ans_img = purple_ans_img.resize((choices_width, single_answer_height))
-                # Position it over the correct answer
-                answer_y_offset = int(answer_idx * single_answer_height)
-                img.paste(purple_ans_img, (choices_x, choices_y + answer_y_offset), purple_ans_img)
-            except Exception:
-                pass
+        if reveal and layers["answer"] is not None:
+            purple_ans_img = layers["answer"]
+            # Size of a single answer bubble
+            single_answer_height = ANSWER_SIZE[1]
+            # Position it over the correct answer
+            answer_y_offset = int(answer_idx * single_answer_height)
+            img.paste(purple_ans_img, (choices_x, choices_y + answer_y_offset), purple_ans_img)
 
         # Now recreate draw object since we modified img
         draw = ImageDraw.Draw(img)
@@ -470,20 +515,10 @@ def render_frame(question, choices, category, progress, reveal, answer_idx, them
 
     # --- ZEP QUIZ logo at bottom ---
     logo_y = 1560
-    if os.path.exists(theme_assets["logo"]):
-        try:
-            logo = Image.open(theme_assets["logo"]).convert("RGBA")
-            logo_width = 342
-            aspect = logo.height / logo.width
-            logo = logo.resize((logo_width, int(logo_width * aspect)))
-            logo_x = (W - logo_width) // 2
-            img.paste(logo, (logo_x, logo_y), logo)
-        except Exception:
-            logo_font = load_font(70, bold=True)
-            logo_text = "ZEP QUIZ"
-            bbox = draw.textbbox((0, 0), logo_text, font=logo_font)
-            logo_x = (W - (bbox[2] - bbox[0])) // 2
-            draw.text((logo_x, logo_y), logo_text, font=logo_font, fill=primary_color)
+    if layers["logo"] is not None:
+        logo = layers["logo"]
+        logo_x = (W - logo.width) // 2
+        img.paste(logo, (logo_x, logo_y), logo)
     else:
         logo_font = load_font(70, bold=True)
         logo_text = "ZEP QUIZ"
@@ -497,83 +532,184 @@ def render_frame(question, choices, category, progress, reveal, answer_idx, them
 # ----------------------
 # 비디오 생성
 # ----------------------
-def make_video(quiz_data, theme=None, output_path=None):
-    """카운트다운 애니메이션과 오디오가 포함된 퀴즈 비디오 생성"""
-    global OUTPUT
-
-    if output_path is None:
-        output_path = OUTPUT
-    else:
-        OUTPUT = output_path  # 기존 main()에서 쓰더라도 깨지지 않게 유지
-
+def build_audio_tracks(duration):
+    """
+    BGM + 정답 효과음 트랙 구성 (video_writer.write_timeline_video 용)
+    - BGM: 0.8초 이후부터 35% 볼륨, 짧으면 반복
+    - 효과음이 있으면 정답 공개 직전 0.3초 페이드아웃 후 효과음 재생
+    """
+    answer_start = max(0, duration - ANSWER_HOLD)
+    has_bgm = os.path.exists(BGM_PATH)
+    has_sfx = os.path.exists(SFX_CORRECT_PATH)
+
+    tracks = []
+    if has_bgm:
+        bgm = {"path": BGM_PATH, "offset": 0.8, "volume": 0.35, "loop": True, "end": duration}
+        if has_sfx:
+            bgm["end"] = answer_start
+            bgm["fade_out"] = 0.3
+        tracks.append(bgm)
+    if has_sfx:
+        tracks.append({"path": SFX_CORRECT_PATH, "start": answer_start, "volume": 1.0})
+    return tracks
+
+
+def parse_quiz(quiz_data):
+    """퀴즈 dict/JSON 문자열 → (question, choices, answer_idx, category)"""
     data = json.loads(quiz_data) if isinstance(quiz_data, str) else quiz_data
     question = data["question"]
     choices = data["options"]
     answer = data["answer"]
     category = data.get("category", "General").capitalize()
 
-    # Randomly select theme if not provided
-    if theme is None:
-        theme = random.choice(AVAILABLE_THEMES)
-    
-    print(f"🎨 Using theme: {theme}")
-    
-    # Get theme-specific assets
-    theme_assets = get_theme_assets(theme)
+    # Find answer index from the answer text
+    answer_idx = choices.index(answer) if answer in choices else 0
+    return question, choices, answer_idx, category
+
+
+def profile_output_paths(output_path, profiles):
+    """
+    첫 번째 프로파일은 output_path 에, 나머지는 '<stem>.<profile>.<container>' 로 저장.
+    Returns: [(path, profile_dict), ...], [profile_name, ...]
+    """
+    root, _ = os.path.splitext(output_path)
+    outputs, names = [], []
+    for i, (name, profile) in enumerate(resolve_profiles(profiles)):
+        if i == 0:
+            path = output_path
+        else:
+            path = f"{root}.{name}.{profile.get('container', 'mp4')}"
+        outputs.append((path, dict(profile, name=name)))
+        names.append(name)
+    return outputs, names
+
+
+def build_timeline(quiz_data, theme):
+    """퀴즈 한 문제의 (frame, 초) 타임라인: 카운트다운 COUNTDOWN_SECONDS 장 + 정답 공개 ANSWER_HOLD 초"""
+    question, choices, answer_idx, category = parse_quiz(quiz_data)
 
     # Validate soft word-limits and warn if exceeded
     validate_word_limits(question, choices, q_limit=10, a_limit=5)
 
-    # Find answer index from the answer text
-    answer_idx = choices.index(answer) if answer in choices else 0
-
-    # 비디오 프레임 - 카운트다운 단계
-    clips = []
+    # 비디오 프레임 - 카운트다운 단계 (distinct 프레임 + 길이만 타임라인에 담는다)
+    timeline = []
     for sec in range(COUNTDOWN_SECONDS):
         frame = render_frame(question, choices, category,
-                             progress=sec + 1, reveal=False, answer_idx=answer_idx,
-                             theme_assets=theme_assets, theme=theme)
-        clips.append(ImageClip(np.array(frame)).set_duration(1))
+                             progress=sec + 1, reveal=False, answer_idx=answer_idx, theme=theme)
+        timeline.append((frame, 1))
 
     # 정답 공개 프레임
     ans_frame = render_frame(question, choices, category,
-                             progress=5, reveal=True, answer_idx=answer_idx,
-                             theme_assets=theme_assets, theme=theme)
-    clips.append(ImageClip(np.array(ans_frame)).set_duration(ANSWER_HOLD))
-
-    final = concatenate_videoclips(clips, method="compose")
-
-    # ---------- 오디오 믹스 ----------
-    bgm = None
-    if os.path.exists(BGM_PATH):
-        bgm = AudioFileClip(BGM_PATH).subclip(0.8).volumex(0.35)
-        if bgm.duration < final.duration:
-            bgm = bgm.fx(vfx.loop, duration=final.duration)
-        else:
-            bgm = bgm.subclip(0, final.duration)
-
-    sfx_clip = None
-    if os.path.exists(SFX_CORRECT_PATH):
-        sfx = AudioFileClip(SFX_CORRECT_PATH).volumex(1.0)
-        answer_start = final.duration - ANSWER_HOLD
-        sfx_clip = sfx.set_start(answer_start)
-
-    if bgm and sfx_clip:
-        fade_duration = 0.3
-        answer_start = final.duration - ANSWER_HOLD
-        bgm_until_answer = bgm.subclip(0, max(0, answer_start)).audio_fadeout(fade_duration)
-        final_audio = CompositeAudioClip([bgm_until_answer, sfx_clip])
-        final = final.set_audio(final_audio)
-    elif bgm:
-        final = final.set_audio(bgm)
-    elif sfx_clip:
-        final = final.set_audio(sfx_clip)
-
-    final.write_videofile(output_path, fps=FPS, codec="libx264", audio_codec="aac")
+                             progress=5, reveal=True, answer_idx=answer_idx, theme=theme)
+    timeline.append((ans_frame, ANSWER_HOLD))
+    return timeline
+
+
+def write_quiz_video(quiz_data, theme, output_path, audio_tracks=None, outputs=None, animate=False):
+    """
+    퀴즈 한 문제를 인코딩 (write_timeline_video / write_overlay_video 와 같은 리턴)
+    - animate=False: 진행 표시줄이 1초마다 바뀌는 정지 프레임 타임라인
+    - animate=True : 30fps 로 채워지는 진행 표시줄 (countdown_animation, 띠만 프레임마다 합성)
+    """
+    if animate:
+        from .countdown_animation import build_animated_countdown
+
+        parts = build_animated_countdown(quiz_data, theme, fps=FPS)
+        return write_overlay_video(parts["base"], parts["frames"], parts["overlay_xy"], parts["frame_count"],
+                                   parts["tail"], output_path, audio_tracks=audio_tracks, fps=FPS, outputs=outputs)
+    timeline = build_timeline(quiz_data, theme)
+    return write_timeline_video(timeline, output_path, audio_tracks=audio_tracks, fps=FPS, outputs=outputs)
+
+
+def make_video(quiz_data, theme=None, output_path=None, profiles=None, animate=None):
+    """
+    카운트다운 애니메이션과 오디오가 포함된 퀴즈 비디오 생성
+    - profiles 가 없으면 output_path 하나를 만들고 그 경로를 리턴
+    - profiles (예: ["shorts", "preview"]) 를 주면 한 번의 렌더/인코딩으로 모두 만들고
+      {profile_name: path} 를 리턴
+    - animate: 30fps 진행 표시줄 애니메이션 (None 이면 COUNTDOWN_ANIMATION 설정)
+    """
+    global OUTPUT
+
+    if output_path is None:
+        output_path = OUTPUT
+    else:
+        OUTPUT = output_path  # 기존 main()에서 쓰더라도 깨지지 않게 유지
+
+    # Randomly select theme if not provided
+    if theme is None:
+        theme = random.choice(AVAILABLE_THEMES)
+    
+    print(f"🎨 Using theme: {theme}")
+
+    if animate is None:
+        animate = COUNTDOWN_ANIMATION
+    duration = COUNTDOWN_SECONDS + ANSWER_HOLD
+    audio_tracks = build_audio_tracks(duration)
+
+    if profiles:
+        outputs, _ = profile_output_paths(output_path, profiles)
+        paths = write_quiz_video(quiz_data, theme, output_path, audio_tracks=audio_tracks,
+                                 outputs=outputs, animate=animate)
+        for name, path in paths.items():
+            print(f"✅ 비디오 생성 완료 [{name}]: {path}")
+        return paths
+
+    write_quiz_video(quiz_data, theme, output_path, audio_tracks=audio_tracks, animate=animate)
     print(f"✅ 비디오 생성 완료: {output_path}")
     return output_path
 
 
+# ----------------------
+# 썸네일 / 포스터
+# ----------------------
+def render_thumbnail(quiz_data, theme, frame="reveal", fmt="jpeg",
+                     quality=THUMBNAIL_QUALITY, size=None):
+    """
+    영상과 같은 render_frame 으로 프레임 하나만 그려서 압축 이미지 bytes 로 리턴.
+    - frame: "reveal" (정답 공개) 또는 카운트다운 단계 1..COUNTDOWN_SECONDS
+    - fmt: "jpeg" / "webp"
+    - size: (width, height) 로 축소 (없으면 1080x1920 그대로)
+    영상과 똑같이 보이려면 영상을 만들 때 쓴 theme 을 넘겨야 한다.
+    """
+    fmt = fmt.lower()
+    if fmt not in THUMBNAIL_FORMATS:
+        raise ValueError(f"Unsupported thumbnail format: {fmt}")
+    if theme not in THEME_COLORS:
+        raise ValueError(f"Unknown theme: {theme}")
+
+    question, choices, answer_idx, category = parse_quiz(quiz_data)
+
+    if frame == "reveal":
+        progress, reveal = COUNTDOWN_SECONDS, True
+    else:
+        progress, reveal = int(frame) if str(frame).isdigit() else 0, False
+        if not 1 <= progress <= COUNTDOWN_SECONDS:
+            raise ValueError(f"frame must be 'reveal' or 1..{COUNTDOWN_SECONDS}")
+
+    img = render_frame(question, choices, category,
+                       progress=progress, reveal=reveal, answer_idx=answer_idx, theme=theme)
+    if size:
+        img = img.resize(tuple(size), Image.LANCZOS)
+
+    pil_format, _ = THUMBNAIL_FORMATS[fmt]
+    buf = io.BytesIO()
+    img.save(buf, format=pil_format, quality=quality, optimize=(pil_format == "JPEG"))
+    return buf.getvalue()
+
+
+def make_thumbnail(quiz_data, output_path, theme=None, frame="reveal", quality=THUMBNAIL_QUALITY, size=None):
+    """render_thumbnail 결과를 파일로 저장 (포맷은 확장자로 결정). 저장 경로 리턴"""
+    if theme is None:
+        theme = random.choice(AVAILABLE_THEMES)
+    fmt = os.path.splitext(output_path)[1].lstrip(".") or "jpeg"
+    data = render_thumbnail(quiz_data, theme, frame=frame, fmt=fmt, quality=quality, size=size)
+    with open(output_path, "wb") as f:
+        f.write(data)
+    print(f"🖼️  썸네일 생성 완료: {output_path}")
+    return output_path
+
+
 # --- MAIN ---
 def load_quizzes_from_file(path):
     """Load and sanity-check quizzes from a JSON file (expects list of quiz objects)."""
@@ -589,40 +725,70 @@ def load_quizzes_from_file(path):
             raise ValueError(f"Quiz index {i} must have an 'options' list with at least 2 items.")
     return data
 
-def run_video_batch(quiz_file_name: str = "quizzes_output.json") -> dict:
+def run_video_batch(quiz_file_name: str = "quizzes_output.json", profiles=None) -> dict:
     """
     1) DATA_DIR / quiz_file_name 에서 퀴즈 리스트를 읽고
     2) 각 퀴즈에 대해 make_video를 돌려서
     3) VIDEOS_DIR 아래에 mp4 파일들을 생성한 뒤
     4) 생성된 비디오 경로 리스트를 리턴한다.
+    profiles 를 주면 퀴즈마다 모든 프로파일을 한 번에 만들고,
+    "videos" 는 첫 번째 프로파일 경로, "outputs" 는 {profile: [paths]} 가 된다.
+    한 문제가 실패해도 나머지는 끝까지 렌더하고, 마지막에 실패한 문제 전부를 담은 RuntimeError 를 낸다.
     """
     quiz_path = DATA_DIR / quiz_file_name
     if not quiz_path.exists():
         raise FileNotFoundError(f"{quiz_path} not found")
 
+    from .video_catalog import get_catalog
+
     quizzes = load_quizzes_from_file(str(quiz_path))
 
     VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
     video_paths: list[str] = []
+    profile_paths: dict[str, list[str]] = {}
     base_stem = Path(quiz_file_name).stem  # quizzes_output → stem
 
-    for i, quiz in enumerate(quizzes, start=1):
-        out_path = VIDEOS_DIR / f"{base_stem}-{i}.mp4"
-        print(f"\n🎬 Generating video {i}/{len(quizzes)} → {out_path}")
-
-        make_video(
-            quiz,
-            output_path=str(out_path),   # Path → str
-        )
-        video_paths.append(str(out_path))
+    # 퀴즈마다 저장된 트렌드 순위/가져온 시각으로, 뜨는 트렌드부터 렌더 (결과는 파일 순서대로).
+    # 공유 큐라서 앞선 배치에서 밀린 항목은 aging 으로 이 배치보다 먼저 나갈 수 있다.
+    render_queue = get_render_queue()
+    done = []
+
+    def render(quiz, out_path):
+        done.append(out_path)
+        print(f"\n🎬 Generating video {len(done)}/{len(quizzes)} → {out_path}")
+        output = make_video(quiz, output_path=out_path, profiles=profiles)
+        # 같은 배치를 다시 돌리면 같은 이름으로 덮어쓴다 (디렉토리 mtime 이 안 바뀜) → 카탈로그 크기/mtime 을 직접 갱신
+        for path in (output.values() if isinstance(output, dict) else [output]):
+            get_catalog().register(path)
+        return output
+
+    futures = render_queue.submit_many(
+        [dict(quiz=quiz, output_path=str(VIDEOS_DIR / f"{base_stem}-{i}.mp4"),   # Path → str
+              index=i, **quiz_priority(quiz)) for i, quiz in enumerate(quizzes, start=1)],
+        render,
+    )
+    results = sorted((f.result() for f in futures), key=lambda r: r["index"])
+    failed = [r for r in results if r["error"]]
+    if failed:
+        details = "; ".join(f"{r['output_path']}: {r['error']}" for r in failed)
+        raise RuntimeError(f"Video render failed for {len(failed)}/{len(results)} quizzes: {details}")
+
+    for r in results:
+        video_paths.append(r["output_path"])
+        if profiles:
+            for name, path in r["output"].items():
+                profile_paths.setdefault(name, []).append(path)
 
     result = {
         "success": True,
         "quiz_file": str(quiz_path),
         "video_count": len(video_paths),
         "videos": video_paths,
+        "latency": latency_summary(results),
     }
+    if profiles:
+        result["outputs"] = profile_paths
 
     print("\n✨ Video batch complete.")
     return result
@@ -200,7 +200,9 @@ def render_frame(question, choices, progress, reveal, answer_idx):
 # ======================
 # Video generation
 # ======================
-def make_video(quiz_data):
+def make_video(quiz_data, output_path=None):
+    """output_path 를 안 주면 OUTPUT 에 쓴다. 만든 파일 경로 리턴"""
+    output_path = output_path or OUTPUT
     data = json.loads(quiz_data) if isinstance(quiz_data, str) else quiz_data
     question = data["question"]
     choices  = data["options"]
@@ -248,8 +250,9 @@ def make_video(quiz_data):
     elif sfx_clip:
         final = final.set_audio(sfx_clip)
 
-    final.write_videofile(OUTPUT, fps=30, codec="libx264", audio_codec="aac")
-    print(f"✅ Video generated: {OUTPUT}")
+    final.write_videofile(output_path, fps=30, codec="libx264", audio_codec="aac")
+    print(f"✅ Video generated: {output_path}")
+    return output_path
 
 # ======================
 # Main
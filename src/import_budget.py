@@ -0,0 +1,76 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# ======================
+# Import-time 예산 체크
+# ======================
+# python -X importtime 으로 모듈을 새 프로세스에서 import 하고
+# 가장 느린 import 들과 전체 시간을 보여준다. 예산을 넘으면 exit code 1.
+#
+#   python -m src.import_budget                      # src.app, 500ms
+#   python -m src.import_budget src.quiz_batch --budget-ms 300 --top 20
+DEFAULT_MODULE = "src.app"
+DEFAULT_BUDGET_MS = 500
+DEFAULT_TOP = 15
+
+
+def measure_imports(module):
+    """
+    새 인터프리터에서 module 을 import 하고 importtime 결과를 파싱한다.
+    Returns: [(name, self_us, cumulative_us, depth), ...] (import 순서대로)
+    """
+    repo_root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=repo_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:   self |   cumulative |   <indent>name"
+        try:
+            self_part, cumulative_part, raw_name = line.split("|", 2)
+            self_us = int(self_part.split(":", 1)[1])
+            cumulative_us = int(cumulative_part)
+        except (ValueError, IndexError):
+            continue
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        rows.append((raw_name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+def report(module, budget_ms=DEFAULT_BUDGET_MS, top=DEFAULT_TOP):
+    rows = measure_imports(module)
+    total_ms = next((cum for name, _, cum, _ in rows if name == module), 0) / 1000
+
+    print(f"⏱  import {module}: {total_ms:.1f} ms (budget {budget_ms} ms)")
+    print(f"\nSlowest imports (cumulative):")
+    for name, self_us, cum_us, depth in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"  {cum_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {'  ' * depth}{name}")
+
+    ok = total_ms <= budget_ms
+    print("\n✅ Within budget." if ok else f"\n❌ Over budget by {total_ms - budget_ms:.1f} ms.")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report slowest imports and check an import-time budget.")
+    parser.add_argument("module", nargs="?", default=DEFAULT_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    args = parser.parse_args()
+
+    sys.exit(0 if report(args.module, args.budget_ms, args.top) else 1)
+
+
+if __name__ == "__main__":
+    main()
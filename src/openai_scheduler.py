@@ -0,0 +1,258 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+
+from .config import OPENAI_RPM, OPENAI_TPM, OPENAI_MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# ======================
+# 프로세스 공용 OpenAI 요청 스케줄러
+# ======================
+# - 모델별 token bucket (requests/min, tokens/min) 으로 요청 속도를 맞춘다
+# - 429/5xx/연결 오류는 exponential backoff + full jitter 로 재시도, Retry-After 우선
+# - 429 를 받으면 그 모델의 모든 대기 요청이 같이 쉬도록 cool-down 을 건다
+# - 대기 시간/throttle 횟수 등은 metrics() 로 확인
+BACKOFF_BASE = 1.0      # 첫 재시도 기본 대기 (초)
+BACKOFF_MAX = 60.0      # 재시도 대기 상한 (초)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """분당 rate_per_min 만큼 채워지는 bucket. capacity 는 1분치."""
+
+    def __init__(self, rate_per_min):
+        self.rate = rate_per_min / 60.0
+        self.capacity = float(rate_per_min)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, amount):
+        """가져가면 0, 부족하면 기다려야 할 시간(초)"""
+        amount = min(amount, self.capacity)
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    def adjust(self, delta):
+        """추정치와 실제 사용량 차이 정산 (delta > 0 이면 더 차감)"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = max(-self.capacity, min(self.capacity, self.tokens - delta))
+
+
+class ModelMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttle_events = 0     # 429 응답
+        self.local_waits = 0         # 로컬 bucket 때문에 기다린 횟수
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.tokens_used = 0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "throttle_events": self.throttle_events,
+            "local_waits": self.local_waits,
+            "queue_wait_total_s": round(self.queue_wait_total, 3),
+            "queue_wait_avg_s": round(self.queue_wait_total / self.requests, 3) if self.requests else 0.0,
+            "queue_wait_max_s": round(self.queue_wait_max, 3),
+            "tokens_used": self.tokens_used,
+        }
+
+
+class RequestScheduler:
+    def __init__(self, rpm=OPENAI_RPM, tpm=OPENAI_TPM, max_retries=OPENAI_MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets = {}
+        self._blocked_until = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _state(self, model):
+        with self._lock:
+            if model not in self._buckets:
+                self._buckets[model] = (TokenBucket(self.rpm), TokenBucket(self.tpm))
+                self._blocked_until[model] = 0.0
+                self._metrics[model] = ModelMetrics()
+            return self._buckets[model], self._metrics[model]
+
+    def _acquire(self, model, est_tokens):
+        """bucket 에 자리가 날 때까지 대기. 기다린 시간(초) 리턴"""
+        (req_bucket, tok_bucket), metrics = self._state(model)
+        start = time.monotonic()
+        waited_locally = False
+        while True:
+            cooldown = self._blocked_until[model] - time.monotonic()
+            if cooldown > 0:
+                time.sleep(cooldown)
+                continue
+            wait = req_bucket.try_take(1)
+            if wait == 0:
+                wait = tok_bucket.try_take(est_tokens)
+                if wait == 0:
+                    break
+                req_bucket.adjust(-1)  # 요청 슬롯 반납
+            waited_locally = True
+            time.sleep(min(wait, 5.0))
+
+        waited = time.monotonic() - start
+        with self._lock:
+            metrics.queue_wait_total += waited
+            metrics.queue_wait_max = max(metrics.queue_wait_max, waited)
+            if waited_locally:
+                metrics.local_waits += 1
+        return waited
+
+    def _backoff(self, attempt):
+        # full jitter: [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def call(self, model, fn, est_tokens=1000):
+        """
+        fn() 을 rate limit 안에서 실행하고, 재시도 가능한 오류면 backoff 후 다시 시도.
+        응답에 usage.total_tokens 가 있으면 token bucket 을 실제 사용량으로 정산한다.
+        """
+        (_, tok_bucket), metrics = self._state(model)
+
+        for attempt in range(self.max_retries + 1):
+            self._acquire(model, est_tokens)
+            with self._lock:
+                metrics.requests += 1
+            try:
+                result = fn()
+            except Exception as e:
+                status = _status_code(e)
+                retryable = _is_retryable(e, status)
+                if status == 429:
+                    with self._lock:
+                        metrics.throttle_events += 1
+
+                if not retryable or attempt == self.max_retries:
+                    with self._lock:
+                        metrics.failed += 1
+                    raise
+
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                delay = min(delay, self.backoff_max)
+                if status == 429:
+                    with self._lock:
+                        self._blocked_until[model] = max(self._blocked_until[model],
+                                                         time.monotonic() + delay)
+                with self._lock:
+                    metrics.retries += 1
+                logger.warning(
+                    f"[{model}] request failed ({status or type(e).__name__}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+
+            used = _total_tokens(result)
+            if used is not None:
+                tok_bucket.adjust(used - est_tokens)
+            with self._lock:
+                metrics.succeeded += 1
+                metrics.tokens_used += used or 0
+            return result
+
+    def metrics(self):
+        with self._lock:
+            return {model: m.as_dict() for model, m in self._metrics.items()}
+
+
+# -------------------------------------------
+# 오류 분류 helpers
+# -------------------------------------------
+def _status_code(exc):
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+
+def _is_retryable(exc, status):
+    if getattr(exc, "code", None) == "insufficient_quota":
+        return False  # 결제/쿼터 문제는 기다려도 풀리지 않음
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # openai.APIConnectionError / APITimeoutError 등 (응답 없음)
+    name = type(exc).__name__
+    return name in ("APIConnectionError", "APITimeoutError") or isinstance(exc, (ConnectionError, TimeoutError))
+
+
+def _retry_after(exc):
+    """Retry-After(초 또는 HTTP date) / retry-after-ms 헤더 → 초"""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, parsed.timestamp() - time.time())
+
+
+def _total_tokens(result):
+    usage = getattr(result, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+# -------------------------------------------
+# 프로세스 공용 인스턴스
+# -------------------------------------------
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler()
+    return _scheduler
+
+
+def estimate_tokens(messages, max_completion_tokens=0):
+    """대략적인 토큰 수 (영문 기준 4자 ≈ 1토큰) + 예상 응답 길이"""
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // 4 + max_completion_tokens
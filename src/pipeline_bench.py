@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from .fake_services import FakeServiceSettings, start_fake_server
+
+# ======================
+# 오프라인 end-to-end 처리량 벤치마크
+# ======================
+# 로컬 가짜 OpenAI/SerpAPI 서버를 띄우고 파이프라인을 돌려서
+# 처리량(퀴즈/초), 재시도/throttle 횟수, 주입된 오류 수를 보고한다.
+#
+#   python -m src.pipeline_bench --mode quiz-batch --batches 2 --latency 0.3 --error-rate 0.1
+#   python -m src.pipeline_bench --mode scheduler --batches 3 --no-render
+#   python -m src.pipeline_bench --mode scheduler --stream      # 스트리밍 생성 → 바로 렌더
+#   python -m src.pipeline_bench --mode api
+MODES = ("quiz-batch", "scheduler", "api")
+
+
+def _use_fake_backends(base_url):
+    """generate_quiz / fetch_trends_serpapi 가 가짜 서버를 쓰도록 교체"""
+    from openai import OpenAI
+    from .generate_quiz import set_client
+    from .fetch_trends_serpapi import set_search_backend, http_search_backend
+
+    set_client(OpenAI(base_url=f"{base_url}/v1", api_key="fake", max_retries=0))
+    set_search_backend(http_search_backend(base_url))
+
+
+def _run_mode(mode, batches, render, stream=False):
+    """모드별로 batches 번 실행하고 생성된 퀴즈 수 리턴"""
+    quiz_count = 0
+    if mode == "quiz-batch":
+        from .quiz_batch import run_quiz_batch
+
+        for _ in range(batches):
+            quiz_count += run_quiz_batch().get("quiz_count", 0)
+
+    elif mode == "scheduler":
+        from .auto_quiz_scheduler import run_batch_once
+
+        for i in range(1, batches + 1):
+            n_quizzes, _ = run_batch_once(i, render=render, stream=stream)
+            quiz_count += n_quizzes
+
+    elif mode == "api":
+        from fastapi.testclient import TestClient
+        from .app import app
+
+        client = TestClient(app)
+        for _ in range(batches):
+            resp = client.post("/quiz-batch")
+            if resp.status_code == 200:
+                quiz_count += resp.json().get("quiz_count", 0)
+            else:
+                print(f"❌ /quiz-batch returned {resp.status_code}: {resp.text[:200]}")
+    return quiz_count
+
+
+def run_bench(mode="quiz-batch", batches=1, render=False, settings=None, stream=False):
+    from .openai_scheduler import get_scheduler
+
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+
+    settings = settings or FakeServiceSettings()
+    server, base_url = start_fake_server(settings=settings)
+    _use_fake_backends(base_url)
+
+    # DATA_DIR / VIDEOS_DIR 가 상대 경로라서 임시 디렉토리에서 실행
+    prev_cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="pipeline_bench_")
+    os.chdir(work_dir)
+    try:
+        start = time.time()
+        quiz_count = _run_mode(mode, batches, render, stream)
+        elapsed = time.time() - start
+    finally:
+        os.chdir(prev_cwd)
+        server.shutdown()
+
+    with settings.lock:
+        server_stats = dict(settings.stats)
+
+    return {
+        "mode": mode,
+        "batches": batches,
+        "elapsed_s": round(elapsed, 2),
+        "quiz_count": quiz_count,
+        "quizzes_per_s": round(quiz_count / elapsed, 3) if elapsed else 0.0,
+        "server": server_stats,
+        "openai": get_scheduler().metrics(),
+        "work_dir": work_dir,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline throughput benchmark")
+    parser.add_argument("--mode", choices=MODES, default="quiz-batch")
+    parser.add_argument("--batches", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-render", action="store_true", help="scheduler 모드에서 영상 렌더 생략")
+    parser.add_argument("--stream", action="store_true", help="scheduler 모드에서 스트리밍 생성 사용")
+    args = parser.parse_args()
+
+    settings = FakeServiceSettings(latency=args.latency, error_rate=args.error_rate,
+                                   malformed_rate=args.malformed_rate, reject_rate=args.reject_rate,
+                                   seed=args.seed)
+    result = run_bench(args.mode, args.batches, render=not args.no_render, settings=settings,
+                       stream=args.stream)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import json
+import time
 from pathlib import Path
 
-from .generate_quiz import create_quizzes
-from .fetch_trends_serpapi import fetch_trending_topics
+from .topic_resolver import get_or_create_quizzes
+from .trend_cache import mark_processed, filter_recent_topics, FETCH_N
+from .trend_aggregator import aggregate_trends
 from .config import DATA_DIR
 
 
@@ -15,8 +17,11 @@ def load_quiz_json(raw_output):
     raise ValueError("Quiz output is neither dict nor JSON string.")
 
 
-def flatten_questions(topic, quiz_obj):
-    """Convert a structured quiz into a list of flat quiz entries."""
+def flatten_questions(topic, quiz_obj, category="Sports", trend_rank=None, trend_seen_at=None):
+    """
+    Convert a structured quiz into a list of flat quiz entries.
+    trend_rank (0 = top) / trend_seen_at are stored on each entry so renders can prioritise hot trends.
+    """
     flat_items = []
     questions = quiz_obj.get("questions", [])
 
@@ -29,13 +34,18 @@ def flatten_questions(topic, quiz_obj):
             continue
 
         item = {
-            "category": "Sports",
+            "category": category,
             "topic": str(topic),
             "question": q.get("question"),
             "options": q.get("options"),
             "answer": q.get("answer"),
         }
 
+        if trend_rank is not None:
+            item["trend_rank"] = trend_rank
+        if trend_seen_at is not None:
+            item["trend_seen_at"] = trend_seen_at
+
         if item["question"] and item["options"] and item["answer"]:
             flat_items.append(item)
         else:
@@ -46,9 +56,14 @@ def flatten_questions(topic, quiz_obj):
 
 def run_quiz_batch() -> dict:
     print("Fetching top Google Trends...")
+    trend_seen_at = time.time()
 
     try:
-        trends = fetch_trending_topics(n = 15)
+        # 여러 geo/category 를 동시에 가져와서 점수 순으로 합친 목록 (소스별 TTL 캐시)
+        ranked = aggregate_trends(n=FETCH_N)
+        # 최근에 만든 토픽은 RECENT_TOPIC_POLICY 대로 건너뛰거나 뒤로 (스케줄러의 select_new_topics 와 같은 규칙)
+        trends = filter_recent_topics([t["topic"] for t in ranked], n=15)
+        categories = {t["topic"]: t["category"] for t in ranked}
     except Exception as e:
         error_msg = f"Error fetching trends: {e}"
         print(error_msg)
@@ -56,11 +71,18 @@ def run_quiz_batch() -> dict:
 
     all_quizzes = []
 
+    # 같은 엔티티로 이미 만든 퀴즈는 재사용, 나머지만 생성 (여러 토픽을 묶어서 AI 검증)
+    try:
+        quizzes_by_topic = get_or_create_quizzes(trends, categories=categories)
+    except Exception as e:
+        print(f"❌ Error generating quizzes: {e}")
+        quizzes_by_topic = {}
+
     for i, topic in enumerate(trends, start=1):
         print(f"\n=== Trend #{i}: {topic} ===")
 
         try:
-            raw_quiz = create_quizzes(topic)
+            raw_quiz = quizzes_by_topic.get(topic, {})
             print("Raw quiz output:", raw_quiz)
 
             # ------ FIX HERE ------
@@ -68,7 +90,8 @@ def run_quiz_batch() -> dict:
             # ----------------------
 
             # Flatten into individual quiz entries
-            flat_items = flatten_questions(topic, quiz_obj)
+            flat_items = flatten_questions(topic, quiz_obj, categories.get(topic, "Sports"),
+                                           trend_rank=i - 1, trend_seen_at=trend_seen_at)
             all_quizzes.extend(flat_items)
 
         except Exception as e:
@@ -92,6 +115,8 @@ def run_quiz_batch() -> dict:
     else:
         next_index = 1
 
+    mark_processed({q["topic"] for q in all_quizzes})
+
     output_path = data_dir / f"quizzes_output_{next_index}.json"
     with output_path.open("w", encoding="utf-8") as f:
         json.dump(all_quizzes, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,173 @@
+import re
+import threading
+
+# ======================
+# AI 검증 전 로컬 pre-screen
+# ======================
+# validate_and_fix_quiz 를 통과한 문제 중 gpt-5.1 이 거의 확실히 reject 할 것들을
+# 규칙 기반 점수로 먼저 걸러낸다 (API 호출 없음).
+#   강한 규칙(점수 >= DROP_SCORE) 하나라도 걸림 → 버림 (사유는 다음 생성 프롬프트 feedback 으로)
+#   약한 규칙(0.5) 만 걸림 → 몇 개가 걸려도 flag 만 하고 AI 검증으로 보냄
+# 규칙별 적중 수와 아낀 검증 요청 수는 get_prescreen_stats() 로 확인.
+DROP_SCORE = 1.0
+
+SUBJECTIVE_STRONG = re.compile(
+    r"\b(most important|best ever|greatest of all time|goat|favou?rite|most iconic|most memorable"
+    r"|most exciting|most beloved|overrated|underrated|best[- ]looking|coolest)\b",
+    re.IGNORECASE,
+)
+SUBJECTIVE_WEAK = re.compile(r"\b(best|greatest|legendary|famous|popular|iconic)\b", re.IGNORECASE)
+RELATIVE_TIME = re.compile(r"\b(upcoming|next season|this season|currently|right now|this year)\b", re.IGNORECASE)
+CATCH_ALL_OPTION = re.compile(r"^(all|none|both) of (the )?(above|these)$", re.IGNORECASE)
+YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+
+
+def cutoff_year(knowledge_cutoff: str) -> int:
+    """'May 2024' → 2024"""
+    match = YEAR.search(knowledge_cutoff or "")
+    return int(match.group(1)) if match else 9999
+
+
+def _norm(text) -> str:
+    return re.sub(r"[^a-z0-9 ]", "", str(text or "").lower()).strip()
+
+
+# -------------------------------------------
+# Rules: (question dict, cutoff year) → (score, reason) 또는 None
+# -------------------------------------------
+def rule_subjective(q, year_limit):
+    text = q["question"]
+    match = SUBJECTIVE_STRONG.search(text)
+    if match:
+        return 1.0, f"subjective wording '{match.group(0)}'"
+    match = SUBJECTIVE_WEAK.search(text)
+    if match:
+        return 0.5, f"possibly subjective wording '{match.group(0)}'"
+    return None
+
+
+def rule_future_year(q, year_limit):
+    texts = [q["question"], *q["options"]]
+    years = [int(y) for t in texts for y in YEAR.findall(t)]
+    late = [y for y in years if y > year_limit]
+    if late:
+        return 1.0, f"mentions {max(late)}, after the {year_limit} knowledge cutoff"
+    match = RELATIVE_TIME.search(q["question"])
+    if match:
+        return 0.5, f"time-relative wording '{match.group(0)}'"
+    return None
+
+
+def rule_option_overlap(q, year_limit):
+    options = [_norm(o) for o in q["options"]]
+    answer = _norm(q["answer"])
+    for i, a in enumerate(options):
+        for b in options[i + 1:]:
+            if not a or not b or a == b:
+                continue
+            if f" {a} " in f" {b} " or f" {b} " in f" {a} ":
+                if answer in (a, b):
+                    return 1.0, f"options '{a}' and '{b}' overlap with the answer"
+                return 0.5, f"options '{a}' and '{b}' overlap"
+    if any(CATCH_ALL_OPTION.match(o.strip()) for o in q["options"]):
+        return 1.0, "catch-all option (all/none of the above)"
+    return None
+
+
+def rule_answer_in_question(q, year_limit):
+    """
+    정답이 문제에 그대로 나오면 flag 만 한다 (버리지 않음).
+    "Who has more titles, Toluca or Monterrey?" 처럼 보기 둘 이상을 나열한 비교 문제는 정상 → 통과
+    """
+    question = f" {_norm(q['question'])} "
+    answer = _norm(q["answer"])
+    if len(answer) < 4 or f" {answer} " not in question:
+        return None
+    listed = [o for o in map(_norm, q["options"]) if o and f" {o} " in question]
+    if len(listed) >= 2:
+        return None
+    return 0.5, f"answer '{q['answer']}' appears in the question"
+
+
+RULES = {
+    "subjective": rule_subjective,
+    "future_year": rule_future_year,
+    "option_overlap": rule_option_overlap,
+    "answer_in_question": rule_answer_in_question,
+}
+
+
+# -------------------------------------------
+# Stats
+# -------------------------------------------
+_stats_lock = threading.Lock()
+_stats = {
+    "checked": 0,
+    "dropped": 0,
+    "flagged": 0,
+    "validation_requests_saved": 0,  # 버린 문제만큼 줄어든 AI 검증 요청 수 (record_request_saved)
+    "rules": {name: {"dropped": 0, "flagged": 0} for name in RULES},
+}
+
+
+def record_request_saved(n=1):
+    with _stats_lock:
+        _stats["validation_requests_saved"] += n
+
+
+def get_prescreen_stats() -> dict:
+    with _stats_lock:
+        stats = {k: v for k, v in _stats.items() if k != "rules"}
+        stats["rules"] = {name: dict(v) for name, v in _stats["rules"].items()}
+    # 버린 문제 수 = AI 검증에 보내지 않은 문제 수
+    stats["validation_questions_saved"] = stats["dropped"]
+    return stats
+
+
+# -------------------------------------------
+# Pre-screen
+# -------------------------------------------
+def score_question(q: dict, year_limit: int) -> tuple[float, list[tuple[str, str]]]:
+    """Returns: (가장 높은 규칙 점수, [(rule, reason), ...]). 약한 규칙 점수는 합치지 않는다"""
+    top = 0.0
+    hits = []
+    for name, rule in RULES.items():
+        result = rule(q, year_limit)
+        if result:
+            score, reason = result
+            top = max(top, score)
+            hits.append((name, reason))
+    return top, hits
+
+
+def prescreen_quiz(quiz_data: dict, knowledge_cutoff: str) -> tuple[dict, str]:
+    """
+    quiz_data: validate_and_fix_quiz 결과 ({"questions": [...]})
+    Returns: (남은 문제들 {"questions": [...]}, 버린 사유 문자열)
+    """
+    year_limit = cutoff_year(knowledge_cutoff)
+    kept = []
+    notes = []
+    dropped = flagged = 0
+    rule_counts = []
+
+    for q in quiz_data.get("questions", []):
+        score, hits = score_question(q, year_limit)
+        if score >= DROP_SCORE:
+            dropped += 1
+            rule_counts.extend((name, "dropped") for name, _ in hits)
+            notes.append(f"'{q['question']}' rejected: {', '.join(reason for _, reason in hits)}")
+            continue
+        if hits:
+            flagged += 1
+            rule_counts.extend((name, "flagged") for name, _ in hits)
+        kept.append(q)
+
+    with _stats_lock:
+        _stats["checked"] += dropped + len(kept)
+        _stats["dropped"] += dropped
+        _stats["flagged"] += flagged
+        for name, kind in rule_counts:
+            _stats["rules"][name][kind] += 1
+
+    return {"questions": kept}, "; ".join(notes)
@@ -0,0 +1,197 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from .config import (
+    DATA_DIR,
+    EVERGREEN_TOPICS,
+    RESERVOIR_TARGET_PER_TOPIC,
+    RESERVOIR_MAX_AGE_DAYS,
+)
+
+# ======================
+# Evergreen 퀴즈 저장소 (reservoir)
+# ======================
+# 트렌드와 무관한 evergreen 토픽 퀴즈를 유휴 시간에 미리 생성/검증해 두고,
+# 트렌드 기반 생성이 모자랄 때 꺼내 쓴다 → 렌더 쪽 처리량이 일정하게 유지된다.
+#   data/quiz_reservoir.json : {"items": {topic: [quiz, ...]}, "consumed": {topic: n}, "generated": {topic: n}}
+#
+#   python -m src.quiz_reservoir refill      # 목표 개수까지 채우기
+#   python -m src.quiz_reservoir stats
+RESERVOIR_FILE = "quiz_reservoir.json"
+REFILL_TOPICS_PER_ROUND = 3   # 한 번에 생성할 토픽 수 (AI 검증을 묶는 단위)
+
+
+def parse_topics(spec: str = EVERGREEN_TOPICS) -> list[str]:
+    return [t.strip() for t in (spec or "").split(",") if t.strip()]
+
+
+class QuizReservoir:
+    def __init__(self, topics=None, target=RESERVOIR_TARGET_PER_TOPIC, max_age_days=RESERVOIR_MAX_AGE_DAYS,
+                 data_dir=DATA_DIR, category="Sports"):
+        self.topics = topics if topics is not None else parse_topics()
+        self.target = target
+        self.max_age = max_age_days * 86400
+        self.path = os.path.join(data_dir, RESERVOIR_FILE)
+        self.category = category
+        self.lock = threading.Lock()
+
+    # -------------------------------------------
+    # Persistence
+    # -------------------------------------------
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("items", {})
+        data.setdefault("consumed", {})
+        data.setdefault("generated", {})
+        # 오래된 문제는 버린다 (evergreen 이라도 기록/사실이 바뀔 수 있음)
+        now = time.time()
+        for topic, items in data["items"].items():
+            data["items"][topic] = [q for q in items if now - q.get("created_at", now) < self.max_age]
+        return data
+
+    def _save(self, data):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self.path)
+
+    # -------------------------------------------
+    # Refill (유휴 시간에 호출)
+    # -------------------------------------------
+    def deficits(self) -> dict:
+        """{topic: 목표까지 모자란 개수}"""
+        with self.lock:
+            items = self._load()["items"]
+        return {t: self.target - len(items.get(t, [])) for t in self.topics
+                if len(items.get(t, [])) < self.target}
+
+    def refill(self, deadline: float = None) -> int:
+        """
+        모자란 토픽부터 (가장 많이 모자란 순) 모자란 개수만큼만 생성해서 채운다.
+        deadline(time.time() 기준)을 넘기면 다음 토픽 생성은 시작하지 않는다. 추가된 문제 수 리턴.
+        """
+        from .generate_quiz import create_quizzes_many
+
+        missing = sorted(self.deficits().items(), key=lambda kv: kv[1], reverse=True)
+        added = 0
+        for start in range(0, len(missing), REFILL_TOPICS_PER_ROUND):
+            if deadline is not None and time.time() >= deadline:
+                break
+            round_deficits = dict(missing[start:start + REFILL_TOPICS_PER_ROUND])
+            round_topics = list(round_deficits)
+            print(f"🛢  Refilling reservoir: {round_deficits}")
+            created = create_quizzes_many(round_topics, categories={t: self.category for t in round_topics},
+                                          targets=round_deficits, deadline=deadline)
+
+            now = time.time()
+            with self.lock:
+                data = self._load()
+                for topic in round_topics:
+                    items = data["items"].setdefault(topic, [])
+                    known = {q["question"] for q in items}
+                    for q in created.get(topic, {}).get("questions", []):
+                        if len(items) >= self.target or q["question"] in known:
+                            continue
+                        items.append({
+                            "category": self.category,
+                            "topic": topic,
+                            "question": q["question"],
+                            "options": q["options"],
+                            "answer": q["answer"],
+                            "created_at": now,
+                        })
+                        known.add(q["question"])
+                        data["generated"][topic] = data["generated"].get(topic, 0) + 1
+                        added += 1
+                self._save(data)
+        if added:
+            print(f"🛢  Reservoir refilled with {added} questions.")
+        return added
+
+    # -------------------------------------------
+    # Draw
+    # -------------------------------------------
+    def draw(self, n: int) -> list[dict]:
+        """
+        n 문제를 꺼낸다 (토픽을 돌아가며, 각 토픽에서는 오래된 것부터).
+        꺼낸 문제는 저장소에서 빠진다. flat quiz dict 리스트 리턴.
+        """
+        if n <= 0:
+            return []
+        with self.lock:
+            data = self._load()
+            drawn = []
+            # 재고가 많은 토픽부터 돌아가며 하나씩
+            order = sorted(self.topics, key=lambda t: len(data["items"].get(t, [])), reverse=True)
+            while len(drawn) < n and any(data["items"].get(t) for t in order):
+                for topic in order:
+                    items = data["items"].get(topic)
+                    if not items or len(drawn) >= n:
+                        continue
+                    q = items.pop(0)
+                    q.pop("created_at", None)
+                    drawn.append(q)
+                    data["consumed"][topic] = data["consumed"].get(topic, 0) + 1
+            self._save(data)
+        if drawn:
+            print(f"🛢  Drew {len(drawn)} evergreen quizzes from the reservoir.")
+        return drawn
+
+    def stats(self) -> dict:
+        """토픽별 재고(depth)/가장 오래된 문제 나이/소비량"""
+        now = time.time()
+        with self.lock:
+            data = self._load()
+        topics = {}
+        for topic in sorted(set(self.topics) | set(data["items"])):
+            items = data["items"].get(topic, [])
+            ages = [now - q.get("created_at", now) for q in items]
+            topics[topic] = {
+                "depth": len(items),
+                "target": self.target if topic in self.topics else 0,
+                "oldest_age_h": round(max(ages) / 3600, 1) if ages else 0.0,
+                "consumed": data["consumed"].get(topic, 0),
+                "generated": data["generated"].get(topic, 0),
+            }
+        return {
+            "depth": sum(t["depth"] for t in topics.values()),
+            "target": self.target * len(self.topics),
+            "consumed": sum(t["consumed"] for t in topics.values()),
+            "generated": sum(t["generated"] for t in topics.values()),
+            "topics": topics,
+        }
+
+
+_reservoir = None
+_reservoir_lock = threading.Lock()
+
+
+def get_reservoir() -> QuizReservoir:
+    global _reservoir
+    with _reservoir_lock:
+        if _reservoir is None:
+            _reservoir = QuizReservoir()
+        return _reservoir
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    reservoir = get_reservoir()
+    if command == "refill":
+        reservoir.refill()
+    print(json.dumps(reservoir.stats(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
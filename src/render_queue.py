@@ -0,0 +1,194 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import Future
+
+from .config import RENDER_QUEUE_WORKERS
+
+# ======================
+# 우선순위 렌더 큐
+# ======================
+# 뜨는 트렌드(순위 높고 방금 가져온 것)의 퀴즈를 먼저 렌더한다.
+#   hotness = RANK_WEIGHT / (1 + rank) + FRESH_WEIGHT * 0.5 ** (트렌드 나이 / FRESH_HALF_LIFE)
+#   heap key = AGING_RATE * enqueued_at - hotness   (작을수록 먼저)
+# 모든 항목이 같은 속도로 나이를 먹으므로 key 는 넣을 때 한 번만 계산하면 된다.
+# 기다린 시간 1초마다 AGING_RATE 만큼 앞당겨지므로, 어떤 항목도
+# (RANK_WEIGHT + FRESH_WEIGHT) / AGING_RATE 초(기본 7.5분) 넘게 새 항목에 밀리지 않는다.
+# 배치마다 큐를 새로 만들면 aging 이 배치 안에서만 적용되므로, 배치 렌더는 프로세스에 하나인
+# get_render_queue() 에 submit 한다 (앞 배치에서 밀린 항목이 다음 배치의 새 항목보다 먼저 나간다).
+# rank / trend_seen_at 은 퀴즈 항목에 저장된 trend_rank / trend_seen_at (quiz_priority).
+RANK_WEIGHT = 1.0
+FRESH_WEIGHT = 0.5
+FRESH_HALF_LIFE = 1800.0     # 트렌드 신선도 반감기 (초)
+AGING_RATE = 1.0 / 300       # 5분 기다리면 hotness 1.0 만큼 앞당겨짐
+
+
+def quiz_priority(quiz) -> dict:
+    """퀴즈 항목에 저장된 트렌드 순위/가져온 시각 → push 인자 (evergreen 이나 예전 파일이면 None)"""
+    return {"rank": quiz.get("trend_rank"), "trend_seen_at": quiz.get("trend_seen_at")}
+
+
+def hotness(rank=None, trend_seen_at=None, now=None):
+    """rank: 트렌드 순위 (0 이 1위, None 이면 evergreen), trend_seen_at: 트렌드를 가져온 시각"""
+    now = now or time.time()
+    score = 0.0
+    if rank is not None:
+        score += RANK_WEIGHT / (1 + rank)
+    if trend_seen_at is not None:
+        score += FRESH_WEIGHT * math.pow(0.5, max(0.0, now - trend_seen_at) / FRESH_HALF_LIFE)
+    return score
+
+
+class RenderQueue:
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()   # 같은 key 면 먼저 넣은 것 먼저
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = []
+        self.results = []
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+    def push(self, quiz, output_path, rank=None, trend_seen_at=None, **extra):
+        """extra 는 결과 dict 에 그대로 들어간다 (예: index=3)"""
+        self.push_many([dict(quiz=quiz, output_path=output_path, rank=rank, trend_seen_at=trend_seen_at, **extra)])
+
+    def push_many(self, entries):
+        """
+        entries: [push 인자 dict, ...] 를 한 번에 넣는다.
+        도는 worker 가 있어도 첫 항목만 먼저 꺼내 가지 않고, 모두 들어간 뒤 우선순위대로 꺼낸다.
+        """
+        now = time.time()
+        keyed = []
+        for entry in entries:
+            rank, trend_seen_at = entry.get("rank"), entry.get("trend_seen_at")
+            item = {
+                **entry,
+                "trend_seen_at": trend_seen_at if trend_seen_at is not None else now,
+                "enqueued_at": now,
+                "hotness": hotness(rank, trend_seen_at, now),
+            }
+            keyed.append((AGING_RATE * now - item["hotness"], item))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RenderQueue is closed")
+            for key, item in keyed:
+                heapq.heappush(self._heap, (key, next(self._counter), item))
+            self._cond.notify(len(keyed))
+
+    def submit(self, quiz, output_path, render_fn, rank=None, trend_seen_at=None, **extra):
+        """
+        push + Future. 이 항목은 render_fn 으로 렌더하고, 끝나면 future 에 결과 dict (results 와 같은 형식).
+        계속 도는 큐(start_workers)에 여러 배치가 같이 넣을 때 쓴다. 결과는 self.results 에 쌓지 않는다.
+        """
+        return self.submit_many([dict(quiz=quiz, output_path=output_path, rank=rank,
+                                      trend_seen_at=trend_seen_at, **extra)], render_fn)[0]
+
+    def submit_many(self, entries, render_fn):
+        """배치 하나를 한 번에 submit (push_many 참고). entry 순서대로 Future 리스트 리턴"""
+        entries = [{**entry, "render_fn": render_fn, "future": Future()} for entry in entries]
+        self.push_many(entries)
+        return [entry["future"] for entry in entries]
+
+    def start_workers(self, workers):
+        """close() 없이 계속 도는 worker 를 workers 개까지 띄운다 (submit 한 항목의 render_fn 사용)"""
+        with self._cond:
+            while len(self._threads) < workers:
+                t = threading.Thread(target=self.worker, daemon=True,
+                                     name=f"render-queue-{len(self._threads)}")
+                self._threads.append(t)
+                t.start()
+
+    def close(self):
+        """더 이상 push 없음. 남은 항목을 다 처리하면 worker 가 끝난다"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def pop(self, timeout=None):
+        """가장 급한 항목. 닫혔고 비었으면(또는 timeout) None"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._heap:
+                if self._closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return heapq.heappop(self._heap)[2]
+
+    def worker(self, render_fn=None):
+        """
+        close() 될 때까지 render_fn(quiz, output_path) 를 우선순위 순서로 호출 (submit 한 항목은 그 render_fn).
+        항목마다 대기/렌더/트렌드→영상 시간을 self.results (submit 한 항목은 future) 에 기록한다.
+        """
+        while True:
+            item = self.pop()
+            if item is None:
+                return
+            fn = item.get("render_fn") or render_fn
+            started = time.time()
+            error = None
+            output = None
+            try:
+                output = fn(item["quiz"], item["output_path"])
+            except Exception as e:
+                error = str(e)
+                print(f"❌ Failed to render {item['output_path']}: {e}")
+            finished = time.time()
+            result = {k: v for k, v in item.items() if k not in ("quiz", "render_fn", "future")}
+            result.update({
+                "output": output,
+                "error": error,
+                "queue_wait_s": round(started - item["enqueued_at"], 3),
+                "render_s": round(finished - started, 3),
+                "trend_to_video_s": round(finished - item["trend_seen_at"], 3),
+            })
+            if item.get("future") is not None:
+                item["future"].set_result(result)
+                continue
+            with self._cond:
+                self.results.append(result)
+
+    def run(self, render_fn, workers=1):
+        """지금 들어 있는 항목을 workers 개 스레드로 모두 처리하고 결과 리스트 리턴"""
+        self.close()
+        threads = [threading.Thread(target=self.worker, args=(render_fn,), daemon=True) for _ in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return list(self.results)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_render_queue() -> RenderQueue:
+    """배치 렌더(/video-batch, 스케줄러)가 같이 쓰는 프로세스 단위 큐 (RENDER_QUEUE_WORKERS 개 worker)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RenderQueue()
+            _queue.start_workers(max(1, RENDER_QUEUE_WORKERS))
+        return _queue
+
+
+def latency_summary(results):
+    """trend→video 시간 요약 (초)"""
+    values = sorted(r["trend_to_video_s"] for r in results if not r.get("error"))
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_s": values[len(values) // 2],
+        "p90_s": values[min(len(values) - 1, int(len(values) * 0.9))],
+        "max_s": values[-1],
+    }
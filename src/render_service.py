@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import RENDER_POOL_WORKERS, RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES
+
+# ======================
+# 단일 퀴즈 즉시 렌더 (POST /render)
+# ======================
+# - 전용 스레드 풀에서 렌더 → 배치 렌더(/video-batch, 스케줄러)와 줄을 서지 않는다
+# - single-flight: 같은 (퀴즈, theme, renderer) 요청이 동시에 오면 렌더는 한 번, 결과를 같이 받는다 (프로세스 안)
+# - 결과 mp4 는 RENDER_CACHE_DIR/<key>.mp4 에 보관 → uvicorn 워커 여러 개가 같은 캐시를 쓰고,
+#   어느 워커로 가든 GET /render/<key>.mp4 가 된다
+# - 캐시 폴더가 RENDER_CACHE_MAX_BYTES 를 넘으면 오래 안 쓴 것(mtime, hit 때 갱신)부터 지운다
+# - 결과 하나가 RENDER_CACHE_MAX_BYTES 보다 크면 캐시에 두지 않고 바이트로 돌려준다 (URL 로는 못 줌)
+RENDERERS = ("v1", "v2")
+RENDER_TIMEOUT = 600   # 초
+_KEY_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def render_key(quiz: dict, theme: str, renderer: str) -> str:
+    """렌더 결과를 결정하는 값만으로 만든 키 (v2 는 theme 을 쓰지 않으므로 키에서 뺀다)"""
+    fields = {k: quiz.get(k) for k in ("category", "question", "options", "answer")}
+    payload = json.dumps({"quiz": fields, "theme": theme if renderer != "v2" else None, "renderer": renderer},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _render_to_file(quiz, theme, renderer, output_path):
+    if renderer == "v2":
+        from .generate_quiz_video_v2 import make_video
+
+        return make_video(quiz, output_path=output_path)
+    from .generate_quiz_video import make_video
+
+    return make_video(quiz, theme=theme, output_path=output_path)
+
+
+class RenderService:
+    def __init__(self, workers=RENDER_POOL_WORKERS, max_bytes=RENDER_CACHE_MAX_BYTES, cache_dir=RENDER_CACHE_DIR):
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="render-ondemand")
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.inflight = {}           # key → Future
+        self.stats = {"requests": 0, "cache_hits": 0, "joined": 0, "renders": 0, "errors": 0,
+                      "evictions": 0, "render_s_total": 0.0}
+
+    # -------------------------------------------
+    # 캐시 (디스크, 워커끼리 공유)
+    # -------------------------------------------
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp4")
+
+    def get_cached(self, key):
+        """캐시된 mp4 경로 (없거나 잘못된 키면 None). mtime 을 갱신해 LRU 순서를 올린다"""
+        if not _KEY_RE.match(key):
+            return None
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None  # 없음 / 다른 워커가 방금 지움
+        return path
+
+    def _entries(self):
+        """[(mtime, size, path), ...] 캐시 폴더의 결과 파일 (렌더 중인 임시 폴더는 제외)"""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".mp4") or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def _prune(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                with self.lock:
+                    self.stats["evictions"] += 1
+            except FileNotFoundError:
+                pass  # 다른 워커가 먼저 지움
+            total -= size
+
+    # -------------------------------------------
+    # 렌더
+    # -------------------------------------------
+    def _render(self, key, quiz, theme, renderer):
+        """캐시에 넣은 mp4 경로, 캐시보다 큰 결과면 mp4 바이트"""
+        cached = self.get_cached(key)  # 기다리는 동안 다른 워커가 같은 결과를 만들었을 수 있다
+        if cached is not None:
+            return cached
+        started = time.time()
+        try:
+            with tempfile.TemporaryDirectory(prefix=".render-", dir=self.cache_dir) as tmp:
+                path = _render_to_file(quiz, theme, renderer, os.path.join(tmp, f"{key}.mp4"))
+                if os.path.getsize(path) <= self.max_bytes:
+                    # 같은 폴더 안 rename → 다른 워커에 반쯤 쓴 파일이 안 보인다
+                    os.replace(path, self._path(key))
+                    result = self._path(key)
+                else:
+                    with open(path, "rb") as f:
+                        result = f.read()  # 캐시보다 큰 결과는 보관하지 않음
+        except Exception:
+            with self.lock:
+                self.stats["errors"] += 1
+            raise
+        self._prune()
+        with self.lock:
+            self.stats["renders"] += 1
+            self.stats["render_s_total"] += time.time() - started
+        return result
+
+    def _forget(self, key):
+        with self.lock:
+            self.inflight.pop(key, None)
+
+    def render(self, quiz: dict, theme: str = "purple", renderer: str = "v1", timeout=RENDER_TIMEOUT):
+        """
+        (key, result, source) 리턴.
+          result: 캐시의 mp4 경로 (str), 결과가 RENDER_CACHE_MAX_BYTES 보다 커서 캐시에 못 넣었으면 mp4 bytes
+          source: "cache" / "joined" (진행 중인 같은 렌더를 기다림) / "rendered"
+        렌더 중 에러는 그대로 올라온다 (같이 기다리던 요청도 같은 에러).
+        """
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown renderer '{renderer}' (use one of {', '.join(RENDERERS)})")
+        key = render_key(quiz, theme, renderer)
+        cached = self.get_cached(key)
+        with self.lock:
+            self.stats["requests"] += 1
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return key, cached, "cache"
+            future = self.inflight.get(key)
+            if future is not None:
+                self.stats["joined"] += 1
+                source = "joined"
+            else:
+                future = self.pool.submit(self._render, key, quiz, theme, renderer)
+                self.inflight[key] = future
+                future.add_done_callback(lambda _: self._forget(key))
+                source = "rendered"
+        return key, future.result(timeout=timeout), source
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["inflight"] = len(self.inflight)
+        entries = self._entries()
+        stats.update(cached_items=len(entries), cache_bytes=sum(size for _, size, _ in entries),
+                     cache_max_bytes=self.max_bytes, cache_dir=self.cache_dir)
+        stats["avg_render_s"] = round(stats["render_s_total"] / stats["renders"], 3) if stats["renders"] else 0.0
+        stats["render_s_total"] = round(stats["render_s_total"], 3)
+        return stats
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_render_service() -> RenderService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = RenderService()
+        return _service
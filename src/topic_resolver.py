@@ -0,0 +1,249 @@
+import difflib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from .config import DATA_DIR, QUIZ_STORE_TTL_HOURS
+
+# ======================
+# 토픽 정규화 (canonical entity) + 생성된 퀴즈 재사용
+# ======================
+# "celtics game", "Boston Celtics", "celtics score" 같은 트렌드 표기를 하나의 canonical 토픽으로 묶고,
+# 그 토픽으로 이미 만든 퀴즈가 QUIZ_STORE_TTL_HOURS 안이면 API 를 다시 부르지 않고 재사용한다.
+#   data/topic_aliases.json : {alias key: canonical key}  (한 번 매칭된 표기는 기억)
+#   data/quiz_store.json    : {canonical key: {"topic", "category", "created_at", "questions"}}
+ALIAS_FILE = "topic_aliases.json"
+STORE_FILE = "quiz_store.json"
+
+# 경기 검색어 ("lakers vs celtics") 는 한 팀과 다른 엔티티로 본다
+MATCHUP = re.compile(r"\b(vs|v|versus)\b")
+# 엔티티를 가리키지 않는 트렌드 검색어 꼬리말
+NOISE_WORDS = {
+    "game", "games", "match", "score", "scores", "highlights", "news",
+    "today", "tonight", "live", "stream", "schedule", "result", "results", "the",
+}
+FUZZY_CUTOFF = 0.8      # difflib 유사도 (오타 판정, 단어 하나씩 비교)
+
+
+def _words(text: str) -> list[str]:
+    tokens = re.sub(r"[^\w\s]", " ", text).split()
+    return [t for t in tokens if t not in NOISE_WORDS] or tokens
+
+
+def topic_key(topic: str) -> str:
+    """비교용 키: 소문자, 구두점/꼬리말 제거, 단어 정렬. 경기는 'a vs b' (양쪽 정렬)"""
+    text = str(topic or "").lower()
+    sides = [" ".join(sorted(_words(side))) for side in MATCHUP.split(text)[::2] if side.strip()]
+    if len(sides) >= 2:
+        return " vs ".join(sorted(sides))
+    return " ".join(sorted(_words(text)))
+
+
+def _is_typo(key, other):
+    """같은 단어 수이고, 다른 단어끼리 짝지으면 모두 철자만 조금 다른 경우 (예: "lakres" / "lakers")"""
+    a, b = key.split(), other.split()
+    if len(a) != len(b) or a == b:
+        return False
+    a_only = sorted(set(a) - set(b))
+    b_only = sorted(set(b) - set(a))
+    if len(a_only) != len(b_only):
+        return False
+    for word in a_only:
+        close = difflib.get_close_matches(word, b_only, n=1, cutoff=FUZZY_CUTOFF)
+        if not close:
+            return False
+        b_only.remove(close[0])
+    return True
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+class TopicResolver:
+    def __init__(self, data_dir=DATA_DIR, ttl_hours=QUIZ_STORE_TTL_HOURS):
+        self.alias_path = os.path.join(data_dir, ALIAS_FILE)
+        self.store_path = os.path.join(data_dir, STORE_FILE)
+        self.ttl = ttl_hours * 3600
+        self.lock = threading.Lock()
+        self.stats = {"lookups": 0, "alias_hits": 0, "fuzzy_hits": 0, "new_topics": 0,
+                      "store_hits": 0, "store_misses": 0}
+
+    # -------------------------------------------
+    # Canonicalization
+    # -------------------------------------------
+    def _match(self, key, aliases):
+        """
+        알려진 canonical 중 key 와 같은 엔티티로 볼 만한 것 (없으면 None).
+        - 단어 포함 관계만 같은 엔티티로 본다 ("celtics" ⊂ "boston celtics").
+          "us open tennis" / "us open golf" 처럼 서로 다른 단어가 양쪽에 있으면 다른 엔티티
+        - canonical 의 다른 표기와도 포함 관계여야 한다 (이미 "manchester city" 를 가진 엔티티에 "manchester united" 는 안 붙음)
+        - key 를 포함하는 엔티티가 여럿이면 ("manchester" → city / united) 모호하므로 새 토픽
+        - key 가 여러 엔티티를 포함하면 가장 구체적인 것 ("manchester city fc" → "manchester city")
+        - 그 외에는 같은 단어 수에서 단어 하나하나가 오타 수준으로 비슷할 때만 (difflib)
+        """
+        tokens = set(key.split())
+        spellings = {}
+        for alias, canonical in aliases.items():
+            spellings.setdefault(canonical, {canonical}).add(alias)
+
+        broader, narrower = [], []   # key 보다 넓은(key 를 포함하는) / 좁은 canonical
+        for canonical, names in spellings.items():
+            if ("vs" in tokens) != (" vs " in canonical):
+                continue  # 경기 ↔ 단일 엔티티는 묶지 않음
+            if not all(tokens <= set(n.split()) or set(n.split()) <= tokens for n in names):
+                continue
+            if tokens <= set(canonical.split()):
+                broader.append(canonical)
+            else:
+                narrower.append(canonical)
+
+        if len(broader) == 1:
+            return broader[0]
+        if len(broader) > 1:
+            return None
+        if narrower:
+            return max(narrower, key=lambda c: (len(c.split()), len(c)))
+
+        for canonical in spellings:
+            if ("vs" in tokens) == (" vs " in canonical) and _is_typo(key, canonical):
+                return canonical
+        return None
+
+    def resolve(self, topic: str) -> str:
+        """트렌드 문자열 → canonical key. 새 표기는 alias 로 기억한다"""
+        key = topic_key(topic)
+        with self.lock:
+            self.stats["lookups"] += 1
+            aliases = _read_json(self.alias_path)
+            if key in aliases:
+                self.stats["alias_hits"] += 1
+                return aliases[key]
+
+            canonical = self._match(key, aliases)
+            if canonical:
+                self.stats["fuzzy_hits"] += 1
+            else:
+                canonical = key
+                self.stats["new_topics"] += 1
+            aliases[key] = canonical
+            _write_json(self.alias_path, aliases)
+            return canonical
+
+    def add_alias(self, alias: str, canonical_topic: str):
+        """수동으로 alias 지정 (예: add_alias("GSW", "Golden State Warriors"))"""
+        with self.lock:
+            aliases = _read_json(self.alias_path)
+            canonical = aliases.get(topic_key(canonical_topic), topic_key(canonical_topic))
+            aliases[topic_key(canonical_topic)] = canonical
+            aliases[topic_key(alias)] = canonical
+            _write_json(self.alias_path, aliases)
+
+    # -------------------------------------------
+    # Quiz store
+    # -------------------------------------------
+    def lookup(self, canonical: str):
+        """TTL 안의 저장된 퀴즈 {"questions": [...]} 또는 None"""
+        with self.lock:
+            entry = _read_json(self.store_path).get(canonical)
+            if entry and time.time() - entry.get("created_at", 0) < self.ttl and entry.get("questions"):
+                self.stats["store_hits"] += 1
+                return {"questions": entry["questions"]}
+            self.stats["store_misses"] += 1
+            return None
+
+    def store(self, canonical: str, topic: str, category: str, quiz_obj: dict):
+        now = time.time()
+        with self.lock:
+            store = {c: e for c, e in _read_json(self.store_path).items()
+                     if now - e.get("created_at", 0) < self.ttl}  # 만료된 항목 정리
+            store[canonical] = {
+                "topic": topic,
+                "category": category,
+                "created_at": now,
+                "questions": quiz_obj.get("questions", []),
+            }
+            _write_json(self.store_path, store)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+        served = stats["store_hits"] + stats["store_misses"]
+        resolved = stats["lookups"]
+        stats["store_hit_rate"] = round(stats["store_hits"] / served, 3) if served else 0.0
+        stats["alias_hit_rate"] = round((stats["alias_hits"] + stats["fuzzy_hits"]) / resolved, 3) if resolved else 0.0
+        return stats
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> TopicResolver:
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = TopicResolver()
+        return _resolver
+
+
+def get_or_create_quizzes(topics: list[str], categories: dict = None, resolver: TopicResolver = None) -> dict:
+    """
+    create_quizzes_many 앞단. 토픽마다 canonical 을 찾고
+      - 저장된 퀴즈가 있으면 그대로 사용 (API 호출 없음)
+      - 없으면 canonical 당 한 번만 생성해서 저장
+    같은 배치 안에서 같은 엔티티를 가리키는 두 번째 표기부터는 {} (중복 퀴즈 방지).
+    Returns: {topic: quiz_dict}
+    """
+    from .generate_quiz import create_quizzes_many
+
+    resolver = resolver or get_resolver()
+    categories = categories or {}
+    results = {}
+    owner = {}    # canonical → 이 배치에서 그 엔티티를 맡은 토픽
+    to_create = []
+
+    for topic in topics:
+        canonical = resolver.resolve(topic)
+        if canonical in owner:
+            print(f"🔗 '{topic}' is the same entity as '{owner[canonical]}', skipping.")
+            results[topic] = {}
+            continue
+        owner[canonical] = topic
+        stored = resolver.lookup(canonical)
+        if stored:
+            print(f"♻️  Reusing {len(stored['questions'])} stored questions for '{topic}' ({canonical}).")
+            results[topic] = stored
+        else:
+            to_create.append(topic)
+
+    if to_create:
+        created = create_quizzes_many(to_create, categories=categories)
+        for topic in to_create:
+            quiz_obj = created.get(topic, {})
+            results[topic] = quiz_obj
+            if quiz_obj.get("questions"):
+                canonical = next(c for c, t in owner.items() if t == topic)
+                resolver.store(canonical, topic, categories.get(topic, "Sports"), quiz_obj)
+
+    stats = resolver.get_stats()
+    print(f"📊 Topic resolver: store hit rate {stats['store_hit_rate']:.0%}, "
+          f"alias hit rate {stats['alias_hit_rate']:.0%}")
+    return results
@@ -0,0 +1,92 @@
+import difflib
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import TREND_SOURCES, TREND_FETCH_CONCURRENCY
+from .trend_cache import get_trending_topics, FETCH_N
+
+# ======================
+# 여러 (geo, category) 트렌드 동시 집계
+# ======================
+# 소스마다 get_trending_topics (TTL 캐시) 를 스레드 풀에서 동시에 부르고,
+#   score = Σ weight / (1 + RANK_DECAY * rank)
+# 로 점수를 합산한 뒤 거의 같은 검색어("lakers vs celtics" / "celtics vs lakers")는 하나로 합친다.
+# 전체 시간은 가장 느린 소스 하나 정도.
+CATEGORY_NAMES = {17: "Sports", 16: "Entertainment"}
+RANK_DECAY = 0.1        # 순위가 내려갈수록 점수 감소
+SIMILARITY = 0.85       # 이 이상 비슷하면 같은 토픽으로 본다
+
+
+def parse_sources(spec: str = TREND_SOURCES) -> list[tuple[str, int, float]]:
+    """'US:17:1.0,KR:16:0.5' → [("US", 17, 1.0), ("KR", 16, 0.5)]"""
+    sources = []
+    for part in (spec or "").split(","):
+        fields = part.strip().split(":")
+        if len(fields) < 2:
+            continue
+        weight = float(fields[2]) if len(fields) > 2 and fields[2] else 1.0
+        sources.append((fields[0].upper(), int(fields[1]), weight))
+    return sources
+
+
+def _dedupe_key(topic: str) -> str:
+    text = re.sub(r"[^\w\s]", " ", topic.lower())
+    text = re.sub(r"\b(vs|v|versus)\b", " ", text)
+    return " ".join(sorted(text.split()))
+
+
+def _fetch_all(sources, concurrency):
+    """[(source, topics | None), ...] (실패한 소스는 None)"""
+    def fetch(source):
+        geo, category_id, _ = source
+        try:
+            return source, get_trending_topics(n=FETCH_N, geo=geo, category_id=category_id)
+        except Exception as e:
+            print(f"⚠️ Trend fetch failed for {geo}/{category_id}: {e}")
+            return source, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(sources)))) as pool:
+        return list(pool.map(fetch, sources))
+
+
+def aggregate_trends(n: int = 15, sources=None, concurrency: int = TREND_FETCH_CONCURRENCY) -> list[dict]:
+    """
+    Returns: 점수 순 [{"topic", "category", "score", "sources": ["US/17", ...]}, ...] 최대 n 개
+      topic    : 묶인 검색어 중 점수가 가장 높은 표기
+      category : 점수가 가장 높은 소스의 카테고리 이름
+    """
+    sources = parse_sources() if sources is None else sources
+    if not sources:
+        return []
+
+    groups = {}  # key → {"score", "variants": {topic: score}, "categories": {category: score}, "sources"}
+    for (geo, category_id, weight), topics in _fetch_all(sources, concurrency):
+        for rank, topic in enumerate(topics or []):
+            points = weight / (1 + RANK_DECAY * rank)
+            key = _dedupe_key(topic)
+            if key not in groups:
+                # get_close_matches 는 quick_ratio 로 먼저 걸러서 전체 비교보다 빠르다
+                close = difflib.get_close_matches(key, groups.keys(), n=1, cutoff=SIMILARITY)
+                key = close[0] if close else key
+            group = groups.setdefault(key, {"score": 0.0, "variants": {}, "categories": {}, "sources": []})
+            category = CATEGORY_NAMES.get(category_id, str(category_id))
+            group["score"] += points
+            group["variants"][topic] = group["variants"].get(topic, 0.0) + points
+            group["categories"][category] = group["categories"].get(category, 0.0) + points
+            group["sources"].append(f"{geo}/{category_id}")
+
+    ranked = sorted(groups.values(), key=lambda g: g["score"], reverse=True)
+    return [
+        {
+            "topic": max(g["variants"], key=g["variants"].get),
+            "category": max(g["categories"], key=g["categories"].get),
+            "score": round(g["score"], 3),
+            "sources": g["sources"],
+        }
+        for g in ranked[:n]
+    ]
+
+
+if __name__ == "__main__":
+    for item in aggregate_trends(n=15):
+        print(f"{item['score']:6.2f}  [{item['category']}] {item['topic']}  ({', '.join(item['sources'])})")
@@ -0,0 +1,147 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from .config import DATA_DIR, TRENDS_CACHE_TTL, RECENT_TOPICS_WINDOW_HOURS, RECENT_TOPIC_POLICY
+from .fetch_trends_serpapi import fetch_trending_topics
+
+# ======================
+# 트렌드 캐시 + 최근 처리 토픽 기록
+# ======================
+# - fetch_trending_topics 결과를 (geo, category) 별로 TTL 동안 캐시 (SerpAPI 호출 절약)
+# - 최근 window 안에 퀴즈를 만든 토픽은 건너뛰거나(skip) 뒤로 미룬다(downweight)
+# 둘 다 DATA_DIR 의 JSON 파일에 저장되므로 스케줄러 재시작/API 프로세스와 공유된다.
+CACHE_FILE = "trend_cache.json"
+RECENT_FILE = "recent_topics.json"
+FETCH_N = 50  # 캐시에는 넉넉히 받아 두고 n 개씩 잘라서 쓴다
+
+_lock = threading.Lock()
+_stats = {"cache_hits": 0, "cache_misses": 0, "skipped_recent": 0, "downweighted_recent": 0}
+
+
+def normalize_topic(topic: str) -> str:
+    return re.sub(r"\s+", " ", str(topic or "").strip().lower())
+
+
+def _path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+def _read_json(name):
+    try:
+        with open(_path(name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(name, data):
+    # 다른 프로세스가 읽는 중이어도 깨지지 않게 임시 파일 → os.replace
+    os.makedirs(DATA_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, _path(name))
+
+
+# -------------------------------------------
+# Trends cache
+# -------------------------------------------
+def get_trending_topics(n: int = 15, geo: str = "US", category_id: int = 17, ttl: float = None) -> list[str]:
+    """fetch_trending_topics 와 같지만 TTL 동안은 캐시된 목록을 쓴다"""
+    ttl = TRENDS_CACHE_TTL if ttl is None else ttl
+    key = f"{geo}:{category_id}"
+    now = time.time()
+
+    with _lock:
+        cache = _read_json(CACHE_FILE)
+        entry = cache.get(key)
+        # limit: 그때 요청한 개수 (트렌드가 그보다 적으면 목록 전체가 캐시돼 있는 것)
+        if entry and now - entry.get("fetched_at", 0) < ttl and n <= entry.get("limit", 0):
+            _stats["cache_hits"] += 1
+            return entry["topics"][:n]
+        _stats["cache_misses"] += 1
+
+    limit = max(n, FETCH_N)
+    topics = fetch_trending_topics(n=limit, geo=geo, category_id=category_id)
+
+    with _lock:
+        cache = _read_json(CACHE_FILE)
+        cache[key] = {"fetched_at": now, "limit": limit, "topics": topics}
+        _write_json(CACHE_FILE, cache)
+    return topics[:n]
+
+
+# -------------------------------------------
+# Recently processed topics
+# -------------------------------------------
+def _load_recent(window_s, now):
+    recent = _read_json(RECENT_FILE)
+    return {t: ts for t, ts in recent.items() if now - ts < window_s}
+
+
+def mark_processed(topics, when: float = None):
+    """퀴즈를 만든 토픽 기록 (window 지난 기록은 같이 정리)"""
+    now = when or time.time()
+    window_s = RECENT_TOPICS_WINDOW_HOURS * 3600
+    with _lock:
+        recent = _load_recent(window_s, now)
+        for topic in topics:
+            recent[normalize_topic(topic)] = now
+        _write_json(RECENT_FILE, recent)
+
+
+def recent_topics(window_hours: float = None) -> dict:
+    """{정규화된 토픽: 마지막 처리 시각}"""
+    window_hours = RECENT_TOPICS_WINDOW_HOURS if window_hours is None else window_hours
+    with _lock:
+        return _load_recent(window_hours * 3600, time.time())
+
+
+def select_new_topics(n: int, geo: str = "US", category_id: int = 17,
+                      window_hours: float = None, policy: str = None) -> list[str]:
+    """
+    캐시된 트렌드에서 최근 처리하지 않은 토픽을 순위대로 n 개 고른다 (filter_recent_topics 참고).
+    """
+    candidates = get_trending_topics(n=FETCH_N, geo=geo, category_id=category_id)
+    return filter_recent_topics(candidates, n, window_hours=window_hours, policy=policy)
+
+
+def filter_recent_topics(candidates: list[str], n: int, window_hours: float = None, policy: str = None) -> list[str]:
+    """
+    순위순 후보 토픽에 최근 토픽 정책을 적용해서 n 개까지 고른다.
+      policy="skip"       : 최근 토픽은 빼고, 모자라면 모자란 대로 리턴
+      policy="downweight" : 새 토픽을 먼저, 모자라면 가장 오래전에 처리한 토픽으로 채움
+    """
+    policy = policy or RECENT_TOPIC_POLICY
+    recent = recent_topics(window_hours)
+
+    fresh = [t for t in candidates if normalize_topic(t) not in recent]
+    stale = [t for t in candidates if normalize_topic(t) in recent]
+
+    selected = fresh[:n]
+    if policy == "downweight" and len(selected) < n:
+        stale.sort(key=lambda t: recent[normalize_topic(t)])
+        extra = stale[:n - len(selected)]
+        selected += extra
+        with _lock:
+            _stats["downweighted_recent"] += len(extra)
+
+    with _lock:
+        _stats["skipped_recent"] += sum(1 for t in candidates[:n] if normalize_topic(t) in recent)
+    if stale and policy == "downweight":
+        reused = len(selected) - min(len(fresh), n)
+        print(f"♻️  Moved {len(stale)} recently processed topics to the back ({reused} reused to fill the batch).")
+    elif stale:
+        print(f"♻️  Skipping {len(stale)} recently processed topics (policy={policy}).")
+    return selected
+
+
+def get_trend_cache_stats() -> dict:
+    with _lock:
+        return dict(_stats)
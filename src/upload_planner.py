@@ -0,0 +1,257 @@
+import datetime
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from zoneinfo import ZoneInfo
+
+from .config import (
+    DATA_DIR,
+    YOUTUBE_DAILY_QUOTA,
+    PUBLISH_TIMES,
+    PUBLISH_TIMEZONE,
+    PUBLISH_LEAD_MINUTES,
+)
+
+# ======================
+# Quota 장부 + 업로드/공개 일정 계획
+# ======================
+# API 호출마다 쓴 quota unit 을 data/youtube_quota.json 에 기록하고 (하루 = Pacific 기준 날짜),
+# 백로그를 우선순위 순으로 "오늘 남은 quota → 다음 리셋 후 quota" 에 채워 넣는다.
+# 업로드한 영상은 private + publishAt 으로 PUBLISH_TIMES 슬롯에 하나씩 예약 공개 →
+# 업로드 사이에 몇 시간씩 잠들 필요 없이 공개 간격이 유지된다.
+#   data/youtube_quota.json : {"days": {"2026-01-31": {"units": n, "calls": {call: n}}}, "scheduled": [publishAt, ...]}
+#
+#   python -m src.upload_planner           # 오늘 quota 현황
+QUOTA_FILE = "youtube_quota.json"
+QUOTA_TZ = ZoneInfo("America/Los_Angeles")   # YouTube quota 는 자정 Pacific 에 리셋
+QUOTA_COSTS = {
+    "videos.insert": 1600,
+    "thumbnails.set": 50,
+    "videos.list": 1,
+    "videos.update": 50,
+}
+KEEP_DAYS = 14   # 장부에 남길 날 수
+
+
+def quota_day(when=None) -> str:
+    """when(datetime 또는 timestamp) 이 속한 quota 날짜 'YYYY-MM-DD' (Pacific)"""
+    if not isinstance(when, datetime.datetime):
+        when = datetime.datetime.fromtimestamp(when or time.time(), datetime.timezone.utc)
+    return when.astimezone(QUOTA_TZ).date().isoformat()
+
+
+def next_reset(when) -> datetime.datetime:
+    """when 이후 첫 quota 리셋 시각 (다음 날 자정 Pacific, aware datetime)"""
+    local = when.astimezone(QUOTA_TZ)
+    midnight = datetime.datetime.combine(local.date() + datetime.timedelta(days=1), datetime.time(0), QUOTA_TZ)
+    return midnight.astimezone(datetime.timezone.utc)
+
+
+def to_rfc3339(dt) -> str:
+    """publishAt 형식 (UTC, 'Z')"""
+    return dt.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def upload_cost(thumbnail=True) -> int:
+    return QUOTA_COSTS["videos.insert"] + (QUOTA_COSTS["thumbnails.set"] if thumbnail else 0)
+
+
+class QuotaLedger:
+    def __init__(self, daily_limit=YOUTUBE_DAILY_QUOTA, data_dir=DATA_DIR):
+        self.daily_limit = daily_limit
+        self.path = os.path.join(data_dir, QUOTA_FILE)
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("days", {})
+        data.setdefault("scheduled", [])
+        return data
+
+    def _save(self, data):
+        # 오래된 날짜/지난 예약은 정리
+        days = sorted(data["days"])
+        data["days"] = {d: data["days"][d] for d in days[-KEEP_DAYS:]}
+        now = to_rfc3339(datetime.datetime.now(datetime.timezone.utc))
+        data["scheduled"] = sorted(s for s in set(data["scheduled"]) if s > now)
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self.path)
+
+    def record(self, call: str, count: int = 1) -> int:
+        """API 호출 기록. 오늘 쓴 unit 합계 리턴"""
+        day = quota_day()
+        with self.lock:
+            data = self._load()
+            entry = data["days"].setdefault(day, {"units": 0, "calls": {}})
+            entry["units"] += QUOTA_COSTS.get(call, 1) * count
+            entry["calls"][call] = entry["calls"].get(call, 0) + count
+            self._save(data)
+            return entry["units"]
+
+    def exhaust(self):
+        """서버가 quotaExceeded 를 돌려줬으면 오늘은 더 쓰지 않는다"""
+        day = quota_day()
+        with self.lock:
+            data = self._load()
+            entry = data["days"].setdefault(day, {"units": 0, "calls": {}})
+            entry["units"] = max(entry["units"], self.daily_limit)
+            self._save(data)
+
+    def spent(self, day: str = None) -> int:
+        with self.lock:
+            return self._load()["days"].get(day or quota_day(), {}).get("units", 0)
+
+    def remaining(self, day: str = None) -> int:
+        return max(0, self.daily_limit - self.spent(day))
+
+    def reserve_slot(self, publish_at: str):
+        with self.lock:
+            data = self._load()
+            data["scheduled"].append(publish_at)
+            self._save(data)
+
+    def scheduled_slots(self) -> set:
+        with self.lock:
+            return set(self._load()["scheduled"])
+
+    def stats(self) -> dict:
+        day = quota_day()
+        with self.lock:
+            data = self._load()
+        entry = data["days"].get(day, {"units": 0, "calls": {}})
+        return {
+            "quota_day": day,
+            "daily_limit": self.daily_limit,
+            "spent": entry["units"],
+            "remaining": max(0, self.daily_limit - entry["units"]),
+            "calls": entry["calls"],
+            "uploads_left_today": max(0, self.daily_limit - entry["units"]) // upload_cost(),
+            "scheduled": data["scheduled"],
+        }
+
+
+def parse_publish_times(spec: str = PUBLISH_TIMES) -> list[datetime.time]:
+    """'08:00,20:30' → [time(8, 0), time(20, 30)] (정렬)"""
+    times = set()
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if part:
+            hour, _, minute = part.partition(":")
+            times.add(datetime.time(int(hour), int(minute or 0)))
+    return sorted(times)
+
+
+class UploadPlanner:
+    def __init__(self, ledger=None, publish_times=PUBLISH_TIMES, timezone=PUBLISH_TIMEZONE,
+                 lead_minutes=PUBLISH_LEAD_MINUTES):
+        self.ledger = ledger or get_ledger()
+        self.publish_times = parse_publish_times(publish_times) or [datetime.time(12, 0)]
+        self.tz = ZoneInfo(timezone) if timezone else None   # None → 서버 로컬 시간대
+        self.lead = datetime.timedelta(minutes=lead_minutes)
+
+    def _slots(self, start):
+        """start 이후의 공개 슬롯 (aware datetime) 을 시간 순으로 끝없이"""
+        local = start.astimezone(self.tz)
+        day = local.date()
+        while True:
+            for t in self.publish_times:
+                slot = datetime.datetime.combine(day, t)
+                slot = slot.replace(tzinfo=self.tz) if self.tz else slot.astimezone()
+                if slot >= start:
+                    yield slot
+            day += datetime.timedelta(days=1)
+
+    def plan(self, jobs: list[dict], now=None) -> list[dict]:
+        """
+        jobs: [{"priority": float (클수록 먼저), "thumbnail": bool, ...}, ...]
+        Returns: 업로드 순서대로 [{**job, "index", "quota_day", "upload_at", "publish_at"}, ...]
+          upload_at  : 올릴 수 있는 가장 이른 시각 (오늘 quota 안이면 now, 아니면 리셋 시각)
+          publish_at : 이미 예약된 슬롯을 피한 다음 공개 슬롯 (upload_at + lead 이후)
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        order = sorted(range(len(jobs)), key=lambda i: (-jobs[i].get("priority", 0), i))
+        taken = self.ledger.scheduled_slots()
+
+        window_start = now
+        remaining = self.ledger.remaining(quota_day(now))
+        slots = self._slots(now + self.lead)
+        slot = None
+        entries = []
+        for i in order:
+            job = jobs[i]
+            cost = upload_cost(job.get("thumbnail", True))
+            if cost > self.ledger.daily_limit:
+                raise ValueError(f"One upload costs {cost} units, more than the daily quota {self.ledger.daily_limit}")
+            while remaining < cost:
+                window_start = next_reset(window_start)
+                remaining = self.ledger.daily_limit
+            remaining -= cost
+
+            while slot is None or slot < window_start + self.lead or to_rfc3339(slot) in taken:
+                slot = next(slots)
+            entries.append({
+                **job,
+                "index": i,
+                "quota_day": quota_day(window_start),
+                "upload_at": window_start,
+                "publish_at": to_rfc3339(slot),
+            })
+            slot = None
+        return entries
+
+    def drain_report(self, plan: list[dict], now=None) -> dict:
+        """백로그를 다 올리고 공개하기까지 걸리는 예상 시간"""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        if not plan:
+            return {"backlog": 0, "uploads_today": 0, "quota_days": 0, "drain_hours": 0.0}
+        last_publish = max(datetime.datetime.fromisoformat(p["publish_at"].replace("Z", "+00:00")) for p in plan)
+        return {
+            "backlog": len(plan),
+            "uploads_today": sum(1 for p in plan if p["quota_day"] == quota_day(now)),
+            "quota_days": len({p["quota_day"] for p in plan}),
+            "last_upload_at": to_rfc3339(max(p["upload_at"] for p in plan)),
+            "last_publish_at": to_rfc3339(last_publish),
+            "drain_hours": round((last_publish - now).total_seconds() / 3600, 1),
+        }
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> QuotaLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
+
+
+def main():
+    ledger = get_ledger()
+    if len(sys.argv) > 1 and sys.argv[1] == "plan":
+        # 예: python -m src.upload_planner plan 20  → 20개 백로그 일정 미리보기
+        planner = UploadPlanner(ledger)
+        plan = planner.plan([{} for _ in range(int(sys.argv[2]) if len(sys.argv) > 2 else 10)])
+        for p in plan:
+            print(f"#{p['index']:3d}  quota day {p['quota_day']}  publishAt {p['publish_at']}")
+        print(json.dumps(planner.drain_report(plan), indent=2))
+        return
+    print(json.dumps(ledger.stats(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import DATA_DIR, YOUTUBE_UPLOAD_URL, UPLOAD_CHUNK_SIZE, UPLOAD_CONCURRENCY
+
+# ======================
+# YouTube resumable 업로드 서비스
+# ======================
+# 프로토콜 (https://developers.google.com/youtube/v3/guides/using_resumable_upload_protocol):
+#   1) POST ?uploadType=resumable + 메타데이터 → Location 헤더의 session URI
+#   2) PUT session URI, Content-Range: bytes a-b/total  → 308 (Range: bytes=0-N) 또는 200/201 (완료)
+#   3) 끊기면 PUT Content-Range: bytes */total 로 서버가 받은 위치를 물어보고 거기서 이어서 보낸다
+# session URI 와 offset 은 data/upload_sessions.json 에 저장 → 프로세스가 죽어도 이어서 업로드.
+# 이미 끝난 파일은 다시 올리지 않고 저장된 videoId 를 돌려준다.
+STATE_FILE = "upload_sessions.json"
+CHUNK_UNIT = 256 * 1024          # chunk 크기는 256 KiB 배수여야 한다
+MAX_RETRIES = 5
+BACKOFF_MAX = 60.0
+
+
+def normalize_chunk_size(size):
+    return max(CHUNK_UNIT, (int(size) // CHUNK_UNIT) * CHUNK_UNIT)
+
+
+def _parse_range(header):
+    """'bytes=0-1048575' → 다음에 보낼 offset (1048576). 헤더 없으면 0"""
+    match = re.search(r"(\d+)-(\d+)", header or "")
+    return int(match.group(2)) + 1 if match else 0
+
+
+class UploadError(RuntimeError):
+    pass
+
+
+class SessionExpired(Exception):
+    pass
+
+
+class UploadService:
+    def __init__(self, session_factory=None, upload_url=YOUTUBE_UPLOAD_URL, chunk_size=UPLOAD_CHUNK_SIZE,
+                 concurrency=UPLOAD_CONCURRENCY, state_path=None, max_retries=MAX_RETRIES, quota_ledger=None):
+        """
+        session_factory: requests.Session 호환 객체를 만드는 함수 (스레드마다 하나).
+          실제 YouTube: lambda: AuthorizedSession(credentials)
+          로컬 테스트: requests.Session
+        quota_ledger: upload_planner.QuotaLedger (session 을 열 때마다 videos.insert 를 기록)
+        """
+        if session_factory is None:
+            import requests
+
+            session_factory = requests.Session
+        self.session_factory = session_factory
+        self.upload_url = upload_url
+        self.chunk_size = normalize_chunk_size(chunk_size)
+        self.concurrency = max(1, concurrency)
+        self.state_path = state_path or os.path.join(DATA_DIR, STATE_FILE)
+        self.max_retries = max_retries
+        self.quota_ledger = quota_ledger
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def from_credentials(cls, credentials, **kwargs):
+        """google.oauth2 credentials 로 인증된 세션을 쓰는 서비스"""
+        from google.auth.transport.requests import AuthorizedSession
+
+        return cls(session_factory=lambda: AuthorizedSession(credentials), **kwargs)
+
+    def _session(self):
+        if getattr(self._local, "session", None) is None:
+            self._local.session = self.session_factory()
+        return self._local.session
+
+    # -------------------------------------------
+    # 상태 파일
+    # -------------------------------------------
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _update_job(self, job_id, **fields):
+        with self._lock:
+            state = self._load_state()
+            job = state.setdefault(job_id, {})
+            job.update(fields, updated_at=time.time())
+            directory = os.path.dirname(self.state_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+            return dict(job)
+
+    def get_job(self, job_id):
+        with self._lock:
+            return self._load_state().get(job_id)
+
+    @staticmethod
+    def job_id(file_path):
+        """같은 파일(경로+크기+mtime)이면 같은 job"""
+        st = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def pending(self):
+        """
+        아직 안 끝난 업로드 [(file_path, metadata, mimetype), ...] (파일이 남아 있는 것만).
+        - failed / stale job 은 이어 올리지 않는다 (4xx 를 계속 재시도하지 않도록)
+        - 같은 경로에 다른 내용이 다시 렌더된 경우 (job_id 가 바뀜) 옛 metadata 로 올리면 안 되므로 stale 로 표시
+        """
+        with self._lock:
+            state = self._load_state()
+        jobs, stale = [], []
+        for key, job in state.items():
+            if job.get("status") in ("done", "failed", "stale") or not job.get("file"):
+                continue
+            try:
+                current = self.job_id(job["file"])
+            except FileNotFoundError:
+                continue
+            if current != key:
+                stale.append(key)
+                continue
+            jobs.append((job["file"], job.get("metadata", {}), job.get("mimetype", "video/*")))
+        for key in stale:
+            self._update_job(key, status="stale", session_uri=None)
+        if stale:
+            print(f"🧹 Skipped {len(stale)} unfinished uploads whose file was re-rendered")
+        return jobs
+
+    # -------------------------------------------
+    # 프로토콜
+    # -------------------------------------------
+    def _start_session(self, size, mimetype, metadata):
+        resp = self._session().post(
+            self.upload_url,
+            params={"uploadType": "resumable", "part": ",".join(metadata.keys()) or "snippet,status"},
+            json=metadata,
+            headers={"X-Upload-Content-Length": str(size), "X-Upload-Content-Type": mimetype},
+            timeout=60,
+        )
+        if resp.status_code >= 400:
+            if self.quota_ledger is not None and "quotaExceeded" in resp.text:
+                self.quota_ledger.exhaust()
+            raise UploadError(f"Failed to start upload session: {resp.status_code} {resp.text[:300]}")
+        if self.quota_ledger is not None:
+            self.quota_ledger.record("videos.insert")  # quota 는 session 을 열 때 차감된다
+        location = resp.headers.get("Location")
+        if not location:
+            raise UploadError("Upload session response has no Location header")
+        return location
+
+    def _handle_response(self, resp):
+        """(다음 offset, 완료 시 video 리소스 dict). 만료/재시도 대상은 예외"""
+        if resp.status_code in (200, 201):
+            return None, resp.json()
+        if resp.status_code == 308:
+            return _parse_range(resp.headers.get("Range")), None
+        if resp.status_code in (404, 410):
+            raise SessionExpired(f"upload session expired ({resp.status_code})")
+        if resp.status_code >= 500 or resp.status_code == 429:
+            raise ConnectionError(f"server error {resp.status_code}")
+        raise UploadError(f"Upload failed: {resp.status_code} {resp.text[:300]}")
+
+    def _query_offset(self, session_uri, size):
+        resp = self._session().put(session_uri, headers={"Content-Range": f"bytes */{size}", "Content-Length": "0"},
+                                   timeout=60)
+        return self._handle_response(resp)
+
+    def _send_chunk(self, session_uri, f, offset, size):
+        f.seek(offset)
+        data = f.read(self.chunk_size)
+        end = offset + len(data) - 1
+        resp = self._session().put(
+            session_uri,
+            data=data,
+            headers={"Content-Range": f"bytes {offset}-{end}/{size}", "Content-Length": str(len(data))},
+            timeout=300,
+        )
+        return self._handle_response(resp)
+
+    # -------------------------------------------
+    # 업로드
+    # -------------------------------------------
+    def upload(self, file_path, metadata, mimetype="video/*"):
+        """
+        file_path 를 업로드하고 video 리소스 dict 를 리턴.
+        저장된 session 이 있으면 서버가 받은 위치부터 이어서 보낸다.
+        """
+        size = os.path.getsize(file_path)
+        job_id = self.job_id(file_path)
+        job = self.get_job(job_id) or {}
+        if job.get("status") == "done":
+            print(f"✅ Already uploaded: {file_path} (videoId={job.get('video_id')})")
+            return job.get("resource") or {"id": job.get("video_id")}
+
+        self._update_job(job_id, file=file_path, size=size, metadata=metadata, mimetype=mimetype,
+                         status="uploading")
+        session_uri = job.get("session_uri")
+        need_query = bool(session_uri)  # 저장된 session 이면 서버가 받은 위치부터
+        offset = 0
+        attempt = 0
+
+        with open(file_path, "rb") as f:
+            while True:
+                try:
+                    if not session_uri:
+                        session_uri = self._start_session(size, mimetype, metadata)
+                        offset, need_query = 0, False
+                        self._update_job(job_id, session_uri=session_uri, offset=0)
+
+                    if need_query:
+                        offset, resource = self._query_offset(session_uri, size)
+                        need_query = False
+                        if resource is not None:
+                            return self._finish(job_id, file_path, resource)
+                        if offset:
+                            print(f"↩️  Resuming {os.path.basename(file_path)} at {offset}/{size} bytes")
+                        self._update_job(job_id, offset=offset)
+
+                    offset, resource = self._send_chunk(session_uri, f, offset, size)
+                    if resource is not None:
+                        return self._finish(job_id, file_path, resource)
+                    self._update_job(job_id, offset=offset)
+                    attempt = 0
+                    print(f"Upload progress: {os.path.basename(file_path)} {int(offset * 100 / size)}%")
+
+                except UploadError as e:
+                    # 4xx 등 재시도해도 안 되는 에러 → failed 로 남겨서 resume_pending 이 다시 잡지 않게
+                    self._update_job(job_id, status="failed", error=str(e), session_uri=None)
+                    raise
+                except (SessionExpired, ConnectionError, OSError) as e:
+                    attempt += 1
+                    if attempt > self.max_retries:
+                        self._update_job(job_id, status="failed", error=str(e))
+                        raise UploadError(f"Upload of {file_path} failed after {self.max_retries} retries: {e}")
+                    if isinstance(e, SessionExpired):
+                        # 만료된 session 은 처음부터 새로
+                        print(f"⚠️ {e}; starting a new session for {file_path}")
+                        session_uri = None
+                        self._update_job(job_id, session_uri=None, offset=0)
+                        continue
+                    delay = random.uniform(0, min(BACKOFF_MAX, 2 ** attempt))
+                    print(f"⚠️ Upload interrupted ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                    time.sleep(delay)
+                    need_query = bool(session_uri)
+
+    def _finish(self, job_id, file_path, resource):
+        self._update_job(job_id, status="done", video_id=resource.get("id"), resource=resource,
+                         session_uri=None)
+        print(f"✅ Uploaded {file_path}. videoId = {resource.get('id')}")
+        return resource
+
+    def upload_many(self, jobs):
+        """
+        jobs: [(file_path, metadata) 또는 (file_path, metadata, mimetype), ...]
+        concurrency 개씩 동시에 업로드. [{"file", "video_id", "error"}, ...] (jobs 순서)
+        """
+        def run(job):
+            file_path, metadata, *rest = job
+            try:
+                resource = self.upload(file_path, metadata, *(rest or ["video/*"]))
+                return {"file": file_path, "video_id": resource.get("id"), "error": None}
+            except Exception as e:
+                print(f"❌ Upload failed for {file_path}: {e}")
+                return {"file": file_path, "video_id": None, "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="upload") as pool:
+            return list(pool.map(run, jobs))
+
+    def resume_pending(self):
+        """이전 프로세스에서 끝나지 않은 업로드를 이어서 올린다"""
+        jobs = self.pending()
+        if jobs:
+            print(f"↩️  Resuming {len(jobs)} unfinished uploads")
+        return self.upload_many(jobs)
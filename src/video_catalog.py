@@ -0,0 +1,248 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .config import DATA_DIR, RETENTION_ROOTS
+
+# ======================
+# 렌더된 영상 카탈로그 (sqlite)
+# ======================
+# VIDEOS_DIR / rendered_shorts / videos_out 의 mp4 를 한 테이블로 관리한다.
+#   videos : 경로, 크기, mtime, 만든 시각, 마지막 다운로드 시각, 다운로드 수, 업로드된 videoId
+#   dirs   : 디렉토리별 마지막으로 본 mtime 과 하위 디렉토리 목록
+# sync() 는 mtime 이 바뀐 디렉토리만 다시 읽는다 (파일 추가/삭제는 디렉토리 mtime 을 바꾼다).
+# 같은 이름으로 덮어쓰는 경우(rendered_shorts/quiz_001.mp4)는 디렉토리 mtime 이 안 바뀌므로
+# 쓰는 쪽에서 register(path) 를 부른다.
+#   hashes : 파일 내용 sha256 (크기/mtime 이 그대로면 다시 계산하지 않음) → 다운로드 ETag
+CATALOG_FILE = "video_catalog.db"
+VIDEO_EXTENSIONS = (".mp4",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL,
+    downloads INTEGER NOT NULL DEFAULT 0,
+    video_id TEXT
+);
+CREATE INDEX IF NOT EXISTS videos_root ON videos (root, name);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def parse_roots(spec: str = RETENTION_ROOTS) -> list[str]:
+    return [os.path.normpath(r.strip()) for r in (spec or "").split(",") if r.strip()]
+
+
+class VideoCatalog:
+    def __init__(self, path=None, roots=None):
+        self.path = path or os.path.join(DATA_DIR, CATALOG_FILE)
+        self.roots = roots if roots is not None else parse_roots()
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """트랜잭션 하나 (끝나면 commit, 예외면 rollback) 후 연결 닫기"""
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _root_of(self, path):
+        for root in self.roots:
+            if path == root or path.startswith(root + os.sep):
+                return root
+        return os.path.dirname(path)
+
+    # -------------------------------------------
+    # 등록 / 동기화
+    # -------------------------------------------
+    def _upsert(self, db, path, st):
+        """새 파일이거나 내용이 바뀌었으면 (size/mtime) 새 항목으로 취급 (업로드/다운로드 기록 초기화)"""
+        row = db.execute("SELECT size, mtime_ns FROM videos WHERE path = ?", (path,)).fetchone()
+        if row and (row["size"], row["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+            return False
+        db.execute(
+            "INSERT OR REPLACE INTO videos (path, root, name, size, mtime_ns, created_at, last_access, downloads, video_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, NULL, 0, NULL)",
+            (path, self._root_of(path), os.path.basename(path), st.st_size, st.st_mtime_ns, st.st_mtime),
+        )
+        return True
+
+    def register(self, path):
+        """방금 쓴 파일을 카탈로그에 반영"""
+        path = os.path.normpath(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return self.remove(path)
+        with self.lock, self._connect() as db:
+            self._upsert(db, path, st)
+
+    def _sync_dir(self, db, directory, stats):
+        try:
+            st = os.stat(directory)
+        except FileNotFoundError:
+            # 디렉토리가 통째로 사라짐
+            stats["removed"] += db.execute("DELETE FROM videos WHERE path LIKE ? ESCAPE '\\'",
+                                           (_like_prefix(directory),)).rowcount
+            db.execute("DELETE FROM dirs WHERE path = ? OR path LIKE ? ESCAPE '\\'",
+                       (directory, _like_prefix(directory)))
+            return
+
+        row = db.execute("SELECT mtime_ns, subdirs FROM dirs WHERE path = ?", (directory,)).fetchone()
+        if row and row["mtime_ns"] == st.st_mtime_ns:
+            subdirs = json.loads(row["subdirs"])
+        else:
+            stats["scanned_dirs"] += 1
+            subdirs, present = [], set()
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and entry.name.endswith(VIDEO_EXTENSIONS):
+                        path = os.path.normpath(entry.path)
+                        present.add(path)
+                        if self._upsert(db, path, entry.stat()):
+                            stats["added"] += 1
+            known = {r["path"] for r in db.execute("SELECT path FROM videos WHERE path LIKE ? ESCAPE '\\'",
+                                                   (_like_prefix(directory),))
+                     if os.path.dirname(r["path"]) == directory}
+            for path in known - present:
+                db.execute("DELETE FROM videos WHERE path = ?", (path,))
+                stats["removed"] += 1
+            db.execute("INSERT OR REPLACE INTO dirs (path, mtime_ns, subdirs) VALUES (?, ?, ?)",
+                       (directory, st.st_mtime_ns, json.dumps(subdirs)))
+
+        for sub in subdirs:
+            self._sync_dir(db, sub, stats)
+
+    def sync(self, roots=None) -> dict:
+        """mtime 이 바뀐 디렉토리만 다시 읽어서 카탈로그를 맞춘다"""
+        stats = {"scanned_dirs": 0, "added": 0, "removed": 0}
+        with self.lock, self._connect() as db:
+            for root in roots or self.roots:
+                self._sync_dir(db, os.path.normpath(root), stats)
+        return stats
+
+    # -------------------------------------------
+    # 기록
+    # -------------------------------------------
+    def mark_downloaded(self, path):
+        path = os.path.normpath(path)
+        if self.get(path) is None:
+            self.register(path)
+        with self.lock, self._connect() as db:
+            db.execute("UPDATE videos SET last_access = ?, downloads = downloads + 1 WHERE path = ?",
+                       (time.time(), path))
+
+    def mark_uploaded(self, path, video_id):
+        self.register(path)
+        with self.lock, self._connect() as db:
+            db.execute("UPDATE videos SET video_id = ? WHERE path = ?", (video_id, os.path.normpath(path)))
+
+    def remove(self, path):
+        with self.lock, self._connect() as db:
+            db.execute("DELETE FROM videos WHERE path = ?", (os.path.normpath(path),))
+            db.execute("DELETE FROM hashes WHERE path = ?", (os.path.normpath(path),))
+
+    def content_hash(self, path, st=None) -> str:
+        """
+        파일 내용 sha256 (hex). 카탈로그에 저장된 값의 크기/mtime 이 그대로면 파일을 읽지 않는다.
+        영상뿐 아니라 퀴즈 JSON 등 아무 파일이나 된다.
+        """
+        path = os.path.normpath(path)
+        st = st or os.stat(path)
+        with self.lock, self._connect() as db:
+            row = db.execute("SELECT size, mtime_ns, sha256 FROM hashes WHERE path = ?", (path,)).fetchone()
+        if row and (row["size"], row["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+            return row["sha256"]
+
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        with self.lock, self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                       (path, st.st_size, st.st_mtime_ns, digest))
+        return digest
+
+    def add_counter(self, name, value):
+        with self.lock, self._connect() as db:
+            db.execute("INSERT INTO counters (name, value) VALUES (?, ?) "
+                       "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, value))
+
+    # -------------------------------------------
+    # 조회
+    # -------------------------------------------
+    def files_in(self, root) -> list[dict]:
+        """root 바로 아래 영상 (이름 역순 = 최신 먼저)"""
+        root = os.path.normpath(root)
+        with self.lock, self._connect() as db:
+            rows = db.execute("SELECT * FROM videos WHERE root = ? ORDER BY name DESC", (root,)).fetchall()
+        return [dict(r) for r in rows if os.path.dirname(r["path"]) == root]
+
+    def get(self, path):
+        with self.lock, self._connect() as db:
+            row = db.execute("SELECT * FROM videos WHERE path = ?", (os.path.normpath(path),)).fetchone()
+        return dict(row) if row else None
+
+    def query(self, sql, params=()) -> list[dict]:
+        with self.lock, self._connect() as db:
+            return [dict(r) for r in db.execute(sql, params).fetchall()]
+
+    def stats(self) -> dict:
+        with self.lock, self._connect() as db:
+            roots = {r["root"]: {"files": r["files"], "bytes": r["bytes"]}
+                     for r in db.execute("SELECT root, COUNT(*) AS files, SUM(size) AS bytes FROM videos GROUP BY root")}
+            counters = {r["name"]: r["value"] for r in db.execute("SELECT name, value FROM counters")}
+        return {
+            "files": sum(r["files"] for r in roots.values()),
+            "bytes": sum(r["bytes"] or 0 for r in roots.values()),
+            "roots": roots,
+            "counters": counters,
+        }
+
+
+def _like_prefix(directory):
+    escaped = directory.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + os.sep + "%"
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> VideoCatalog:
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = VideoCatalog()
+        return _catalog
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+
+from .config import (
+    RETENTION_MAX_BYTES,
+    RETENTION_MAX_AGE_DAYS,
+    RETENTION_KEEP_UNTIL_UPLOADED,
+)
+from .video_catalog import get_catalog, parse_roots
+
+# ======================
+# 렌더된 영상 보관 정책
+# ======================
+# 카탈로그(video_catalog) 기준으로 지울 파일을 고르고, 파일과 카탈로그 항목을 같이 지운다.
+#   1) max age   : RETENTION_MAX_AGE_DAYS 보다 오래된 영상
+#   2) max bytes : 전체가 RETENTION_MAX_BYTES 를 넘으면 마지막 다운로드(없으면 생성) 시각이 오래된 것부터 (LRU)
+#   keep until uploaded : RETENTION_KEEP_UNTIL_UPLOADED 폴더의 영상은 업로드(videoId 기록) 전엔 지우지 않는다
+# 파일 시스템은 카탈로그 sync (바뀐 디렉토리만) 로만 본다 → 매번 전체를 다시 훑지 않는다.
+#
+#   python -m src.video_retention             # 한 번 실행하고 결과 출력
+#   python -m src.video_retention --dry-run   # 지울 대상만 출력
+
+
+class RetentionManager:
+    def __init__(self, catalog=None, max_bytes=RETENTION_MAX_BYTES, max_age_days=RETENTION_MAX_AGE_DAYS,
+                 keep_until_uploaded=RETENTION_KEEP_UNTIL_UPLOADED):
+        self.catalog = catalog or get_catalog()
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.protected_roots = parse_roots(keep_until_uploaded)
+
+    def _protected(self, row):
+        return row["root"] in self.protected_roots and not row["video_id"]
+
+    def candidates(self, now=None) -> list[tuple[dict, str]]:
+        """[(카탈로그 항목, 정책 이름), ...] 지울 순서대로"""
+        now = now or time.time()
+        rows = self.catalog.query("SELECT * FROM videos ORDER BY COALESCE(last_access, created_at) ASC")
+        chosen, chosen_paths = [], set()
+
+        if self.max_age > 0:
+            for row in rows:
+                if now - row["created_at"] > self.max_age and not self._protected(row):
+                    chosen.append((row, "max_age"))
+                    chosen_paths.add(row["path"])
+
+        if self.max_bytes > 0:
+            total = sum(r["size"] for r in rows if r["path"] not in chosen_paths)
+            for row in rows:  # LRU 순서
+                if total <= self.max_bytes:
+                    break
+                if row["path"] in chosen_paths or self._protected(row):
+                    continue
+                chosen.append((row, "max_bytes"))
+                chosen_paths.add(row["path"])
+                total -= row["size"]
+        return chosen
+
+    def enforce(self, dry_run=False) -> dict:
+        """
+        정책을 한 번 적용하고 결과 리턴:
+        {"deleted", "reclaimed_bytes", "by_policy": {policy: {"files", "bytes"}}, "remaining_bytes", "sync"}
+        """
+        sync = self.catalog.sync()
+        report = {"deleted": 0, "reclaimed_bytes": 0, "by_policy": {}, "sync": sync, "dry_run": dry_run}
+
+        for row, policy in self.candidates():
+            if not dry_run:
+                try:
+                    os.remove(row["path"])
+                except FileNotFoundError:
+                    pass  # 이미 없음 → 카탈로그만 정리
+                except OSError as e:
+                    print(f"⚠️ Could not delete {row['path']}: {e}")
+                    continue
+                self.catalog.remove(row["path"])
+            bucket = report["by_policy"].setdefault(policy, {"files": 0, "bytes": 0})
+            bucket["files"] += 1
+            bucket["bytes"] += row["size"]
+            report["deleted"] += 1
+            report["reclaimed_bytes"] += row["size"]
+
+        if report["deleted"] and not dry_run:
+            self.catalog.add_counter("retention_deleted", report["deleted"])
+            self.catalog.add_counter("retention_reclaimed_bytes", report["reclaimed_bytes"])
+            print(f"🧹 Retention: deleted {report['deleted']} videos, "
+                  f"reclaimed {report['reclaimed_bytes'] / 1024 ** 2:.1f} MiB")
+        report["remaining_bytes"] = self.catalog.stats()["bytes"] - (report["reclaimed_bytes"] if dry_run else 0)
+        return report
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply the rendered video retention policy")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    report = RetentionManager().enforce(dry_run=args.dry_run)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import imageio_ffmpeg
+
+# ======================
+# 인코딩 설정
+# ======================
+# 퀴즈 숏폼은 정지 화면 몇 장이 전부라서, 프레임마다 이미지를 넘기는 대신
+# (image, duration) 타임라인을 받아 서로 다른 프레임만 ffmpeg에 한 번씩 넘긴다.
+#   - "cfr": YouTube Shorts 용 고정 30fps. 색변환은 distinct 프레임에만 하고
+#            복제 프레임은 x264가 skip 블록으로 처리하도록 정지화면용 설정 사용
+#   - "vfr": distinct 프레임만 인코딩 (타임스탬프로 길이 표현, 내부 미리보기 용)
+FPS = 30
+FRAME_MODE = "cfr"
+X264_PRESET = "medium"
+X264_CRF = 23
+# 정지 화면 위주 콘텐츠: 모션 탐색/파티션 분석을 최소화하고 B프레임으로 복제 구간을 압축
+X264_STATIC_PARAMS = (
+    "me=dia:subme=2:ref=1:mixed-refs=0:partitions=none:trellis=0:weightp=0:"
+    "bframes=8:b-adapt=0:rc-lookahead=10"
+)
+AUDIO_SAMPLE_RATE = 44100
+
+# 출력 프로파일: 한 번 렌더한 프레임으로 ffmpeg 한 번 실행에 여러 포맷을 만든다 (split/scale)
+#   size          - (width, height). None 이면 원본 해상도 그대로
+#   video_codec   - libx264 / libvpx-vp9 등
+#   crf           - 품질 기반 인코딩
+#   video_bitrate - 지정하면 비트레이트 상한 (maxrate/bufsize)
+#   audio_codec / audio_bitrate
+#   container     - mp4 / webm / mov
+OUTPUT_PROFILES = {
+    "shorts": {
+        "size": (1080, 1920), "video_codec": "libx264", "crf": X264_CRF,
+        "audio_codec": "aac", "audio_bitrate": "128k", "container": "mp4",
+    },
+    "reels": {
+        "size": (1080, 1920), "video_codec": "libx264", "crf": X264_CRF, "video_bitrate": "3500k",
+        "audio_codec": "aac", "audio_bitrate": "128k", "container": "mp4",
+    },
+    "preview": {
+        "size": (360, 640), "video_codec": "libx264", "crf": 28, "video_bitrate": "300k",
+        "audio_codec": "aac", "audio_bitrate": "64k", "container": "mp4",
+    },
+}
+DEFAULT_PROFILE = "shorts"
+
+
+def get_ffmpeg_exe():
+    """imageio-ffmpeg 에 포함된 ffmpeg 바이너리 경로 (IMAGEIO_FFMPEG_EXE 로 덮어쓰기 가능)"""
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def _fmt(seconds):
+    return f"{seconds:.3f}"
+
+
+def _dedupe_timeline(timeline):
+    """같은 이미지 객체가 연속으로 오면 하나의 세그먼트로 합친다."""
+    segments = []
+    for image, duration in timeline:
+        if duration <= 0:
+            continue
+        if segments and segments[-1][0] is image:
+            segments[-1] = (image, segments[-1][1] + duration)
+        else:
+            segments.append((image, duration))
+    return segments
+
+
+def _write_concat_list(segments, work_dir):
+    """각 distinct 프레임을 한 번만 디스크에 쓰고 ffconcat 목록을 만든다."""
+    lines = ["ffconcat version 1.0"]
+    last_name = None
+    for i, (image, duration) in enumerate(segments):
+        name = f"frame_{i:03d}.bmp"
+        # BMP: 압축 없이 바로 써서 ffmpeg 디코딩 비용도 거의 없음
+        image.convert("RGB").save(os.path.join(work_dir, name))
+        lines.append(f"file '{name}'")
+        lines.append(f"duration {_fmt(duration)}")
+        last_name = name
+    # concat demuxer는 마지막 항목의 duration을 무시하므로 마지막 프레임을 한 번 더 넣는다
+    lines.append(f"file '{last_name}'")
+
+    list_path = os.path.join(work_dir, "timeline.ffconcat")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return list_path
+
+
+def _audio_inputs_and_filters(audio_tracks, first_input_index):
+    """
+    audio_tracks 항목 (dict):
+      path      - 오디오 파일 경로 (필수)
+      start     - 영상 타임라인에서 재생 시작 시각 (초, 기본 0)
+      offset    - 원본 파일에서 건너뛸 구간 (초, 기본 0)
+      volume    - 볼륨 배율 (기본 1.0)
+      loop      - 원본이 짧으면 반복 재생 (기본 False)
+      end       - 영상 타임라인에서 재생을 멈출 시각 (초, 기본 영상 끝)
+      fade_out  - end 직전 페이드아웃 길이 (초, 기본 0)
+      every     - 이 간격(초)마다 처음부터 다시 재생 (입력 하나로 반복 효과음, end 필수)
+    """
+    input_args, filters, labels = [], [], []
+
+    for i, track in enumerate(audio_tracks):
+        idx = first_input_index + i
+        if track.get("loop"):
+            input_args += ["-stream_loop", "-1"]
+        if track.get("offset"):
+            input_args += ["-ss", _fmt(track["offset"])]
+        input_args += ["-i", track["path"]]
+
+        start = track.get("start", 0) or 0
+        chain = [f"volume={track.get('volume', 1.0)}"]
+        every = track.get("every")
+        if every:
+            # 한 주기 길이로 자르고/채운 뒤 그 주기를 메모리에서 반복 (주기 하나 분량만 버퍼링)
+            period = int(round(every * AUDIO_SAMPLE_RATE))
+            chain[:0] = [f"aresample={AUDIO_SAMPLE_RATE}", f"atrim=0:{_fmt(every)}", f"apad=whole_dur={_fmt(every)}",
+                         f"aloop=loop=-1:size={period}"]
+        end = track.get("end")
+        if end is not None:
+            length = max(0.0, end - start)
+            chain.append(f"atrim=0:{_fmt(length)}")
+            fade = track.get("fade_out", 0) or 0
+            if fade:
+                chain.append(f"afade=t=out:st={_fmt(max(0.0, length - fade))}:d={_fmt(fade)}")
+        if start > 0:
+            chain.append(f"adelay={int(round(start * 1000))}:all=1")
+
+        label = f"a{i}"
+        filters.append(f"[{idx}:a]{','.join(chain)}[{label}]")
+        labels.append(label)
+
+    if len(labels) == 1:
+        filters.append(f"[{labels[0]}]aresample={AUDIO_SAMPLE_RATE}[aout]")
+    else:
+        # moviepy CompositeAudioClip 처럼 단순 합산 (normalize=0)
+        mix_inputs = "".join(f"[{label}]" for label in labels)
+        filters.append(
+            f"{mix_inputs}amix=inputs={len(labels)}:duration=longest:normalize=0,"
+            f"aresample={AUDIO_SAMPLE_RATE}[aout]"
+        )
+    return input_args, filters
+
+
+def resolve_profiles(profiles):
+    """
+    프로파일 이름(str) 또는 dict 목록을 [(name, profile_dict), ...] 로 정리한다.
+    dict 는 "name" 키가 있으면 그 이름을, "base" 키가 있으면 해당 프로파일 값을 기본으로 쓴다.
+    """
+    resolved = []
+    for i, prof in enumerate(profiles):
+        if isinstance(prof, str):
+            if prof not in OUTPUT_PROFILES:
+                raise ValueError(f"Unknown output profile: {prof}")
+            resolved.append((prof, dict(OUTPUT_PROFILES[prof])))
+        elif isinstance(prof, dict):
+            base = dict(OUTPUT_PROFILES.get(prof.get("base", DEFAULT_PROFILE), {}))
+            base.update({k: v for k, v in prof.items() if k not in ("name", "base")})
+            resolved.append((prof.get("name", f"profile{i}"), base))
+        else:
+            raise ValueError(f"Invalid output profile: {prof!r}")
+    return resolved
+
+
+def _output_args(profile, fps, frame_mode, total):
+    """프로파일 하나에 해당하는 ffmpeg 출력 옵션"""
+    codec = profile.get("video_codec", "libx264")
+    args = ["-c:v", codec]
+
+    # CRF 기반 + video_bitrate 가 있으면 상한(capped CRF). 정지 화면이라 대부분 상한보다 훨씬 작다
+    args += ["-crf", str(profile.get("crf", X264_CRF))]
+    rate = profile.get("video_bitrate")
+    if codec == "libvpx-vp9":
+        args += ["-b:v", rate or "0"]
+    elif rate:
+        args += ["-maxrate", rate, "-bufsize", _double_rate(rate)]
+
+    if codec == "libx264":
+        args += ["-preset", profile.get("preset", X264_PRESET), "-x264-params", X264_STATIC_PARAMS]
+
+    if frame_mode == "cfr":
+        args += ["-r", str(fps), "-t", _fmt(total)]
+    else:
+        # 마지막 복제 프레임(t=total)까지 남겨야 마지막 세그먼트 길이가 유지된다
+        args += ["-fps_mode", "vfr", "-video_track_timescale", str(fps),
+                 "-t", _fmt(total + 1 / fps)]
+
+    container = profile.get("container", "mp4")
+    args += ["-f", container]
+    if container in ("mp4", "mov"):
+        args += ["-movflags", "+faststart"]
+    return args
+
+
+def _double_rate(rate):
+    """'300k' → '600k' (bufsize = 2 x bitrate)"""
+    rate = str(rate)
+    if rate[-1].isalpha():
+        return f"{float(rate[:-1]) * 2:g}{rate[-1]}"
+    return str(int(float(rate) * 2))
+
+
+def run_ffmpeg(args, stdin_chunks=None):
+    """
+    ffmpeg 실행. 실패하면 stderr 끝부분을 담아 RuntimeError.
+    stdin_chunks: 주면 bytes-like 를 하나씩 stdin 으로 흘려 넣는다 (입력 "pipe:0")
+    """
+    cmd = [get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y"] + args
+    if stdin_chunks is None:
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        returncode, err = proc.returncode, proc.stderr
+    else:
+        # stderr 는 파일로: 파이프로 받으면 stdin 에 쓰는 동안 stderr 가 차서 서로 기다릴 수 있다
+        with tempfile.TemporaryFile() as err_file:
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=err_file)
+            try:
+                for chunk in stdin_chunks:
+                    proc.stdin.write(chunk)
+            except BrokenPipeError:
+                pass  # ffmpeg 가 먼저 끝남 → 아래 returncode / stderr 로 판단
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+                returncode = proc.wait()
+            err_file.seek(0)
+            err = err_file.read()
+    if returncode != 0:
+        err = err.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed ({returncode}): {err[-2000:]}")
+
+
+def _encode_args(video_label, src_size, profiles, paths, audio_tracks, audio_input_index, fps, frame_mode, total,
+                 filters=()):
+    """
+    video_label 스트림 (+ audio_tracks) 을 프로파일마다 인코딩하는 ffmpeg 인자 (입력 인자 뒤에 붙인다)
+    - 스케일/색변환은 fps 복제 전에 적용 (정지 타임라인이면 distinct 프레임에만)
+    - 프로파일이 여러 개면 split/asplit 으로 한 번 실행에 모두 만든다
+    """
+    n = len(profiles)
+    args = []
+    filters = list(filters)
+
+    fps_filter = f",fps={fps}" if frame_mode == "cfr" else ""
+    if n == 1:
+        branches = [video_label]
+    else:
+        branches = [f"[vs{i}]" for i in range(n)]
+        filters.append(f"{video_label}split={n}{''.join(branches)}")
+    for i, (_, profile) in enumerate(profiles):
+        size = profile.get("size")
+        scale = ""
+        if size and tuple(size) != tuple(src_size):
+            scale = f"scale={size[0]}:{size[1]}:flags=lanczos,"
+        filters.append(f"{branches[i]}{scale}format=yuv420p{fps_filter}[vout{i}]")
+
+    if audio_tracks:
+        audio_args, audio_filters = _audio_inputs_and_filters(audio_tracks, first_input_index=audio_input_index)
+        args += audio_args
+        filters += audio_filters
+        if n > 1:
+            filters.append(f"[aout]asplit={n}{''.join(f'[aout{i}]' for i in range(n))}")
+
+    args += ["-filter_complex", ";".join(filters)]
+
+    for i, ((_, profile), path) in enumerate(zip(profiles, paths)):
+        args += ["-map", f"[vout{i}]"]
+        if audio_tracks:
+            audio_label = "[aout]" if n == 1 else f"[aout{i}]"
+            args += ["-map", audio_label, "-c:a", profile.get("audio_codec", "aac")]
+            if profile.get("audio_bitrate"):
+                args += ["-b:a", profile["audio_bitrate"]]
+        args += _output_args(profile, fps, frame_mode, total)
+        args.append(path)
+    return args
+
+
+def write_timeline_video(timeline, output_path, audio_tracks=None, fps=FPS,
+                         frame_mode=FRAME_MODE, outputs=None):
+    """
+    (PIL.Image, duration_seconds) 세그먼트 목록을 인코딩한다.
+    - 서로 다른 프레임은 한 번씩만 ffmpeg에 전달
+    - frame_mode="cfr": fps 필터로 고정 프레임레이트 출력 (Shorts 업로드용)
+    - frame_mode="vfr": distinct 프레임만 인코딩, 타임스탬프는 1/fps 격자에 맞춤
+    - audio_tracks 는 _audio_inputs_and_filters 참고
+    - outputs: [(path, profile), ...] 를 주면 ffmpeg 한 번 실행으로 모든 출력을 만든다
+      (profile 은 이름 또는 dict, resolve_profiles 참고). 없으면 output_path 하나에 기본 프로파일
+    """
+    if frame_mode not in ("cfr", "vfr"):
+        raise ValueError(f"Unknown frame_mode: {frame_mode}")
+
+    single = outputs is None
+    if single:
+        outputs = [(output_path, DEFAULT_PROFILE)]
+    paths = [path for path, _ in outputs]
+    profiles = resolve_profiles([prof for _, prof in outputs])
+
+    segments = _dedupe_timeline(timeline)
+    if not segments:
+        raise ValueError("Timeline must contain at least one segment with a positive duration.")
+
+    total = sum(d for _, d in segments)
+    src_size = segments[0][0].size
+    audio_tracks = [t for t in (audio_tracks or []) if t.get("path")]
+
+    work_dir = tempfile.mkdtemp(prefix="quiz_timeline_")
+    try:
+        list_path = _write_concat_list(segments, work_dir)
+
+        args = ["-f", "concat", "-safe", "0", "-i", list_path]
+        args += _encode_args("[0:v]", src_size, profiles, paths, audio_tracks, 1, fps, frame_mode, total)
+        run_ffmpeg(args)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if single:
+        return output_path
+    return {name: path for (name, _), path in zip(profiles, paths)}
+
+
+def write_overlay_video(base, overlay_frames, overlay_xy, frame_count, tail, output_path,
+                        audio_tracks=None, fps=FPS, outputs=None):
+    """
+    base 이미지 위 작은 영역만 프레임마다 바뀌는 애니메이션 (frame_count 프레임) + 이어지는 정지 타임라인 tail.
+    - base 는 ffmpeg 에 한 번만 넘겨서 색변환 후 loop 필터로 반복하고,
+      바뀌는 영역(overlay_frames, 같은 크기의 (h, w, 3) uint8 배열)만 rawvideo 로 stdin 에 흘려 overlay 한다
+      → 전체 캔버스 프레임을 파이썬에서 만들거나 파이프로 보내지 않는다
+    - overlay_frames 는 generator 여도 된다 (한 장씩 만들어서 바로 보냄)
+    - tail, audio_tracks, outputs 는 write_timeline_video 와 같다. 출력은 항상 cfr
+    """
+    single = outputs is None
+    if single:
+        outputs = [(output_path, DEFAULT_PROFILE)]
+    paths = [path for path, _ in outputs]
+    profiles = resolve_profiles([prof for _, prof in outputs])
+
+    frames = iter(overlay_frames)
+    first = next(frames)
+    oh, ow = first.shape[:2]
+    x, y = overlay_xy
+    segments = _dedupe_timeline(tail)
+    total = frame_count / fps + sum(d for _, d in segments)
+    audio_tracks = [t for t in (audio_tracks or []) if t.get("path")]
+
+    work_dir = tempfile.mkdtemp(prefix="quiz_overlay_")
+    try:
+        base_path = os.path.join(work_dir, "base.bmp")
+        base.convert("RGB").save(base_path)
+        args = ["-i", base_path,
+                "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{ow}x{oh}", "-framerate", str(fps), "-i", "pipe:0"]
+        filters = [
+            f"[0:v]format=yuv420p,loop=loop=-1:size=1:start=0,setpts=N/({fps}*TB)[base]",
+            f"[1:v]format=yuv420p[strip]",
+            f"[base][strip]overlay={x}:{y}:shortest=1:format=yuv420,setsar=1[anim]",
+        ]
+        label, next_input = "[anim]", 2
+        if segments:
+            args += ["-f", "concat", "-safe", "0", "-i", _write_concat_list(segments, work_dir)]
+            filters += [f"[2:v]format=yuv420p,fps={fps},setsar=1[tail]", "[anim][tail]concat=n=2:v=1:a=0[v]"]
+            label, next_input = "[v]", 3
+        args += _encode_args(label, base.size, profiles, paths, audio_tracks, next_input, fps, "cfr", total,
+                             filters=filters)
+
+        def chunks():
+            yield first
+            yield from frames
+
+        run_ffmpeg(args, stdin_chunks=(memoryview(frame).cast("B") for frame in chunks()))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if single:
+        return output_path
+    return {name: path for (name, _), path in zip(profiles, paths)}
+
+
+def concat_videos(video_paths, output_path, audio_tracks=None, total=None, audio_profile=DEFAULT_PROFILE):
+    """
+    같은 설정(write_timeline_video 기본 프로파일)으로 인코딩한 영상들을 재인코딩 없이 이어 붙인다.
+    - 영상: concat demuxer + stream copy (-c:v copy) → 프레임을 디코딩하지 않으므로 길이와 무관하게 메모리 일정
+    - 입력 영상의 오디오는 버리고, audio_tracks (_audio_inputs_and_filters 참고) 를 전체 길이에 한 번 깐다
+    - total: 전체 길이 (초). 주면 오디오를 거기서 자른다
+    """
+    if not video_paths:
+        raise ValueError("concat_videos needs at least one input video.")
+    audio_tracks = [t for t in (audio_tracks or []) if t.get("path")]
+    profile = resolve_profiles([audio_profile])[0][1]
+
+    work_dir = tempfile.mkdtemp(prefix="quiz_concat_")
+    try:
+        list_path = os.path.join(work_dir, "segments.ffconcat")
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("ffconcat version 1.0\n")
+            for path in video_paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        args = ["-f", "concat", "-safe", "0", "-i", list_path]
+        maps = ["-map", "0:v", "-c:v", "copy"]
+        if audio_tracks:
+            audio_args, audio_filters = _audio_inputs_and_filters(audio_tracks, first_input_index=1)
+            args += audio_args + ["-filter_complex", ";".join(audio_filters)]
+            maps += ["-map", "[aout]", "-c:a", profile.get("audio_codec", "aac")]
+            if profile.get("audio_bitrate"):
+                maps += ["-b:a", profile["audio_bitrate"]]
+        args += maps
+        if total is not None:
+            args += ["-t", _fmt(total)]
+        container = profile.get("container", "mp4")
+        args += ["-f", container]
+        if container in ("mp4", "mov"):
+            args += ["-movflags", "+faststart"]
+        args.append(output_path)
+        run_ffmpeg(args)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return output_path
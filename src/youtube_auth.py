@@ -0,0 +1,121 @@
+import argparse
+import os
+import tempfile
+import threading
+
+from .config import YOUTUBE_CLIENT_SECRETS, YOUTUBE_TOKEN_FILE
+
+# ======================
+# YouTube OAuth 토큰 저장 + 프로세스당 하나의 클라이언트
+# ======================
+# 처음 한 번만 브라우저 로그인 (python -m src.youtube_auth) → refresh token 을 YOUTUBE_TOKEN_FILE 에 저장.
+# 이후에는 저장된 토큰을 읽고, 만료되면 refresh 해서 다시 저장한다 (headless 서버에서도 무인 실행 가능).
+# discovery 문서는 google-api-python-client 에 들어 있는 것(static_discovery)을 써서 네트워크 요청이 없고,
+# youtube 클라이언트/업로드 서비스(AuthorizedSession, 커넥션 풀)는 프로세스에서 한 번만 만든다.
+#
+#   python -m src.youtube_auth                # 로그인해서 토큰 저장
+#   python -m src.youtube_auth --no-browser   # 서버에서: URL 만 출력 (포트 포워딩해서 로그인)
+SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
+
+_lock = threading.RLock()
+_credentials = None
+_youtube = None
+_uploader = None
+
+
+def _save_token(creds, path=YOUTUBE_TOKEN_FILE):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(creds.to_json())
+    os.chmod(tmp_path, 0o600)  # refresh token 이 들어 있으므로 본인만 읽기
+    os.replace(tmp_path, path)
+
+
+def login(open_browser=True, client_secrets=YOUTUBE_CLIENT_SECRETS, token_path=YOUTUBE_TOKEN_FILE):
+    """브라우저 OAuth 로그인 후 토큰 저장 (refresh token 을 받도록 offline + consent)"""
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    flow = InstalledAppFlow.from_client_secrets_file(client_secrets, SCOPES)
+    creds = flow.run_local_server(port=0, open_browser=open_browser, access_type="offline", prompt="consent")
+    _save_token(creds, token_path)
+    print(f"🔑 YouTube token saved: {token_path}")
+    return creds
+
+
+def load_credentials(interactive=False, token_path=YOUTUBE_TOKEN_FILE):
+    """
+    저장된 토큰 → (만료됐으면 refresh 후 저장) credentials.
+    토큰이 없거나 refresh 가 안 되면 interactive 일 때만 브라우저 로그인, 아니면 RuntimeError
+    (스케줄러 등 무인 실행이 로그인 대기로 멈추지 않도록 기본은 non-interactive).
+    """
+    from google.auth.exceptions import RefreshError
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+
+    creds = None
+    if os.path.exists(token_path):
+        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+
+    if creds and not creds.valid and creds.refresh_token:
+        try:
+            creds.refresh(Request())
+            _save_token(creds, token_path)
+        except RefreshError as e:
+            print(f"⚠️ Stored YouTube token could not be refreshed: {e}")
+            creds = None
+
+    if creds and creds.valid:
+        return creds
+    if not interactive:
+        raise RuntimeError(f"No valid YouTube token at {token_path}. Run `python -m src.youtube_auth` once.")
+    return login(token_path=token_path)
+
+
+def get_credentials(interactive=False):
+    """
+    프로세스 공용 credentials (google-auth 가 요청 때마다 필요하면 알아서 refresh).
+    토큰이 없으면 RuntimeError → python -m src.youtube_auth 로 먼저 로그인
+    """
+    global _credentials
+    with _lock:
+        if _credentials is None:
+            _credentials = load_credentials(interactive=interactive)
+        return _credentials
+
+
+def get_youtube_client(creds=None):
+    """프로세스 공용 youtube v3 클라이언트 (discovery 는 패키지 내장 문서 사용)"""
+    global _youtube
+    from googleapiclient.discovery import build
+
+    if creds is not None:
+        return build("youtube", "v3", credentials=creds, static_discovery=True)
+    with _lock:
+        if _youtube is None:
+            _youtube = build("youtube", "v3", credentials=get_credentials(), static_discovery=True)
+        return _youtube
+
+
+def get_uploader():
+    """프로세스 공용 UploadService (스레드마다 AuthorizedSession 하나 → 커넥션 재사용)"""
+    global _uploader
+    from .upload_planner import get_ledger
+    from .upload_service import UploadService
+
+    with _lock:
+        if _uploader is None:
+            _uploader = UploadService.from_credentials(get_credentials(), quota_ledger=get_ledger())
+        return _uploader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store YouTube OAuth credentials for unattended uploads")
+    parser.add_argument("--no-browser", action="store_true", help="print the login URL instead of opening a browser")
+    args = parser.parse_args()
+    login(open_browser=not args.no_browser)
+
+
+if __name__ == "__main__":
+    main()
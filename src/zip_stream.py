@@ -0,0 +1,78 @@
+import os
+import time
+import zipfile
+
+# ======================
+# ZIP 스트리밍 (임시 파일 없이, 메모리 일정)
+# ======================
+# zipfile 은 seek 안 되는 출력에 쓰면 각 항목 뒤에 data descriptor(크기/CRC)를 붙인다.
+# 그 출력을 버퍼로 받아서 조금 쓸 때마다 바로 내보내므로, 메모리에는 chunk 하나만 남는다.
+# 영상은 이미 압축돼 있으므로 ZIP_STORED (재압축 없음).
+CHUNK_SIZE = 1024 * 1024
+
+
+class _StreamBuffer:
+    """zipfile 이 쓰는 바이트를 모아 두었다가 drain() 으로 꺼내는 쓰기 전용 파일 객체"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """지금까지 쓴 바이트 (없으면 아무것도 yield 하지 않음)"""
+        if self._chunks:
+            data = b"".join(self._chunks)
+            self._chunks.clear()
+            yield data
+
+
+def stream_zip(files, chunk_size=CHUNK_SIZE):
+    """
+    files: [(zip 안 이름, 파일 경로), ...]
+    ZIP 바이트를 조금씩 yield 하는 generator 를 리턴 (StreamingResponse 에 바로 넘기면 된다).
+    모든 파일을 여기서 미리 열어 두므로, 없는 파일은 응답을 시작하기 전에 FileNotFoundError 가 나고
+    목록을 만든 뒤 파일이 지워져도 이미 연 파일은 끝까지 읽힌다.
+    """
+    members = []
+    try:
+        for arcname, path in files:
+            src = open(path, "rb")
+            members.append((arcname, src, os.fstat(src.fileno())))
+    except OSError:
+        for _, src, _ in members:
+            src.close()
+        raise
+    return _zip_chunks(members, chunk_size)
+
+
+def _zip_chunks(members, chunk_size):
+    buffer = _StreamBuffer()
+    try:
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for arcname, src, st in members:
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime(st.st_mtime)[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = st.st_size  # 4 GiB 넘으면 zip64 헤더를 미리 고른다
+                with src, zf.open(info, "w") as dest:
+                    while True:
+                        chunk = src.read(chunk_size)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        yield from buffer.drain()
+                yield from buffer.drain()
+        yield from buffer.drain()  # central directory
+    finally:
+        for _, src, _ in members:
+            src.close()
@@ -0,0 +1,25 @@
+import json
+
+from src.generate_quiz import QuestionStreamParser
+
+QUESTIONS = [
+    {"question": 'Who said "{not a brace}"?', "options": ["A", "B [x]", "C", "D"], "answer": "A"},
+    {"question": "Back\\slash?", "options": ["1", "2", "3", "4"], "answer": "2"},
+]
+
+
+def test_objects_come_out_as_they_complete():
+    text = json.dumps({"questions": QUESTIONS})
+    parser = QuestionStreamParser()
+    seen = []
+    for i in range(0, len(text), 7):
+        seen.extend(parser.feed(text[i:i + 7]))
+    assert seen == QUESTIONS
+
+
+def test_first_object_before_stream_ends():
+    text = json.dumps({"questions": QUESTIONS})
+    cut = text.index(json.dumps(QUESTIONS[0])) + len(json.dumps(QUESTIONS[0]))
+    parser = QuestionStreamParser()
+    assert parser.feed(text[:cut]) == [QUESTIONS[0]]
+    assert parser.feed(text[cut:]) == [QUESTIONS[1]]
@@ -0,0 +1,59 @@
+import pytest
+
+from src.quiz_prescreen import prescreen_quiz, score_question, DROP_SCORE
+
+CUTOFF = "May 2024"
+
+
+def _quiz(question, options=("Toluca", "Monterrey", "America", "Chivas"), answer="Toluca"):
+    return {"question": question, "options": list(options), "answer": answer}
+
+
+def _kept(*questions):
+    screened, _ = prescreen_quiz({"questions": list(questions)}, CUTOFF)
+    return [q["question"] for q in screened["questions"]]
+
+
+@pytest.mark.parametrize("question", [
+    "Who has more league titles, Toluca or Monterrey?",
+    "Which club won the 2010 Apertura title?",
+    "Which popular club is currently top of the table?",   # 약한 규칙 두 개 → flag 만
+])
+def test_kept(question):
+    assert _kept(_quiz(question)) == [question]
+
+
+@pytest.mark.parametrize("question", [
+    "Who is the greatest of all time in Liga MX?",
+    "Which club won the 2026 Clausura title?",
+])
+def test_dropped(question):
+    assert _kept(_quiz(question)) == []
+
+
+def test_catch_all_option_dropped():
+    q = _quiz("Which club plays at Estadio Nemesio Diez?",
+              options=["Toluca", "Monterrey", "America", "All of the above"])
+    assert _kept(q) == []
+
+
+def test_answer_alone_in_question_is_only_flagged():
+    score, hits = score_question(_quiz("Which Toluca legend scored the most goals for Toluca?"), 2024)
+    assert 0 < score < DROP_SCORE
+    assert [name for name, _ in hits] == ["answer_in_question"]
+
+
+def test_comparative_question_has_no_answer_hit():
+    _, hits = score_question(_quiz("Who has more league titles, Toluca or Monterrey?"), 2024)
+    assert "answer_in_question" not in [name for name, _ in hits]
+
+
+def test_weak_hits_do_not_add_up_to_drop():
+    score, hits = score_question(_quiz("Which popular club is currently top of the table?"), 2024)
+    assert len(hits) == 2
+    assert score < DROP_SCORE
+
+
+def test_drop_reason_is_returned():
+    _, reason = prescreen_quiz({"questions": [_quiz("Who is the GOAT of Liga MX?")]}, CUTOFF)
+    assert "subjective wording" in reason
@@ -0,0 +1,73 @@
+import pytest
+
+from src import render_queue
+from src.render_queue import RenderQueue, quiz_priority
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """render_queue 가 보는 time.time() 을 직접 움직인다"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(render_queue.time, "time", lambda: now[0])
+    return now
+
+
+def _drain(queue):
+    order = []
+    while len(queue):
+        order.append(queue.pop(timeout=0)["output_path"])
+    return order
+
+
+def test_higher_rank_first(clock):
+    queue = RenderQueue()
+    queue.push({}, "rank2", rank=2, trend_seen_at=clock[0])
+    queue.push({}, "evergreen")
+    queue.push({}, "rank0", rank=0, trend_seen_at=clock[0])
+    assert _drain(queue) == ["rank0", "rank2", "evergreen"]
+
+
+def test_fresher_trend_wins_at_same_rank(clock):
+    queue = RenderQueue()
+    queue.push({}, "old", rank=0, trend_seen_at=clock[0] - 7200)
+    queue.push({}, "new", rank=0, trend_seen_at=clock[0])
+    assert _drain(queue) == ["new", "old"]
+
+
+def test_waiting_item_is_not_starved(clock):
+    queue = RenderQueue()
+    queue.push({}, "evergreen")
+    clock[0] += 100
+    queue.push({}, "hot-soon", rank=0, trend_seen_at=clock[0])
+    clock[0] += 400   # (RANK_WEIGHT + FRESH_WEIGHT) / AGING_RATE = 450초 넘게 기다림
+    queue.push({}, "hot-late", rank=0, trend_seen_at=clock[0])
+    assert _drain(queue) == ["hot-soon", "evergreen", "hot-late"]
+
+
+def test_quiz_priority_reads_stored_fields():
+    assert quiz_priority({"trend_rank": 3, "trend_seen_at": 12.5}) == {"rank": 3, "trend_seen_at": 12.5}
+    assert quiz_priority({"question": "evergreen"}) == {"rank": None, "trend_seen_at": None}
+
+
+def test_submit_many_orders_whole_batch_and_resolves_futures():
+    queue = RenderQueue()
+    rendered = []
+
+    def render(quiz, output_path):
+        rendered.append(output_path)
+        if output_path == "bad":
+            raise ValueError("boom")
+        return output_path
+
+    futures = queue.submit_many([
+        {"quiz": {}, "output_path": "bad", "rank": 2, "index": 1},
+        {"quiz": {}, "output_path": "top", "rank": 0, "index": 2},
+    ], render)
+    queue.start_workers(1)   # 배치가 다 들어간 뒤에 돌아도, 먼저 돌고 있어도 순서는 같다
+
+    results = [f.result(timeout=5) for f in futures]
+    assert rendered == ["top", "bad"]
+    assert [r["index"] for r in results] == [1, 2]
+    assert results[0]["error"] == "boom" and results[1]["output"] == "top"
+    assert "render_fn" not in results[1] and "future" not in results[1]
+    assert queue.results == []
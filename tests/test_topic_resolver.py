@@ -0,0 +1,48 @@
+import pytest
+
+from src.topic_resolver import TopicResolver
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    return TopicResolver(data_dir=str(tmp_path))
+
+
+def _same(resolver, first, second):
+    return resolver.resolve(first) == resolver.resolve(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Boston Celtics", "celtics game"),
+    ("celtics", "Boston Celtics"),
+    ("Los Angeles Lakers", "lakers score"),
+    ("Lakers vs Celtics", "celtics v lakers"),
+    ("Golden State Warriors", "golden state warriors highlights"),
+    ("manchester city", "manchester city fc"),
+    ("los angeles lakres", "los angeles lakers"),
+])
+def test_same_entity(resolver, first, second):
+    assert _same(resolver, first, second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("US Open tennis", "US Open golf"),
+    ("FIFA World Cup", "Cricket World Cup"),
+    ("Lakers", "Lakers vs Celtics"),
+    ("manchester united", "manchester city"),
+])
+def test_different_entities(resolver, first, second):
+    assert not _same(resolver, first, second)
+
+
+def test_ambiguous_short_name_is_not_merged(resolver):
+    city = resolver.resolve("Manchester City")
+    united = resolver.resolve("Manchester United")
+    bare = resolver.resolve("manchester")
+    assert bare not in (city, united)
+
+
+def test_spelling_of_other_entity_blocks_merge(resolver):
+    city = resolver.resolve("manchester")
+    resolver.resolve("manchester city")  # 같은 엔티티로 붙음
+    assert resolver.resolve("manchester united") != city